@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the ITSERR agent turn pipeline.
+
+Drives ``--sessions`` concurrent research sessions, each asking ``--turns``
+questions in order, through ``ITSERRAgent.process`` (or ``astream`` with
+``--stream``). By default the LLM is the offline mock provider, so what is
+measured is the agent's own work (memory retrieval and storage, context
+assembly, request shaping, classification) under concurrency, against a
+provider with a known latency distribution. Everything else comes from the
+usual ``ITSERR_*`` settings; memory is written to a temporary directory.
+
+Reports throughput and p50/p95/p99 turn latency (plus time to first token
+when streaming) and the per-stage breakdown from the agent's spans. With
+``--budget-p95`` the script exits non-zero if the p95 turn latency exceeds
+the budget, so it can run in CI.
+
+The local embedding model must be available (it is downloaded on first use).
+
+Usage:
+    python benchmarks/load.py
+    python benchmarks/load.py --sessions 32 --turns 5 --latency 0.8 --sigma 0.6
+    python benchmarks/load.py --stream --tokens-per-second 80 --budget-p95 3
+    python benchmarks/load.py --provider anthropic --sessions 4 --turns 2
+    python benchmarks/load.py --json > load.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from itserr_agent import AgentConfig, ITSERRAgent
+from itserr_agent.core.config import LLMProvider
+from itserr_agent.core.streaming import StreamEventType
+from itserr_agent.core.timing import TIMINGS, LatencyHistogram
+
+QUESTIONS = [
+    "What is the hermeneutic circle?",
+    "How did Augustine read the Psalms?",
+    "Compare Gadamer and Ricoeur on tradition.",
+    "What sources document the Council of Trent's decree on scripture?",
+    "How do scholars date the Didache?",
+    "Tell me more about that.",
+    "Which manuscripts preserve the Gospel of Thomas?",
+    "How has the reception of Luther's sermons been studied?",
+]
+
+# Spans reported in the per-stage breakdown
+STAGES = (
+    "agent.retrieve",
+    "agent.assemble",
+    "agent.llm",
+    "agent.stream",
+    "agent.classify",
+    "agent.record",
+    "memory.embed",
+    "memory.vector_query",
+)
+
+
+async def _turn(agent: ITSERRAgent, question: str, session_id: str, stream: bool) -> float | None:
+    """Answer one question; return the time to first token when streaming."""
+    if not stream:
+        await agent.process(question, session_id=session_id)
+        return None
+    start = time.perf_counter()
+    first_token = None
+    async for event in agent.astream(question, session_id=session_id):
+        if first_token is None and event.type is StreamEventType.TOKEN:
+            first_token = time.perf_counter() - start
+    return first_token
+
+
+async def _session(
+    agent: ITSERRAgent,
+    index: int,
+    args: argparse.Namespace,
+    latencies: LatencyHistogram,
+    first_tokens: LatencyHistogram,
+) -> int:
+    """Run one session's turns in order; return the number of failed turns."""
+    errors = 0
+    for turn in range(args.turns):
+        question = QUESTIONS[(index + turn) % len(QUESTIONS)]
+        start = time.perf_counter()
+        try:
+            first_token = await _turn(agent, question, f"load-{index}", args.stream)
+        except Exception as exc:
+            errors += 1
+            print(f"session {index} turn {turn}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            continue
+        latencies.record(time.perf_counter() - start)
+        if first_token is not None:
+            first_tokens.record(first_token)
+    return errors
+
+
+async def run(args: argparse.Namespace, memory_dir: str) -> dict[str, Any]:
+    """Run the benchmark and return its report."""
+    config = AgentConfig(
+        llm_provider=LLMProvider(args.provider),
+        memory_persist_path=Path(memory_dir),
+        mock_llm_latency_seconds=args.latency,
+        mock_llm_latency_sigma=args.sigma,
+        mock_llm_tokens_per_second=args.tokens_per_second,
+        mock_llm_output_tokens=args.output_tokens,
+        mock_llm_error_rate=args.error_rate,
+        mock_llm_seed=args.seed,
+    )
+    agent = ITSERRAgent(config)
+    # Keep model loading out of the measured turns
+    await asyncio.to_thread(agent.warm_up().join)
+    TIMINGS.reset()
+
+    latencies = LatencyHistogram()
+    first_tokens = LatencyHistogram()
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            _session(agent, index, args, latencies, first_tokens)
+            for index in range(args.sessions)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    stages = TIMINGS.summary()
+    report = {
+        "provider": args.provider,
+        "sessions": args.sessions,
+        "turns": latencies.count,
+        "errors": sum(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(latencies.count / elapsed, 3) if elapsed else 0.0,
+        "latency": latencies.summary(),
+        "first_token": first_tokens.summary() if args.stream else None,
+        "stages": {name: stages[name] for name in STAGES if name in stages},
+        "llm_invocations": agent.llm_invocation_stats,
+        "llm_requests": agent.llm_request_stats,
+    }
+    await agent.close()
+    return report
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    """Print the report as tables."""
+    print(
+        f"{report['sessions']} sessions, {report['turns']} turns, {report['errors']} errors "
+        f"in {report['elapsed_seconds']:.2f}s ({report['throughput_per_second']:.2f} turns/s)"
+    )
+    rows = [("turn", report["latency"])]
+    if report["first_token"]:
+        rows.append(("first token", report["first_token"]))
+    rows += list(report["stages"].items())
+    print(f"{'measurement':<20} {'count':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}")
+    for name, summary in rows:
+        print(
+            f"{name:<20} {summary['count']:>6} {summary['p50_ms']:>10.1f} "
+            f"{summary['p95_ms']:>10.1f} {summary['p99_ms']:>10.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the ITSERR agent turn pipeline")
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=3, help="Questions per session")
+    parser.add_argument("--stream", action="store_true", help="Use astream instead of process")
+    parser.add_argument(
+        "--provider",
+        choices=[provider.value for provider in LLMProvider],
+        default=LLMProvider.MOCK.value,
+        help="LLM provider (a real provider needs its API key)",
+    )
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock median TTFT (s)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Mock log-normal TTFT spread")
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=50.0, help="Mock generation speed"
+    )
+    parser.add_argument("--output-tokens", type=int, default=120, help="Mock response length")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of mock requests failing (529)"
+    )
+    parser.add_argument("--seed", type=int, help="Seed for reproducible mock latencies")
+    parser.add_argument("--budget-p95", type=float, help="Max p95 turn latency (s)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as memory_dir:
+        report = asyncio.run(run(args, memory_dir))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    p95 = report["latency"]["p95_ms"] / 1000
+    if args.budget_p95 is not None and p95 > args.budget_p95:
+        print(f"p95 turn latency {p95:.3f}s is over the {args.budget_p95:.3f}s budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the itserr-agent CLI.
+
+Measures, each in a fresh interpreter so import caches do not hide regressions:
+
+- ``itserr-agent version``: package + CLI import cost
+- ``itserr-agent config``: adds settings loading (pydantic)
+- first response: constructing ``ITSERRAgent`` and answering one question,
+  including memory store opening and embedding model load. The LLM call
+  itself is replaced by LangChain's ``FakeListChatModel`` so the number
+  reflects local startup work, not network latency.
+
+Each measurement reports the median of ``--runs`` repetitions. Budgets can be
+given per measurement; the script exits non-zero if any median exceeds its
+budget, so it can run in CI.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 5 --budget-version 0.5 --budget-first-response 8
+    python benchmarks/startup.py --skip-first-response
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+FIRST_RESPONSE_SCRIPT = """
+import asyncio, time
+start = time.perf_counter()
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from itserr_agent import AgentConfig, ITSERRAgent
+
+async def main():
+    agent = ITSERRAgent(AgentConfig())
+    agent._llm_instance = FakeListChatModel(responses=["[FACTUAL] Benchmark response."])
+    await agent.process("What is hermeneutics?", session_id="startup-benchmark")
+    print(time.perf_counter() - start)
+    await agent.close()
+
+asyncio.run(main())
+"""
+
+
+def _time_command(args: list[str], env: dict[str, str]) -> float:
+    """Wall-clock seconds for one subprocess run."""
+    start = time.perf_counter()
+    subprocess.run(args, env=env, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def _time_first_response(env: dict[str, str]) -> float:
+    """Seconds from importing the agent to its first response, in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        errors = result.stderr.strip().splitlines() or ["unknown error"]
+        raise RuntimeError(f"first-response run failed: {errors[-1]}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark itserr-agent startup time")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per measurement")
+    parser.add_argument("--budget-version", type=float, help="Max seconds for 'version'")
+    parser.add_argument("--budget-config", type=float, help="Max seconds for 'config'")
+    parser.add_argument(
+        "--budget-first-response", type=float, help="Max seconds to the first response"
+    )
+    parser.add_argument(
+        "--skip-first-response",
+        action="store_true",
+        help="Skip the first-response measurement (needs the embedding model)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as memory_dir:
+        env = {
+            **os.environ,
+            "ITSERR_MEMORY_PERSIST_PATH": memory_dir,
+            "ITSERR_ANTHROPIC_API_KEY": os.environ.get("ITSERR_ANTHROPIC_API_KEY", "benchmark"),
+        }
+        cli = [sys.executable, "-m", "itserr_agent.cli"]
+
+        measurements: list[tuple[str, list[float], float | None]] = [
+            (
+                "version",
+                [_time_command([*cli, "version"], env) for _ in range(args.runs)],
+                args.budget_version,
+            ),
+            (
+                "config",
+                [_time_command([*cli, "config"], env) for _ in range(args.runs)],
+                args.budget_config,
+            ),
+        ]
+        if not args.skip_first_response:
+            try:
+                first_response = [_time_first_response(env) for _ in range(args.runs)]
+            except RuntimeError as exc:
+                print(exc, file=sys.stderr)
+                return 2
+            measurements.append(("first response", first_response, args.budget_first_response))
+
+    failed = False
+    print(f"{'measurement':<16} {'median (s)':>10} {'min (s)':>9} {'budget (s)':>10}")
+    for name, timings, budget in measurements:
+        median = statistics.median(timings)
+        over = budget is not None and median > budget
+        failed |= over
+        budget_text = f"{budget:.2f}" if budget is not None else "-"
+        flag = "  OVER BUDGET" if over else ""
+        print(f"{name:<16} {median:>10.3f} {min(timings):>9.3f} {budget_text:>10}{flag}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
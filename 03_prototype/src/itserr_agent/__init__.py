@@ -16,11 +16,27 @@ Part of ITSERR WP5: AI-Assisted Resilience Development for Religious Studies.
 __version__ = "0.1.0"
 __author__ = "ITSERR WP5 Team"
 
-from itserr_agent.core.agent import ITSERRAgent
-from itserr_agent.core.config import AgentConfig
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from itserr_agent.core.agent import ITSERRAgent
+    from itserr_agent.core.config import AgentConfig
 
 __all__ = [
     "ITSERRAgent",
     "AgentConfig",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public classes on first access so ``import itserr_agent`` stays cheap."""
+    if name == "ITSERRAgent":
+        from itserr_agent.core.agent import ITSERRAgent
+
+        return ITSERRAgent
+    if name == "AgentConfig":
+        from itserr_agent.core.config import AgentConfig
+
+        return AgentConfig
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
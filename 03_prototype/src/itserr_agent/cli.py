@@ -6,23 +6,46 @@ useful for testing and demonstration.
 """
 
 import asyncio
+import json
+import sys
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import typer
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.prompt import Prompt
+from rich.table import Table
 
 from itserr_agent import __version__
 
+if TYPE_CHECKING:
+    from itserr_agent.core.agent import ITSERRAgent
+    from itserr_agent.core.batch import BatchResult
+    from itserr_agent.memory.ingest import BulkImportStats
+    from itserr_agent.memory.retention import CompactionStats
+
 app = typer.Typer(
     name="itserr-agent",
     help="Ethically-grounded AI agent for religious studies research",
     add_completion=False,
 )
+memory_app = typer.Typer(help="Manage the narrative memory store")
+app.add_typer(memory_app, name="memory")
 console = Console()
 
 
+class ImportStream(str, Enum):
+    """Memory streams that accept bulk imports."""
+
+    RESEARCH = "research"
+    DECISION = "decision"
+
+
 @app.command()
 def version() -> None:
     """Show the version."""
@@ -43,6 +66,16 @@ def chat(
         "-m",
         help="Override the LLM model",
     ),
+    stream: bool = typer.Option(
+        True,
+        "--stream/--no-stream",
+        help="Stream responses token by token as they are generated",
+    ),
+    warm_up: bool = typer.Option(
+        True,
+        "--warm-up/--no-warm-up",
+        help="Load the model and memory store in the background while you type",
+    ),
 ) -> None:
     """
     Start an interactive chat session with the agent.
@@ -63,10 +96,15 @@ def chat(
         )
     )
 
-    asyncio.run(_chat_loop(session_id, model))
+    asyncio.run(_chat_loop(session_id, model, stream, warm_up))
 
 
-async def _chat_loop(session_id: str, model: str | None) -> None:
+async def _chat_loop(
+    session_id: str,
+    model: str | None,
+    stream: bool = True,
+    warm_up: bool = True,
+) -> None:
     """Run the interactive chat loop."""
     from itserr_agent import AgentConfig, ITSERRAgent
 
@@ -80,6 +118,9 @@ async def _chat_loop(session_id: str, model: str | None) -> None:
 
     try:
         agent = ITSERRAgent(config)
+        if warm_up:
+            # Overlap model and memory loading with the user typing
+            agent.warm_up()
         console.print(f"\n[dim]Session: {session_id}[/dim]\n")
 
         while True:
@@ -92,13 +133,16 @@ async def _chat_loop(session_id: str, model: str | None) -> None:
                 if not user_input.strip():
                     continue
 
-                # Process the input
-                with console.status("[dim]Thinking...[/dim]"):
-                    response = await agent.process(user_input, session_id=session_id)
-
-                # Display the response with markdown formatting
                 console.print()
-                console.print(Panel(Markdown(response.content), title="[bold]Agent[/bold]"))
+                if stream:
+                    await _stream_response(agent, user_input, session_id)
+                else:
+                    # Process the input
+                    with console.status("[dim]Thinking...[/dim]"):
+                        response = await agent.process(user_input, session_id=session_id)
+
+                    # Display the response with markdown formatting
+                    console.print(Panel(Markdown(response.content), title="[bold]Agent[/bold]"))
                 console.print()
 
             except KeyboardInterrupt:
@@ -115,6 +159,154 @@ async def _chat_loop(session_id: str, model: str | None) -> None:
     console.print("\n[dim]Session ended. Memory has been preserved.[/dim]")
 
 
+async def _stream_response(agent: "ITSERRAgent", user_input: str, session_id: str) -> None:
+    """Render a streamed response, re-drawing as sentences are tagged."""
+    title = "[bold]Agent[/bold]"
+    with Live(
+        Panel("[dim]Thinking...[/dim]", title=title),
+        console=console,
+        refresh_per_second=12,
+    ) as live:
+        async for event in agent.astream(user_input, session_id=session_id):
+            live.update(Panel(Markdown(event.preview), title=title))
+
+
+@app.command()
+def ask(
+    question: str | None = typer.Argument(
+        None,
+        help="Question to answer (omit when using --batch)",
+    ),
+    batch: Path | None = typer.Option(
+        None,
+        "--batch",
+        "-b",
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        help="JSONL file with one {'question': ...} object per line",
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        dir_okay=False,
+        help="Where to write batch results as JSONL (default: stdout)",
+    ),
+    concurrency: int | None = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Questions in flight (defaults to ITSERR_BATCH_CONCURRENCY)",
+    ),
+    session_id: str = typer.Option(
+        "default",
+        "--session",
+        "-s",
+        help="Session for a single question",
+    ),
+) -> None:
+    """
+    Answer one question, or a batch of questions from a JSONL file.
+
+    Batch records need a 'question' field (optional: session_id); other
+    fields are copied to the output. Each output line adds 'response',
+    'error' and 'latency_ms'. Records without a session_id are answered
+    independently in fresh sessions.
+    """
+    if question is not None and batch is None:
+        asyncio.run(_ask_one(question, session_id))
+        return
+    if question is not None or batch is None:
+        console.print("[red]Error: give either a question or --batch FILE[/red]")
+        raise typer.Exit(2)
+
+    try:
+        failed = asyncio.run(_ask_batch(batch, output, concurrency))
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if failed:
+        raise typer.Exit(1)
+
+
+async def _ask_one(question: str, session_id: str) -> None:
+    """Answer a single question and print the tagged response."""
+    from itserr_agent import AgentConfig, ITSERRAgent
+
+    agent = ITSERRAgent(AgentConfig())
+    try:
+        with console.status("[dim]Thinking...[/dim]"):
+            response = await agent.process(question, session_id=session_id)
+        console.print(Panel(Markdown(response.content), title="[bold]Agent[/bold]"))
+    finally:
+        await agent.close()
+
+
+async def _ask_batch(path: Path, output: Path | None, concurrency: int | None) -> int:
+    """Answer every question in a JSONL file; returns the number of failures."""
+    from itserr_agent import AgentConfig, ITSERRAgent
+    from itserr_agent.core.batch import BatchItem
+    from itserr_agent.memory.ingest import read_records
+
+    if path.suffix.lower() != ".jsonl":
+        raise ValueError(f"Batch input must be a .jsonl file, got '{path.suffix}'")
+    records = list(read_records(path))
+    for line_number, record in enumerate(records, start=1):
+        if not isinstance(record.get("question"), str) or not record["question"].strip():
+            raise ValueError(f"{path}: record {line_number} has no 'question'")
+
+    # Results go to stdout when no file is given, so progress goes to stderr
+    status = Console(stderr=True) if output is None else console
+    agent = ITSERRAgent(AgentConfig())
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed}/{task.total}"),
+            TimeElapsedColumn(),
+            console=status,
+        ) as progress:
+            task = progress.add_task(f"Answering {path.name}", total=len(records))
+            results = await agent.process_many(
+                [BatchItem(r["question"], r.get("session_id")) for r in records],
+                concurrency=concurrency,
+                progress=lambda result: progress.advance(task),
+            )
+    finally:
+        await agent.close()
+
+    lines = [
+        json.dumps(_batch_output(record, result), ensure_ascii=False)
+        for record, result in zip(records, results)
+    ]
+    if output is None:
+        sys.stdout.write("".join(f"{line}\n" for line in lines))
+    else:
+        output.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+
+    failed = sum(not result.ok for result in results)
+    latencies = sorted(result.latency_seconds for result in results)
+    median = latencies[len(latencies) // 2] if latencies else 0.0
+    status.print(
+        f"Answered [bold]{len(results) - failed}[/bold] of {len(results)} questions "
+        f"(median latency {median * 1000:.0f} ms); {failed} failed."
+    )
+    return failed
+
+
+def _batch_output(record: dict[str, Any], result: "BatchResult") -> dict[str, Any]:
+    """Merge a batch result into its input record for JSONL output."""
+    return {
+        **record,
+        "session_id": result.session_id,
+        "response": result.response,
+        "error": result.error,
+        "latency_ms": round(result.latency_seconds * 1000, 1),
+    }
+
+
 @app.command()
 def config() -> None:
     """Show current configuration."""
@@ -130,6 +322,95 @@ def config() -> None:
     console.print(f"  GNORM URL: {cfg.gnorm_api_url or 'Not configured'}")
 
 
+@app.command()
+def stats(
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print the summary as JSON",
+    ),
+    reset: bool = typer.Option(
+        False,
+        "--reset",
+        help="Delete the recorded latencies after printing them",
+    ),
+) -> None:
+    """
+    Show per-stage latency percentiles recorded by previous agent runs.
+
+    Stages cover the turn pipeline (agent.*), narrative memory (memory.*)
+    and tool executions (tool.*). Latencies are merged into the memory
+    directory whenever an agent shuts down.
+    """
+    from itserr_agent import AgentConfig
+    from itserr_agent.core.timing import TIMINGS_FILENAME, TimingRegistry
+
+    path = AgentConfig().memory_persist_path / TIMINGS_FILENAME
+    summary = TimingRegistry.load(path).summary()
+
+    if as_json:
+        sys.stdout.write(json.dumps(summary, indent=2) + "\n")
+    elif not summary:
+        console.print(f"[dim]No latencies recorded yet ({path}).[/dim]")
+    else:
+        table = Table(title="Stage latencies (ms)")
+        table.add_column("Stage")
+        for column in ("count", "mean", "p50", "p95", "p99", "max"):
+            table.add_column(column, justify="right")
+        for name, row in summary.items():
+            table.add_row(
+                name,
+                str(row["count"]),
+                *(f"{row[key]:.1f}" for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")),
+            )
+        console.print(table)
+
+    if reset and path.exists():
+        path.unlink()
+        console.print("[dim]Recorded latencies cleared.[/dim]")
+
+
+@app.command()
+def serve(
+    host: str | None = typer.Option(
+        None, "--host", help="Interface to bind (default from config)"
+    ),
+    port: int | None = typer.Option(
+        None, "--port", "-p", help="Port to listen on (default from config)"
+    ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Chat turns processed concurrently (default from config)",
+    ),
+) -> None:
+    """
+    Serve the agent over HTTP for many concurrent users.
+
+    One agent (embedding model, memory store, LLM client) is shared by all
+    sessions. Ctrl-C or SIGTERM shuts down gracefully, letting in-flight
+    requests finish and flushing memory.
+    """
+    from itserr_agent import AgentConfig
+    from itserr_agent.server import run
+
+    config = AgentConfig()
+    overrides = {"server_host": host, "server_port": port, "server_workers": workers}
+    config = config.model_copy(update={k: v for k, v in overrides.items() if v is not None})
+
+    console.print(
+        f"[bold blue]ITSERR Agent[/bold blue] serving on "
+        f"http://{config.server_host}:{config.server_port} "
+        f"({config.server_workers} workers)"
+    )
+    try:
+        run(config)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def demo(
     live: bool = typer.Option(
@@ -155,6 +436,127 @@ def demo(
     asyncio.run(run_demo(live_mode=live))
 
 
+@memory_app.command("import")
+def memory_import(
+    path: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        help="JSONL or CSV file of research notes or decisions",
+    ),
+    stream: ImportStream = typer.Option(
+        ImportStream.RESEARCH,
+        "--stream",
+        "-t",
+        help="Memory stream to import into",
+    ),
+    session_id: str = typer.Option(
+        "default",
+        "--session",
+        "-s",
+        help="Session for records that do not specify one",
+    ),
+    chunk_size: int | None = typer.Option(
+        None,
+        "--chunk-size",
+        min=1,
+        help="Records per batch (defaults to ITSERR_MEMORY_IMPORT_CHUNK_SIZE)",
+    ),
+) -> None:
+    """
+    Bulk-import research notes or decisions from a JSONL or CSV file.
+
+    Research records need a 'content' field (optional: source, session_id).
+    Decision records need a 'decision' field (optional: rationale,
+    alternatives, session_id).
+    """
+    try:
+        stats = asyncio.run(_import_memory(path, stream, session_id, chunk_size))
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    console.print(
+        f"Imported [bold]{stats.stored}[/bold] {stream.value} items "
+        f"in {stats.elapsed_seconds:.1f}s ({stats.items_per_second:.0f} items/s); "
+        f"{stats.skipped} skipped, {stats.failed} failed."
+    )
+    if stats.failed:
+        raise typer.Exit(1)
+
+
+@memory_app.command("compact")
+def memory_compact() -> None:
+    """
+    Apply the retention policies now.
+
+    Old exchanges are summarized into reflections and deleted; research
+    notes past ITSERR_RESEARCH_RETENTION_HOURS are deleted; decisions are
+    always kept.
+    """
+    stats = asyncio.run(_compact_memory())
+    evicted = ", ".join(f"{n} {stream}" for stream, n in stats.evicted.items()) or "nothing"
+    console.print(
+        f"Evicted {evicted} into {stats.reflections} reflections "
+        f"in {stats.elapsed_seconds:.1f}s; collection size "
+        f"[bold]{stats.collection_before}[/bold] -> [bold]{stats.collection_after}[/bold]."
+    )
+    if stats.failed_batches:
+        console.print(f"[yellow]{stats.failed_batches} batches failed and were kept[/yellow]")
+        raise typer.Exit(1)
+
+
+async def _compact_memory() -> "CompactionStats":
+    """Run one compaction pass over the configured memory store."""
+    from itserr_agent import AgentConfig
+    from itserr_agent.memory import NarrativeMemorySystem
+
+    memory = NarrativeMemorySystem(AgentConfig())
+    try:
+        return await memory.compact()
+    finally:
+        await memory.close()
+
+
+async def _import_memory(
+    path: Path,
+    stream: ImportStream,
+    session_id: str,
+    chunk_size: int | None,
+) -> "BulkImportStats":
+    """Stream records from a file into memory, rendering progress."""
+    from itserr_agent import AgentConfig
+    from itserr_agent.memory import NarrativeMemorySystem
+    from itserr_agent.memory.ingest import read_records
+
+    memory = NarrativeMemorySystem(AgentConfig())
+    records = read_records(path)
+    store = (
+        memory.store_research_notes_bulk
+        if stream is ImportStream.RESEARCH
+        else memory.store_decisions_bulk
+    )
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} stored"),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task(f"Importing {path.name}", total=None)
+            return await store(
+                records,
+                session_id=session_id,
+                chunk_size=chunk_size,
+                progress=lambda stats: progress.update(task, completed=stats.stored),
+            )
+    finally:
+        await memory.close()
+
+
 def main() -> None:
     """Entry point for the CLI."""
     app()
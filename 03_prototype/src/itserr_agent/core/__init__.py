@@ -5,10 +5,26 @@ This module contains the main agent implementation, configuration management,
 and the core orchestration logic using LangGraph.
 """
 
-from itserr_agent.core.agent import ITSERRAgent
+from typing import TYPE_CHECKING, Any
+
 from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.streaming import StreamEvent, StreamEventType
+
+if TYPE_CHECKING:
+    from itserr_agent.core.agent import ITSERRAgent
 
 __all__ = [
     "ITSERRAgent",
     "AgentConfig",
+    "StreamEvent",
+    "StreamEventType",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the agent (and its LangChain dependency) on first access."""
+    if name == "ITSERRAgent":
+        from itserr_agent.core.agent import ITSERRAgent
+
+        return ITSERRAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,17 +5,63 @@ This module contains the ITSERRAgent class, which orchestrates the agent's
 reasoning loop, memory retrieval, tool execution, and response generation.
 """
 
-from typing import Any
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import TYPE_CHECKING, Any
 
 import structlog
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages.ai import UsageMetadata, add_usage
 
+from itserr_agent.core.batch import BatchItem, BatchResult, RequestLimiter
 from itserr_agent.core.config import AgentConfig, LLMProvider
+from itserr_agent.core.context import AssembledContext, ContextAssembler, PromptCacheStats
+from itserr_agent.core.history import SessionHistoryStore
+from itserr_agent.core.resilience import CircuitBreaker, ResilientInvoker
+from itserr_agent.core.response_cache import ResponseCache
+from itserr_agent.core.streaming import StreamEvent, StreamEventType, chunk_text
+from itserr_agent.core.timing import TIMINGS, TIMINGS_FILENAME, collect_spans, span, span_fields
 from itserr_agent.epistemic.classifier import EpistemicClassifier
-from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.streams import StreamType
+
+if TYPE_CHECKING:
+    from itserr_agent.memory.narrative import NarrativeMemorySystem
+    from itserr_agent.memory.streams import RetrievedMemory
 
 logger = structlog.get_logger()
 
+# Identical on every request so providers can serve it from their prompt cache;
+# anything that varies per turn belongs in MEMORY_CONTEXT_TEMPLATE (sent with the
+# user's input, after the cached history)
+SYSTEM_PROMPT = """You are an AI research assistant specialized in theological and religious studies.
+
+You operate with three core principles:
+
+1. EPISTEMIC MODESTY: Always classify your responses using these indicators:
+   - [FACTUAL]: Verifiable information with citations (dates, quotes, bibliographic data)
+   - [INTERPRETIVE]: AI-assisted analysis requiring researcher verification (patterns, connections)
+   - [DEFERRED]: Matters requiring human judgment (theological truth claims, value judgments)
+
+2. NARRATIVE CONTINUITY: You maintain awareness of the researcher's ongoing inquiry.
+   Reference previous discussions when relevant and build upon established context.
+
+3. TRANSPARENCY: Explain your reasoning. When uncertain, acknowledge it.
+   When making connections, mark them as interpretive.
+
+Format your responses with inline indicators, e.g.:
+"[FACTUAL] Gadamer published Truth and Method in 1960. [INTERPRETIVE] This work appears
+to connect with your earlier interest in hermeneutical approaches to biblical texts."
+"""
+
+MEMORY_CONTEXT_TEMPLATE = """RELEVANT CONTEXT FROM PREVIOUS SESSIONS:
+{memory_context}
+
+Use this context to inform your response, but mark any references to it appropriately."""
+
 
 class ITSERRAgent:
     """
@@ -46,10 +92,55 @@ class ITSERRAgent:
         self.config = config or AgentConfig()
         self.config.validate_api_keys()
 
-        self._llm = self._create_llm()
-        self._memory = NarrativeMemorySystem(self.config)
+        # The LLM client, vector store and embedding model are created on
+        # first use (or in the background by warm_up) to keep startup fast
+        self._llm_instance: Any = None
+        self._memory_instance: NarrativeMemorySystem | None = None
+        self._init_lock = threading.RLock()
         self._classifier = EpistemicClassifier(self.config)
-        self._conversation_history: list[BaseMessage] = []
+        self._assembler = ContextAssembler(
+            budget=self.config.context_token_budget,
+            max_history_messages=self.config.context_history_messages,
+            memory_template=MEMORY_CONTEXT_TEMPLATE,
+            # Only Anthropic needs explicit breakpoints; OpenAI caches prefixes automatically
+            cache_breakpoint=(
+                self.config.llm_prompt_caching
+                and self.config.llm_provider == LLMProvider.ANTHROPIC
+            ),
+            cache_min_tokens=self.config.llm_prompt_cache_min_tokens,
+        )
+        self._prompt_cache_stats = PromptCacheStats()
+        self._llm_limiter = RequestLimiter(
+            max_concurrent=self.config.llm_max_concurrent_requests,
+            requests_per_second=self.config.llm_requests_per_second,
+        )
+        self._invoker = ResilientInvoker(
+            timeout_seconds=self.config.llm_timeout_seconds,
+            max_retries=self.config.llm_max_retries,
+            backoff_initial_seconds=self.config.llm_backoff_initial_seconds,
+            backoff_max_seconds=self.config.llm_backoff_max_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=self.config.llm_circuit_failure_threshold,
+                reset_seconds=self.config.llm_circuit_reset_seconds,
+            ),
+            hedging=self.config.llm_hedging,
+            hedge_min_delay_seconds=self.config.llm_hedge_min_delay_seconds,
+            limiter=self._llm_limiter,
+        )
+        self._response_cache = (
+            ResponseCache(
+                max_entries=self.config.response_cache_max_entries,
+                ttl_seconds=self.config.response_cache_ttl_seconds,
+                similarity_threshold=self.config.response_cache_threshold,
+            )
+            if self.config.response_cache_enabled
+            else None
+        )
+        self._history = SessionHistoryStore(
+            max_messages=self.config.history_max_messages,
+            max_sessions=self.config.history_max_sessions,
+            persist_path=self.config.memory_persist_path if self.config.history_persist else None,
+        )
 
         logger.info(
             "agent_initialized",
@@ -57,6 +148,50 @@ class ITSERRAgent:
             llm_model=self.config.llm_model,
         )
 
+    @property
+    def _llm(self) -> Any:
+        """The LLM client, created on first access."""
+        if self._llm_instance is None:
+            with self._init_lock:
+                if self._llm_instance is None:
+                    self._llm_instance = self._create_llm()
+        return self._llm_instance
+
+    @property
+    def _memory(self) -> "NarrativeMemorySystem":
+        """The narrative memory system, opened on first access."""
+        if self._memory_instance is None:
+            with self._init_lock:
+                if self._memory_instance is None:
+                    from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+                    self._memory_instance = NarrativeMemorySystem(self.config)
+        return self._memory_instance
+
+    def warm_up(self) -> threading.Thread:
+        """
+        Start loading the LLM client, memory store and embedding model.
+
+        Loading runs in a daemon thread so it overlaps with whatever the
+        caller does next (e.g. waiting for the user's first question).
+        Components that are still loading when first used are simply waited
+        for; a failed warm-up is logged and retried on first use.
+
+        Returns:
+            The started warm-up thread
+        """
+        thread = threading.Thread(target=self._warm_up, name="itserr-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up(self) -> None:
+        """Load heavy components (runs in the warm-up thread)."""
+        try:
+            self._memory.warm_up()
+            logger.info("agent_warmed_up", llm=type(self._llm).__name__)
+        except Exception as exc:
+            logger.warning("agent_warm_up_failed", error=str(exc))
+
     def _create_llm(self) -> Any:
         """Create the LLM instance based on configuration."""
         if self.config.llm_provider == LLMProvider.OPENAI:
@@ -66,6 +201,8 @@ class ITSERRAgent:
                 model=self.config.llm_model,
                 temperature=self.config.llm_temperature,
                 api_key=self.config.openai_api_key,
+                # Retries and timeouts are handled by ResilientInvoker
+                max_retries=0,
             )
         elif self.config.llm_provider == LLMProvider.ANTHROPIC:
             from langchain_anthropic import ChatAnthropic
@@ -74,6 +211,18 @@ class ITSERRAgent:
                 model=self.config.llm_model,
                 temperature=self.config.llm_temperature,
                 api_key=self.config.anthropic_api_key,
+                max_retries=0,
+            )
+        elif self.config.llm_provider == LLMProvider.MOCK:
+            from itserr_agent.core.mock_llm import MockChatModel
+
+            return MockChatModel(
+                latency_seconds=self.config.mock_llm_latency_seconds,
+                latency_sigma=self.config.mock_llm_latency_sigma,
+                tokens_per_second=self.config.mock_llm_tokens_per_second,
+                output_tokens=self.config.mock_llm_output_tokens,
+                error_rate=self.config.mock_llm_error_rate,
+                seed=self.config.mock_llm_seed,
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config.llm_provider}")
@@ -88,6 +237,10 @@ class ITSERRAgent:
         3. Classifies response content with epistemic indicators
         4. Updates memory with the exchange
 
+        With the response cache enabled, a near-identical question asked
+        under the same context is answered from the cache instead of the LLM;
+        the exchange is still stored in memory.
+
         Args:
             user_input: The user's query or request
             session_id: Optional session identifier for memory isolation
@@ -97,17 +250,46 @@ class ITSERRAgent:
         """
         logger.info("processing_input", input_length=len(user_input), session_id=session_id)
 
-        # Step 1: Retrieve relevant memory context
-        memory_context = await self._memory.retrieve_context(
-            query=user_input,
-            session_id=session_id,
-        )
+        # Turns within a session run in order; other sessions proceed in parallel
+        with collect_spans() as spans:
+            try:
+                with span("agent.turn"):
+                    async with self._history.lock(session_id or "default"):
+                        return await self._process_turn(user_input, session_id)
+            finally:
+                logger.info("turn_timings", session_id=session_id, **span_fields(spans))
+
+    async def _process_turn(self, user_input: str, session_id: str | None) -> AIMessage:
+        """Run one turn of ``process`` (the caller holds the session lock)."""
+        # Step 1: Retrieve memory context
+        with span("agent.retrieve"):
+            memory_items = await self._memory.retrieve_items(
+                query=user_input,
+                session_id=session_id,
+            )
 
-        # Step 2: Build messages with context
-        messages = self._build_messages(user_input, memory_context)
+        # A near-identical question under the same context reuses its answer
+        cache_entry: tuple[list[float], str] | None = None
+        if self._response_cache is not None:
+            with span("agent.response_cache"):
+                cache_entry = (
+                    await self._memory.embed_query(user_input),
+                    self._response_cache_key(memory_items, session_id),
+                )
+                cached = self._response_cache.get(*cache_entry)
+            if cached is not None:
+                with span("agent.record"):
+                    await self._record_exchange(user_input, cached, session_id)
+                return AIMessage(content=cached, response_metadata={"response_cache": "hit"})
+
+        # Step 2: Build messages within the token budget
+        with span("agent.assemble"):
+            context = self._assemble_context(user_input, memory_items, session_id)
 
         # Step 3: Generate response
-        response = await self._llm.ainvoke(messages)
+        with span("agent.llm"):
+            response = await self._invoker.invoke(lambda: self._llm.ainvoke(context.messages))
+        self._record_llm_usage(getattr(response, "usage_metadata", None), session_id)
 
         # Step 4: Classify and tag with epistemic indicators
         # Note: We use a "belt-and-suspenders" approach here:
@@ -116,89 +298,315 @@ class ITSERRAgent:
         # The classifier preserves LLM-added tags (detected via regex) and only
         # adds classification to untagged sentences. This ensures consistent
         # indicator presence even when the LLM's instruction-following varies.
-        tagged_response = self._classifier.classify_and_tag(response.content)
-
-        # Step 5: Update memory
-        await self._memory.store_exchange(
-            user_input=user_input,
-            agent_response=tagged_response,
-            session_id=session_id,
+        with span("agent.classify"):
+            tagged_response = self._classifier.classify_and_tag(response.content)
+
+        # Steps 5-6: Update memory and conversation history
+        with span("agent.record"):
+            await self._record_exchange(user_input, tagged_response, session_id)
+        if cache_entry is not None and self._response_cache is not None:
+            self._response_cache.put(*cache_entry, tagged_response)
+
+        return AIMessage(
+            content=tagged_response,
+            response_metadata={"context_usage": context.usage.to_dict()},
         )
 
-        # Step 6: Update conversation history
-        self._conversation_history.append(HumanMessage(content=user_input))
-        self._conversation_history.append(AIMessage(content=tagged_response))
+    async def process_many(
+        self,
+        inputs: Iterable[str | BatchItem],
+        concurrency: int | None = None,
+        progress: Callable[[BatchResult], None] | None = None,
+    ) -> list[BatchResult]:
+        """
+        Process many questions concurrently.
+
+        Up to ``concurrency`` questions are in flight at once, so memory
+        retrieval, LLM calls, classification and memory writes of different
+        questions overlap. LLM requests are additionally capped by the
+        agent's request limiter (``llm_max_concurrent_requests`` and
+        ``llm_requests_per_second``).
+
+        Questions without a session each get their own fresh session, so they
+        run independently and never see each other's turns. Questions that
+        share a session run one after another, in input order.
+
+        A failing question is reported in its result and does not stop the
+        batch.
+
+        Args:
+            inputs: Questions, or BatchItems to pin questions to sessions
+            concurrency: Questions in flight (defaults to config.batch_concurrency)
+            progress: Called with each result as it completes
 
+        Returns:
+            One BatchResult per input, in input order
+        """
+        batch_id = uuid.uuid4().hex[:8]
+        items = [
+            item if isinstance(item, BatchItem) else BatchItem(input=item) for item in inputs
+        ]
+        results: list[BatchResult | None] = [None] * len(items)
+        pending = iter(enumerate(items))
+        started = time.perf_counter()
+
+        async def worker() -> None:
+            for index, item in pending:
+                session_id = item.session_id or f"batch-{batch_id}-{index}"
+                result = BatchResult(index=index, input=item.input, session_id=session_id)
+                start = time.perf_counter()
+                try:
+                    response = await self.process(item.input, session_id=session_id)
+                    result.response = str(response.content)
+                    result.metadata = dict(response.response_metadata)
+                except Exception as exc:
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    logger.warning("batch_item_failed", index=index, error=result.error)
+                result.latency_seconds = time.perf_counter() - start
+                results[index] = result
+                if progress is not None:
+                    progress(result)
+
+        workers = max(1, min(concurrency or self.config.batch_concurrency, len(items)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        completed = [result for result in results if result is not None]
         logger.info(
-            "response_generated",
-            response_length=len(tagged_response),
-            session_id=session_id,
+            "batch_processed",
+            items=len(completed),
+            failed=sum(not result.ok for result in completed),
+            concurrency=workers,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+            **self._llm_limiter.stats.to_dict(),
         )
+        return completed
 
-        return AIMessage(content=tagged_response)
-
-    def _build_messages(
+    async def astream(
         self,
         user_input: str,
-        memory_context: str | None,
-    ) -> list[BaseMessage]:
-        """Build the message list for LLM invocation."""
-        from langchain_core.messages import SystemMessage
-
-        system_prompt = self._get_system_prompt(memory_context)
+        session_id: str | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Process user input and stream the response as it is generated.
 
-        messages: list[BaseMessage] = [SystemMessage(content=system_prompt)]
-        messages.extend(self._conversation_history[-10:])  # Keep recent context
-        messages.append(HumanMessage(content=user_input))
+        Follows the same pipeline as ``process``, but yields a TOKEN event
+        for every chunk the LLM produces and a SENTENCE event as soon as a
+        sentence is complete and tagged with its epistemic indicator. Once
+        the stream ends, the full exchange is stored and a single COMPLETE
+        event carries the final tagged response.
 
-        return messages
+        Args:
+            user_input: The user's query or request
+            session_id: Optional session identifier for memory isolation
 
-    def _get_system_prompt(self, memory_context: str | None) -> str:
-        """Generate the system prompt with memory context."""
-        base_prompt = """You are an AI research assistant specialized in theological and religious studies.
+        Yields:
+            StreamEvent instances in generation order
+        """
+        logger.info(
+            "processing_input",
+            input_length=len(user_input),
+            session_id=session_id,
+            streaming=True,
+        )
 
-You operate with three core principles:
+        async with self._history.lock(session_id or "default"):
+            context = await self._prepare_messages(user_input, session_id)
+            tagger = self._classifier.incremental_tagger()
+            usage: UsageMetadata | None = None
+
+            # A stream cannot be retried once tokens reach the caller; it is
+            # still limited and counted by the circuit breaker
+            with span("agent.stream"):
+                async with self._llm_limiter, self._invoker.guard():
+                    async for chunk in self._llm.astream(context.messages):
+                        # Providers report usage in pieces (e.g. input on the first chunk)
+                        chunk_usage = getattr(chunk, "usage_metadata", None)
+                        if isinstance(chunk_usage, dict):
+                            usage = add_usage(usage, chunk_usage)
+                        token = chunk_text(chunk)
+                        if not token:
+                            continue
+                        sentences = tagger.feed(token)
+                        yield StreamEvent(
+                            type=StreamEventType.TOKEN,
+                            text=token,
+                            preview=self._stream_preview(tagger.text, tagger.pending),
+                        )
+                        for sentence in sentences:
+                            yield StreamEvent(
+                                type=StreamEventType.SENTENCE,
+                                text=sentence,
+                                preview=self._stream_preview(tagger.text, tagger.pending),
+                            )
+
+            for sentence in tagger.flush():
+                yield StreamEvent(
+                    type=StreamEventType.SENTENCE,
+                    text=sentence,
+                    preview=tagger.text,
+                )
+
+            self._record_llm_usage(usage, session_id)
+            tagged_response = tagger.text
+            with span("agent.record"):
+                await self._record_exchange(user_input, tagged_response, session_id)
+
+            yield StreamEvent(
+                type=StreamEventType.COMPLETE,
+                text=tagged_response,
+                preview=tagged_response,
+            )
 
-1. EPISTEMIC MODESTY: Always classify your responses using these indicators:
-   - [FACTUAL]: Verifiable information with citations (dates, quotes, bibliographic data)
-   - [INTERPRETIVE]: AI-assisted analysis requiring researcher verification (patterns, connections)
-   - [DEFERRED]: Matters requiring human judgment (theological truth claims, value judgments)
+    @staticmethod
+    def _stream_preview(tagged: str, pending: str) -> str:
+        """Join tagged sentences with the untagged text still streaming."""
+        if tagged and pending:
+            return f"{tagged} {pending}"
+        return tagged or pending
 
-2. NARRATIVE CONTINUITY: You maintain awareness of the researcher's ongoing inquiry.
-   Reference previous discussions when relevant and build upon established context.
+    async def _prepare_messages(
+        self,
+        user_input: str,
+        session_id: str | None,
+    ) -> AssembledContext:
+        """Retrieve memory and assemble the LLM message list within the token budget."""
+        with span("agent.retrieve"):
+            memory_items = await self._memory.retrieve_items(
+                query=user_input,
+                session_id=session_id,
+            )
+        with span("agent.assemble"):
+            return self._assemble_context(user_input, memory_items, session_id)
 
-3. TRANSPARENCY: Explain your reasoning. When uncertain, acknowledge it.
-   When making connections, mark them as interpretive.
+    def _response_cache_key(
+        self,
+        memory_items: "list[RetrievedMemory]",
+        session_id: str | None,
+    ) -> str:
+        """
+        Hash what a cached answer depends on besides the query itself.
+
+        Covers the model, the retrieved research notes, decisions and
+        reflections, and the session's previous exchange (so a follow-up
+        such as "tell me more" only matches the same preceding turn).
+        Retrieved conversation items are left out: a repeated question
+        always retrieves its own earlier exchange, which would otherwise
+        make every repeat a miss.
+        """
+        digest = hashlib.sha256(self.config.llm_model.encode())
+        for item in memory_items:
+            if item.stream_type != StreamType.CONVERSATION.value:
+                digest.update(f"\0{item.stream_type}\0{item.document}".encode())
+        for message in self._history.get(session_id or "default")[-2:]:
+            digest.update(f"\0{message.type}\0{message.content}".encode())
+        return digest.hexdigest()
+
+    def _record_llm_usage(self, usage_metadata: Any, session_id: str | None) -> None:
+        """Count prompt-cache reads and writes reported by the provider."""
+        if not isinstance(usage_metadata, dict):
+            return
+        self._prompt_cache_stats.record(usage_metadata)
+        details = usage_metadata.get("input_token_details") or {}
+        logger.info(
+            "llm_usage",
+            session_id=session_id,
+            input_tokens=usage_metadata.get("input_tokens"),
+            output_tokens=usage_metadata.get("output_tokens"),
+            cache_read_tokens=details.get("cache_read", 0),
+            cache_creation_tokens=details.get("cache_creation", 0),
+        )
 
-Format your responses with inline indicators, e.g.:
-"[FACTUAL] Gadamer published Truth and Method in 1960. [INTERPRETIVE] This work appears
-to connect with your earlier interest in hermeneutical approaches to biblical texts."
-"""
+    async def _record_exchange(
+        self,
+        user_input: str,
+        tagged_response: str,
+        session_id: str | None,
+    ) -> None:
+        """Store a completed exchange in memory and conversation history."""
+        # Queued for the background writer; retrieval waits for it when needed
+        await self._memory.submit_exchange(
+            user_input=user_input,
+            agent_response=tagged_response,
+            session_id=session_id,
+        )
 
-        if memory_context:
-            base_prompt += f"""
+        self._history.append(
+            session_id or "default",
+            HumanMessage(content=user_input),
+            AIMessage(content=tagged_response),
+        )
 
-RELEVANT CONTEXT FROM PREVIOUS SESSIONS:
-{memory_context}
+        logger.info(
+            "response_generated",
+            response_length=len(tagged_response),
+            session_id=session_id,
+        )
 
-Use this context to inform your response, but mark any references to it appropriately."""
+    def _assemble_context(
+        self,
+        user_input: str,
+        memory_items: "list[RetrievedMemory] | None",
+        session_id: str | None = None,
+    ) -> AssembledContext:
+        """Fit system prompt, session history and memory into the token budget."""
+        # Recent context from this session only
+        context = self._assembler.assemble(
+            SYSTEM_PROMPT,
+            self._history.get(session_id or "default"),
+            memory_items or [],
+            user_input,
+        )
+        logger.info("context_assembled", session_id=session_id, **context.usage.to_dict())
+        return context
 
-        return base_prompt
+    def _build_messages(
+        self,
+        user_input: str,
+        memory_items: "list[RetrievedMemory] | None",
+        session_id: str | None = None,
+    ) -> list[BaseMessage]:
+        """Build the message list for LLM invocation."""
+        return self._assemble_context(user_input, memory_items, session_id).messages
 
     async def close(self) -> None:
-        """Clean up resources and persist memory."""
+        """Clean up resources, flush queued memory writes and persist memory."""
         logger.info("closing_agent")
-        await self._memory.persist()
+        if self._memory_instance is not None:
+            await self._memory_instance.close()
+        self._history.close()
+        self._save_timings()
+
+    def _save_timings(self) -> None:
+        """Merge this process's stage latencies into the stats file for `itserr-agent stats`."""
+        try:
+            TIMINGS.save(self.config.memory_persist_path / TIMINGS_FILENAME)
+        except (OSError, ValueError) as exc:
+            logger.warning("timings_save_failed", error=str(exc))
+
+    async def persist(self) -> None:
+        """Flush queued memory writes and persist memory without closing."""
+        if self._memory_instance is not None:
+            await self._memory_instance.persist()
 
     @property
     def conversation_history(self) -> list[BaseMessage]:
-        """Get the current conversation history."""
-        return self._conversation_history.copy()
+        """Get the conversation history of the most recently active session."""
+        session_id = self._history.last_session
+        return self._history.get(session_id) if session_id is not None else []
 
-    def clear_conversation(self) -> None:
-        """Clear the current conversation history (memory is preserved)."""
-        self._conversation_history.clear()
-        logger.info("conversation_cleared")
+    def get_conversation_history(self, session_id: str | None = None) -> list[BaseMessage]:
+        """Get the recent conversation history of one session."""
+        return self._history.get(session_id or "default")
+
+    def clear_conversation(self, session_id: str | None = None) -> None:
+        """
+        Clear conversation history (memory is preserved).
+
+        Args:
+            session_id: Session to clear; None clears every session
+        """
+        self._history.clear(session_id)
+        logger.info("conversation_cleared", session_id=session_id)
 
     async def get_session_summary(self, session_id: str) -> str | None:
         """
@@ -215,3 +623,74 @@ Use this context to inform your response, but mark any references to it appropri
             A formatted summary string, or None if session not found
         """
         return await self._memory.get_session_summary(session_id)
+
+    async def search_memory(
+        self,
+        query: str,
+        session_id: str | None = None,
+        top_k: int | None = None,
+    ) -> "list[RetrievedMemory]":
+        """
+        Search narrative memory without generating a response.
+
+        Args:
+            query: Text to find related memories for
+            session_id: Optional session filter
+            top_k: Number of items to return (defaults to config value)
+
+        Returns:
+            Retrieved items ordered by combined score
+        """
+        return await self._memory.retrieve_items(query, session_id=session_id, top_k=top_k)
+
+    async def store_research_note(
+        self,
+        content: str,
+        source: str | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        """Store a research note (source consulted, annotation created) in memory."""
+        await self._memory.store_research_note(content, source=source, session_id=session_id)
+
+    async def store_decision(
+        self,
+        decision: str,
+        alternatives: list[str] | None = None,
+        rationale: str | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        """Store a research decision, with the alternatives considered, in memory."""
+        await self._memory.store_decision(
+            decision, alternatives=alternatives, rationale=rationale, session_id=session_id
+        )
+
+    @property
+    def memory_write_stats(self) -> dict[str, Any]:
+        """Write-behind queue metrics (submitted, completed, backpressure)."""
+        return self._memory.write_stats.to_dict()
+
+    @property
+    def memory_compaction_stats(self) -> dict[str, Any] | None:
+        """Last retention compaction run (collection size before/after, evictions)."""
+        stats = self._memory.compaction_stats
+        return stats.to_dict() if stats is not None else None
+
+    @property
+    def llm_request_stats(self) -> dict[str, Any]:
+        """LLM request shaping metrics (in flight, peak, throttling)."""
+        return self._llm_limiter.stats.to_dict()
+
+    @property
+    def llm_invocation_stats(self) -> dict[str, Any]:
+        """LLM reliability metrics (attempts, retries, timeouts, hedges, circuit)."""
+        return self._invoker.stats.to_dict()
+
+    @property
+    def response_cache_stats(self) -> dict[str, Any] | None:
+        """Response cache metrics (hits, misses, evictions, hit rate), or None if disabled."""
+        return self._response_cache.stats.to_dict() if self._response_cache else None
+
+    @property
+    def prompt_cache_stats(self) -> dict[str, Any]:
+        """Provider prompt-cache metrics (input tokens, cache reads and writes, hit rate)."""
+        return self._prompt_cache_stats.to_dict()
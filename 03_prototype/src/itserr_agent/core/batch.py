@@ -0,0 +1,170 @@
+"""
+Batch processing - Running many questions through the agent at once.
+
+Evaluation runs push hundreds of questions through the agent. Processing
+them one ``process()`` call at a time leaves the LLM idle during memory
+retrieval and the embedding model idle during LLM calls.
+``ITSERRAgent.process_many`` keeps up to ``batch_concurrency`` questions in
+flight, so retrieval, generation, classification and memory writes of
+different questions overlap.
+
+LLM traffic is shaped separately by a ``RequestLimiter``. The limiter is
+shared by every call the agent makes: a semaphore caps the number of
+in-flight requests (``llm_max_concurrent_requests``), and a token bucket
+caps the request rate (``llm_requests_per_second``), so batches stay within
+provider limits without starving interactive sessions.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from types import TracebackType
+from typing import Any
+
+
+@dataclass
+class BatchItem:
+    """One question in a batch, optionally pinned to a session."""
+
+    input: str
+    session_id: str | None = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch item, in input order."""
+
+    index: int
+    input: str
+    session_id: str
+    response: str | None = None
+    error: str | None = None
+    latency_seconds: float = 0.0
+    metadata: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item produced a response."""
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or JSONL output."""
+        data = asdict(self)
+        del data["metadata"]
+        return data
+
+
+@dataclass
+class RequestLimiterStats:
+    """Counters for LLM request shaping."""
+
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+class TokenBucket:
+    """Async token bucket; each ``acquire`` takes one token, waiting if none is left."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the largest burst
+            clock: Monotonic time source (injectable for tests)
+            sleep: Async sleep function (injectable for tests)
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting until one is available.
+
+        Waiters are served in arrival order.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                refill = (now - self._updated) * self._rate
+                self._tokens = min(self._capacity, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self._rate
+                await self._sleep(delay)
+                waited += delay
+
+
+class RequestLimiter:
+    """Caps concurrent LLM requests and, optionally, their rate."""
+
+    def __init__(self, max_concurrent: int, requests_per_second: float = 0.0) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent: Maximum requests in flight at once
+            requests_per_second: Sustained request rate (0 disables rate limiting)
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._bucket = (
+            TokenBucket(requests_per_second, capacity=max(1.0, requests_per_second))
+            if requests_per_second > 0
+            else None
+        )
+        self._stats = RequestLimiterStats()
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+        if self._bucket is not None:
+            try:
+                waited = await self._bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+            if waited:
+                self._stats.throttled += 1
+                self._stats.throttle_wait_seconds += waited
+        self._stats.requests += 1
+        self._stats.in_flight += 1
+        self._stats.peak_in_flight = max(self._stats.peak_in_flight, self._stats.in_flight)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._stats.in_flight -= 1
+        self._semaphore.release()
+
+    @property
+    def stats(self) -> RequestLimiterStats:
+        """Current request counters."""
+        return self._stats
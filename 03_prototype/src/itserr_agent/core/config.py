@@ -17,6 +17,7 @@ class LLMProvider(str, Enum):
 
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
+    MOCK = "mock"  # offline stand-in with simulated latency, for load testing
 
 
 class EmbeddingProvider(str, Enum):
@@ -26,6 +27,13 @@ class EmbeddingProvider(str, Enum):
     LOCAL = "local"  # sentence-transformers
 
 
+class MemoryBackendType(str, Enum):
+    """Supported vector stores for narrative memory."""
+
+    CHROMA = "chroma"
+    NUMPY = "numpy"  # in-process memory-mapped matrix
+
+
 class AgentConfig(BaseSettings):
     """
     Configuration for the ITSERR Agent.
@@ -56,6 +64,101 @@ class AgentConfig(BaseSettings):
         le=2.0,
         description="Temperature for LLM responses",
     )
+    llm_max_concurrent_requests: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum LLM requests in flight at once",
+    )
+    llm_requests_per_second: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Sustained LLM request rate limit (0 disables rate limiting)",
+    )
+    llm_timeout_seconds: float = Field(
+        default=60.0,
+        gt=0.0,
+        description="Timeout for a single LLM request attempt",
+    )
+    llm_max_retries: int = Field(
+        default=3,
+        ge=0,
+        description="Retries after a timeout, connection error, rate limit or 5xx/529",
+    )
+    llm_backoff_initial_seconds: float = Field(
+        default=0.5,
+        ge=0.0,
+        description="Scale of the jittered exponential backoff between retries",
+    )
+    llm_backoff_max_seconds: float = Field(
+        default=20.0,
+        ge=0.0,
+        description="Longest single backoff wait",
+    )
+    llm_hedging: bool = Field(
+        default=False,
+        description="Send a duplicate request when one runs past the observed p95 latency",
+    )
+    llm_hedge_min_delay_seconds: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Never send a hedged request earlier than this",
+    )
+    llm_circuit_failure_threshold: int = Field(
+        default=5,
+        ge=1,
+        description="Consecutive failed attempts before LLM calls fail fast",
+    )
+    llm_circuit_reset_seconds: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds calls fail fast before a trial request is let through",
+    )
+    mock_llm_latency_seconds: float = Field(
+        default=0.5,
+        ge=0.0,
+        description="Median time to first token of the mock provider",
+    )
+    mock_llm_latency_sigma: float = Field(
+        default=0.5,
+        ge=0.0,
+        description="Log-normal spread of the mock time to first token (0 = fixed)",
+    )
+    mock_llm_tokens_per_second: float = Field(
+        default=50.0,
+        ge=0.0,
+        description="Mock generation speed after the first token (0 = instant)",
+    )
+    mock_llm_output_tokens: int = Field(
+        default=120,
+        ge=1,
+        description="Tokens in every mock response",
+    )
+    mock_llm_error_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of mock requests failing with a retryable 529",
+    )
+    mock_llm_seed: int | None = Field(
+        default=None,
+        description="Seed for reproducible mock latencies and errors",
+    )
+    batch_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Questions in flight during batch processing",
+    )
+    llm_prompt_caching: bool = Field(
+        default=True,
+        description="Mark the system prompt and session history as a provider cache "
+        "breakpoint (Anthropic)",
+    )
+    llm_prompt_cache_min_tokens: int = Field(
+        default=1024,
+        ge=0,
+        description="Shortest prompt prefix (estimated tokens) marked as a cache breakpoint; "
+        "the provider does not cache shorter prefixes",
+    )
 
     # API Keys (loaded from environment)
     openai_api_key: str | None = Field(
@@ -76,6 +179,44 @@ class AgentConfig(BaseSettings):
         default="all-MiniLM-L6-v2",
         description="Embedding model identifier",
     )
+    embedding_batch_window_ms: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Window for coalescing concurrent embedding requests into one batch",
+    )
+    embedding_max_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Maximum texts per batched embedding call",
+    )
+    embedding_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Worker threads used for embedding off the event loop",
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True,
+        description="Cache embeddings on disk under memory_persist_path",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=100_000,
+        ge=1,
+        description="Maximum embeddings kept in the on-disk cache (LRU eviction)",
+    )
+    embedding_cache_memory_entries: int = Field(
+        default=2048,
+        ge=1,
+        description="Maximum embeddings kept in the in-memory LRU front",
+    )
+    embedding_keep_loaded: bool = Field(
+        default=True,
+        description="Keep the shared embedding model loaded after the last memory system closes",
+    )
+    embedding_torch_threads: int = Field(
+        default=0,
+        ge=0,
+        description="CPU threads for local embedding inference (0 = PyTorch default)",
+    )
 
     # Memory Configuration
     memory_persist_path: Path = Field(
@@ -86,17 +227,168 @@ class AgentConfig(BaseSettings):
         default="itserr_memory",
         description="ChromaDB collection name",
     )
+    memory_backend: MemoryBackendType = Field(
+        default=MemoryBackendType.CHROMA,
+        description="Vector store backing narrative memory",
+    )
+    memory_vector_dtype: Literal["float32", "float16"] = Field(
+        default="float32",
+        description="Embedding storage precision for the numpy backend",
+    )
     memory_top_k: int = Field(
         default=5,
         ge=1,
         le=20,
         description="Number of memory items to retrieve",
     )
+    memory_overfetch_factor: int = Field(
+        default=3,
+        ge=1,
+        le=20,
+        description="Candidates fetched per retrieved item before recency re-ranking",
+    )
+    memory_mmr_lambda: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Maximal marginal relevance trade-off between relevance (1.0, plain "
+        "top-k) and diversity (0.0) when selecting retrieved context",
+    )
+    memory_import_chunk_size: int = Field(
+        default=256,
+        ge=1,
+        le=10_000,
+        description="Records embedded and stored per call during bulk imports",
+    )
     reflection_trigger_count: int = Field(
         default=10,
         ge=1,
         description="Number of exchanges before triggering reflection",
     )
+    reflection_tree_enabled: bool = Field(
+        default=True,
+        description="Roll reflections up into a tree and retrieve by descending it",
+    )
+    reflection_tree_fanout: int = Field(
+        default=8,
+        ge=2,
+        description="Unsummarized reflections of one level that are rolled up into the next",
+    )
+    reflection_tree_beam: int = Field(
+        default=3,
+        ge=1,
+        description="Best-matching reflections expanded per tree level during retrieval",
+    )
+    memory_write_behind: bool = Field(
+        default=True,
+        description="Store exchanges (and run reflection) in a background worker",
+    )
+    memory_write_queue_size: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum exchanges waiting to be written before callers block",
+    )
+    stream_log_enabled: bool = Field(
+        default=True,
+        description="Keep memory streams in a durable append-only log replayed at startup",
+    )
+    stream_log_segment_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        ge=4096,
+        description="Size at which the active stream log segment is sealed",
+    )
+    stream_log_sync_every: int = Field(
+        default=64,
+        ge=1,
+        description="Stream log records appended per fsync",
+    )
+    stream_log_sync_interval_ms: float = Field(
+        default=1000.0,
+        ge=0.0,
+        description="Longest time an appended stream log record stays unsynced",
+    )
+    conversation_retention_hours: float = Field(
+        default=720.0,
+        ge=0.0,
+        description="Age after which exchanges are summarized and evicted (0 keeps them)",
+    )
+    conversation_retention_max_items: int = Field(
+        default=500,
+        ge=0,
+        description="Newest exchanges kept per session; older ones are summarized (0 keeps all)",
+    )
+    research_retention_hours: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Age after which research notes are evicted (0 keeps them forever)",
+    )
+    memory_compaction_enabled: bool = Field(
+        default=False,
+        description=(
+            "Apply retention policies periodically in a background task "
+            "(deletes old exchanges; off unless enabled)"
+        ),
+    )
+    memory_compaction_interval_seconds: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="Seconds between background compaction runs",
+    )
+    memory_compaction_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Items summarized and deleted per compaction batch",
+    )
+
+    # Context Assembly Configuration
+    context_token_budget: int = Field(
+        default=8000,
+        ge=512,
+        description="Estimated prompt tokens per request (system, history, memory, input)",
+    )
+    context_history_messages: int = Field(
+        default=10,
+        ge=0,
+        description="Most recent conversation messages considered for the prompt",
+    )
+
+    # Session History Configuration
+    history_max_messages: int = Field(
+        default=50,
+        ge=2,
+        description="Conversation messages kept per session (oldest dropped first)",
+    )
+    history_max_sessions: int = Field(
+        default=1000,
+        ge=1,
+        description="Sessions kept in memory before idle ones are evicted",
+    )
+    history_persist: bool = Field(
+        default=False,
+        description="Write session history to disk so sessions resume after restart",
+    )
+
+    # Response Cache Configuration
+    response_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse answers to near-identical questions asked under the same context",
+    )
+    response_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between queries for a cache hit",
+    )
+    response_cache_max_entries: int = Field(
+        default=512,
+        ge=1,
+        description="Cached responses kept before the least recently used is evicted",
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="Seconds a cached response stays valid",
+    )
 
     # Epistemic Indicator Configuration
     epistemic_default: Literal["FACTUAL", "INTERPRETIVE", "DEFERRED"] = Field(
@@ -140,6 +432,40 @@ class AgentConfig(BaseSettings):
         description="GNORM API timeout in seconds",
     )
 
+    # HTTP server (`itserr-agent serve`)
+    server_host: str = Field(
+        default="127.0.0.1",
+        description="Interface the HTTP server binds to",
+    )
+    server_port: int = Field(
+        default=8080,
+        ge=1,
+        le=65535,
+        description="Port the HTTP server listens on",
+    )
+    server_workers: int = Field(
+        default=16,
+        ge=1,
+        description="Chat turns the HTTP server processes concurrently",
+    )
+    server_max_queued: int = Field(
+        default=64,
+        ge=0,
+        description="Chat turns waiting for a worker before new ones are rejected (503)",
+    )
+    server_shutdown_timeout_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Time in-flight requests get to finish on shutdown",
+    )
+    server_allow_confirmed_tools: bool = Field(
+        default=False,
+        description=(
+            "Let HTTP clients run tools that require confirmation by sending "
+            "'confirmed': true (off: such tools are refused over HTTP)"
+        ),
+    )
+
     # Logging
     log_level: str = Field(
         default="INFO",
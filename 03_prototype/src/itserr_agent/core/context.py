@@ -0,0 +1,280 @@
+"""
+Context assembly - Fitting each prompt into a token budget.
+
+Every turn sends the system prompt, recent conversation and retrieved memory
+to the LLM. Without accounting, a few long answers or memory items are
+enough to inflate prompt size, cost and latency. The ContextAssembler fills
+``context_token_budget`` in priority order:
+
+1. System prompt and the user's input (always included)
+2. Latest conversation turns, newest first
+3. Memory items, best re-ranked score first
+
+The first item that does not fit is truncated if a useful amount of budget
+remains; everything after it is dropped. Usage is reported per request.
+
+Token counts are estimates: text is split into words and punctuation, and
+each word counts one token per four characters, which tracks BPE tokenizers
+closely for English and errs high for long Latin or German compounds.
+Counts are cached by text, so unchanged system prompts and history
+messages are only counted once.
+
+Messages are ordered for provider prefix caching: the static instructions,
+then the conversation history, then the final user message carrying this
+turn's memory context ahead of the input. Everything before the final
+message was already sent, byte for byte, on the previous turn of the
+session, so it can be served from the cache (OpenAI does this
+automatically; for Anthropic the assembler marks ``cache_control``
+breakpoints on the instruction block and on the last history message).
+Providers only cache prefixes above a minimum length (1024 tokens for most
+Anthropic models), so a breakpoint is only set where the prefix ending at it
+reaches ``cache_min_tokens``, and omitted where it could never hit.
+"""
+
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from itserr_agent.memory.streams import CONTEXT_SEPARATOR, RetrievedMemory
+
+# Role markers and formatting added by chat APIs around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRUNCATION_MARKER = " [...truncated]"
+
+# Anthropic cache breakpoint; everything up to the marked block is cached
+CACHE_CONTROL = {"type": "ephemeral"}
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    return sum((len(piece) + 3) // 4 for piece in _PIECES.findall(text))
+
+
+@dataclass
+class TokenUsage:
+    """Token accounting for one assembled prompt."""
+
+    budget: int
+    system: int = 0
+    history: int = 0
+    memory: int = 0
+    user: int = 0
+    history_messages: int = 0
+    history_dropped: int = 0
+    memory_items: int = 0
+    memory_dropped: int = 0
+    truncated: int = 0
+
+    @property
+    def total(self) -> int:
+        """Estimated prompt tokens."""
+        return self.system + self.history + self.memory + self.user
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or response metadata."""
+        return {**asdict(self), "total": self.total}
+
+
+@dataclass
+class AssembledContext:
+    """Messages ready for the LLM, with their token usage."""
+
+    messages: list[BaseMessage]
+    usage: TokenUsage
+    memory_context: str | None = field(default=None, repr=False)
+
+
+@dataclass
+class PromptCacheStats:
+    """Provider prompt-cache counters, summed over LLM responses."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cache_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of input tokens served from the provider cache."""
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def record(self, usage_metadata: Any) -> None:
+        """Add one response's ``usage_metadata`` (ignored if absent)."""
+        if not isinstance(usage_metadata, dict):
+            return
+        details = usage_metadata.get("input_token_details") or {}
+        cache_read = details.get("cache_read") or 0
+        self.requests += 1
+        self.input_tokens += usage_metadata.get("input_tokens") or 0
+        self.cache_read_tokens += cache_read
+        self.cache_creation_tokens += details.get("cache_creation") or 0
+        self.cache_hits += cache_read > 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class ContextAssembler:
+    """Builds LLM message lists within a token budget."""
+
+    def __init__(
+        self,
+        budget: int,
+        max_history_messages: int = 10,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        min_truncated_tokens: int = 32,
+        memory_template: str = "{memory_context}",
+        cache_breakpoint: bool = False,
+        cache_min_tokens: int = 0,
+    ) -> None:
+        """
+        Initialize the assembler.
+
+        Args:
+            budget: Maximum estimated prompt tokens
+            max_history_messages: Upper bound on conversation messages included
+            token_counter: Function counting tokens in a string
+            min_truncated_tokens: Smallest remainder worth filling with a truncated item
+            memory_template: Framing for the memory block, with a ``{memory_context}`` field
+            cache_breakpoint: Mark the cacheable prefix with Anthropic ``cache_control``
+            cache_min_tokens: Shortest prefix (estimated tokens) worth a breakpoint
+        """
+        self._budget = budget
+        self._max_history = max_history_messages
+        self._count = token_counter
+        self._min_truncated = min_truncated_tokens
+        self._memory_template = memory_template
+        self._cache_breakpoint = cache_breakpoint
+        self._cache_min_tokens = cache_min_tokens
+
+    def assemble(
+        self,
+        system_prompt: str,
+        history: Sequence[BaseMessage],
+        memory_items: Sequence[RetrievedMemory],
+        user_input: str,
+    ) -> AssembledContext:
+        """
+        Assemble the message list for one turn.
+
+        Args:
+            system_prompt: Static instructions, identical on every turn
+            history: The session's conversation, oldest first
+            memory_items: Retrieved memory, best first
+            user_input: The user's current message
+
+        Returns:
+            The messages to send and their token usage
+        """
+        usage = TokenUsage(budget=self._budget)
+        usage.system = self._count(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        usage.user = self._count(user_input) + MESSAGE_OVERHEAD_TOKENS
+        remaining = self._budget - usage.system - usage.user
+
+        # Latest turns first, as a contiguous run ending at the newest message
+        selected: list[BaseMessage] = []
+        candidates = list(history[-self._max_history :]) if self._max_history else []
+        usage.history_dropped = len(history) - len(candidates)
+        while candidates:
+            message = candidates.pop()
+            cost = self._count(str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+            if cost <= remaining:
+                selected.append(message)
+                remaining -= cost
+                continue
+            if remaining - MESSAGE_OVERHEAD_TOKENS >= self._min_truncated:
+                text = self._truncate(str(message.content), remaining - MESSAGE_OVERHEAD_TOKENS)
+                selected.append(message.__class__(content=text))
+                remaining -= self._count(text) + MESSAGE_OVERHEAD_TOKENS
+                usage.truncated += 1
+            else:
+                candidates.append(message)
+            usage.history_dropped += len(candidates)
+            break
+        selected.reverse()
+        # Chat APIs expect the conversation to open with a user turn
+        while selected and isinstance(selected[0], AIMessage):
+            remaining += self._count(str(selected.pop(0).content)) + MESSAGE_OVERHEAD_TOKENS
+            usage.history_dropped += 1
+        usage.history = sum(
+            self._count(str(message.content)) + MESSAGE_OVERHEAD_TOKENS for message in selected
+        )
+        usage.history_messages = len(selected)
+
+        # Memory items by score, paying once for the memory section's framing
+        blocks: list[str] = []
+        if memory_items:
+            framing = self._count(self._memory_template.format(memory_context=""))
+            remaining -= framing
+            for position, item in enumerate(memory_items):
+                block = item.format()
+                cost = self._count(block) + self._count(CONTEXT_SEPARATOR)
+                if cost <= remaining:
+                    blocks.append(block)
+                    remaining -= cost
+                    usage.memory += cost
+                    continue
+                if remaining >= self._min_truncated:
+                    block = self._truncate(block, remaining)
+                    blocks.append(block)
+                    usage.memory += self._count(block)
+                    usage.truncated += 1
+                    position += 1
+                usage.memory_dropped = len(memory_items) - position
+                break
+            if blocks:
+                usage.memory += framing
+        usage.memory_items = len(blocks)
+
+        memory_context = CONTEXT_SEPARATOR.join(blocks) if blocks else None
+        messages: list[BaseMessage] = [self._system_message(system_prompt)]
+        messages.extend(self._mark_history(selected, usage.system + usage.history))
+        messages.append(self._user_message(user_input, memory_context))
+        return AssembledContext(messages=messages, usage=usage, memory_context=memory_context)
+
+    def _system_message(self, system_prompt: str) -> SystemMessage:
+        """The static instruction block, marked if it is cacheable on its own."""
+        instructions: dict[str, Any] = {"type": "text", "text": system_prompt}
+        if self._cache_breakpoint and self._count(system_prompt) >= self._cache_min_tokens:
+            instructions["cache_control"] = CACHE_CONTROL
+        return SystemMessage(content=[instructions])
+
+    def _mark_history(self, history: list[BaseMessage], prefix_tokens: int) -> list[BaseMessage]:
+        """Mark the last history message, the end of the stable prefix, if it is cacheable."""
+        if not history or not self._cache_breakpoint or prefix_tokens < self._cache_min_tokens:
+            return history
+        last = history[-1]
+        block = {"type": "text", "text": str(last.content), "cache_control": CACHE_CONTROL}
+        return [*history[:-1], last.__class__(content=[block])]
+
+    def _user_message(self, user_input: str, memory_context: str | None) -> HumanMessage:
+        """The user's input, preceded by this turn's memory context (after the cached prefix)."""
+        if not memory_context:
+            return HumanMessage(content=user_input)
+        text = self._memory_template.format(memory_context=memory_context)
+        return HumanMessage(
+            content=[{"type": "text", "text": text}, {"type": "text", "text": user_input}]
+        )
+
+    def _truncate(self, text: str, tokens: int) -> str:
+        """Cut text to roughly ``tokens`` tokens, marking the cut."""
+        budget = tokens - self._count(TRUNCATION_MARKER)
+        kept = 0
+        end = 0
+        for match in _PIECES.finditer(text):
+            # Per-piece estimate; the caller re-counts the result exactly
+            kept += (match.end() - match.start() + 3) // 4
+            if kept > budget:
+                break
+            end = match.end()
+        return text[:end] + TRUNCATION_MARKER
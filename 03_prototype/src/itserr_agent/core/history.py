@@ -0,0 +1,195 @@
+"""
+Session history - Per-session conversation buffers for multi-session serving.
+
+One agent process may serve several researchers at once. Each session gets
+its own bounded ring buffer of recent messages, so histories never
+interleave and memory use stays flat no matter how long a session runs.
+Idle sessions are evicted least-recently-used first once more than
+``history_max_sessions`` are held in memory.
+
+With ``history_persist`` enabled, every message is also written through to
+a small SQLite table under ``memory_persist_path``; an evicted (or
+restarted) session is reloaded from disk on its next turn.
+
+Each session also has an asyncio lock. The agent holds it for a whole turn,
+so turns within a session stay ordered while different sessions proceed in
+parallel. A lock exists only while some turn holds or awaits it, and a
+session whose lock is in use is never evicted.
+"""
+
+import asyncio
+import contextlib
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import structlog
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+logger = structlog.get_logger()
+
+HISTORY_FILENAME = "session_history.sqlite3"
+
+_ROLES: dict[str, type[BaseMessage]] = {"human": HumanMessage, "ai": AIMessage}
+
+
+class SessionHistoryStore:
+    """Bounded, LRU-evicted conversation history per session."""
+
+    def __init__(
+        self,
+        max_messages: int,
+        max_sessions: int,
+        persist_path: Path | None = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_messages: Messages kept per session (oldest dropped first)
+            max_sessions: Sessions held in memory before idle ones are evicted
+            persist_path: Directory for the write-through SQLite file (None for memory only)
+        """
+        self._max_messages = max_messages
+        self._max_sessions = max_sessions
+        self._sessions: OrderedDict[str, deque[BaseMessage]] = OrderedDict()
+        # Locks in use, with the number of turns holding or awaiting each
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self._last_session: str | None = None
+
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        if persist_path is not None:
+            persist_path.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(persist_path / HISTORY_FILENAME, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                )
+                """
+            )
+            self._db.commit()
+
+    @contextlib.asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """Hold the lock serializing turns within a session."""
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._lock_users[session_id] = self._lock_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            # Drop the lock only once no turn holds or awaits it
+            self._lock_users[session_id] -= 1
+            if not self._lock_users[session_id]:
+                del self._lock_users[session_id]
+                del self._locks[session_id]
+
+    def get(self, session_id: str) -> list[BaseMessage]:
+        """Get a copy of a session's recent messages, oldest first."""
+        return list(self._buffer(session_id))
+
+    def append(self, session_id: str, *messages: BaseMessage) -> None:
+        """Append messages to a session, dropping the oldest beyond the limit."""
+        buffer = self._buffer(session_id)
+        buffer.extend(messages)
+        self._last_session = session_id
+        if self._db is not None:
+            self._write(session_id, messages)
+
+    def clear(self, session_id: str | None = None) -> None:
+        """Clear one session's history, or every session's when None."""
+        if session_id is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(session_id, None)
+        if self._db is not None:
+            with self._db_lock:
+                if session_id is None:
+                    self._db.execute("DELETE FROM messages")
+                else:
+                    self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                self._db.commit()
+
+    @property
+    def last_session(self) -> str | None:
+        """The session that most recently received messages."""
+        return self._last_session
+
+    @property
+    def session_count(self) -> int:
+        """Number of sessions currently held in memory."""
+        return len(self._sessions)
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def _buffer(self, session_id: str) -> deque[BaseMessage]:
+        """Get (loading or creating) a session's buffer and mark it recently used."""
+        buffer = self._sessions.get(session_id)
+        if buffer is None:
+            buffer = deque(self._load(session_id), maxlen=self._max_messages)
+            self._sessions[session_id] = buffer
+            self._evict()
+        else:
+            self._sessions.move_to_end(session_id)
+        return buffer
+
+    def _evict(self) -> None:
+        """Drop least-recently-used sessions that no turn holds or awaits."""
+        if len(self._sessions) <= self._max_sessions:
+            return
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self._max_sessions:
+                break
+            if session_id in self._locks:
+                continue
+            del self._sessions[session_id]
+            logger.debug("session_history_evicted", session_id=session_id)
+
+    def _load(self, session_id: str) -> list[BaseMessage]:
+        """Read a session's most recent messages from disk."""
+        if self._db is None:
+            return []
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, self._max_messages),
+            ).fetchall()
+        return [_ROLES[role](content=content) for role, content in reversed(rows)]
+
+    def _write(self, session_id: str, messages: tuple[BaseMessage, ...]) -> None:
+        """Write messages through to disk and trim the session to the limit."""
+        assert self._db is not None
+        with self._db_lock:
+            last = self._db.execute(
+                "SELECT COALESCE(MAX(seq), -1) FROM messages WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()[0]
+            self._db.executemany(
+                "INSERT INTO messages VALUES (?, ?, ?, ?)",
+                [
+                    (session_id, last + 1 + offset, message.type, str(message.content))
+                    for offset, message in enumerate(messages)
+                ],
+            )
+            self._db.execute(
+                "DELETE FROM messages WHERE session_id = ? AND seq <= ?",
+                (session_id, last + len(messages) - self._max_messages),
+            )
+            self._db.commit()
@@ -0,0 +1,192 @@
+"""
+Mock LLM - An offline chat model with configurable latency for load testing.
+
+``LLMProvider.MOCK`` swaps the provider client for ``MockChatModel`` so the
+whole ``ITSERRAgent.process``/``astream`` path (memory, context assembly,
+request shaping, retries, classification) can be exercised without an API
+key or network access.
+
+Each request waits a time-to-first-token drawn from a log-normal
+distribution (median ``latency_seconds``, shape ``latency_sigma``; 0 makes it
+fixed), then produces ``output_tokens`` tokens at ``tokens_per_second``.
+Streaming yields those tokens as they are "generated"; ``ainvoke`` returns
+once the last one is. A fraction ``error_rate`` of requests fails with a
+retryable 529, so retry and circuit-breaker behaviour can be load-tested too.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field, PrivateAttr
+
+from itserr_agent.core.context import MESSAGE_OVERHEAD_TOKENS, estimate_tokens
+from itserr_agent.core.streaming import chunk_text
+
+# Words the filler text is drawn from; each counts as one output token
+_FILLER = (
+    "the text interpretation tradition scholars source reading context "
+    "historical community argument evidence suggests however may be further"
+).split()
+
+
+class MockOverloadedError(Exception):
+    """Simulated provider overload (HTTP 529), treated as retryable."""
+
+    status_code = 529
+
+
+class MockChatModel(BaseChatModel):
+    """Chat model that simulates provider latency and streaming locally."""
+
+    latency_seconds: float = Field(default=0.5, ge=0.0)
+    """Median time to first token"""
+
+    latency_sigma: float = Field(default=0.5, ge=0.0)
+    """Log-normal shape of the time to first token (0 = always the median)"""
+
+    tokens_per_second: float = Field(default=50.0, ge=0.0)
+    """Generation speed after the first token (0 = all tokens at once)"""
+
+    output_tokens: int = Field(default=120, ge=1)
+    """Tokens in every response"""
+
+    error_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    """Fraction of requests failing with ``MockOverloadedError``"""
+
+    seed: int | None = None
+    """Seed for reproducible latencies and errors"""
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context: Any, /) -> None:
+        """Create the random source."""
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "itserr-mock"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {
+            "latency_seconds": self.latency_seconds,
+            "latency_sigma": self.latency_sigma,
+            "tokens_per_second": self.tokens_per_second,
+            "output_tokens": self.output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        first_token, per_token = self._plan()
+        time.sleep(first_token + per_token * self.output_tokens)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        first_token, per_token = self._plan()
+        await asyncio.sleep(first_token + per_token * self.output_tokens)
+        return self._result(messages)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        first_token, per_token = self._plan()
+        time.sleep(first_token)
+        for chunk in self._chunks(messages):
+            yield chunk
+            time.sleep(per_token)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        first_token, per_token = self._plan()
+        await asyncio.sleep(first_token)
+        for chunk in self._chunks(messages):
+            yield chunk
+            await asyncio.sleep(per_token)
+
+    def _plan(self) -> tuple[float, float]:
+        """
+        Draw the time to first token and the per-token delay for one request.
+
+        Raises:
+            MockOverloadedError: For the simulated fraction of failing requests
+        """
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise MockOverloadedError("mock provider overloaded")
+        first_token = self.latency_seconds
+        if self.latency_seconds > 0 and self.latency_sigma > 0:
+            log_median = math.log(self.latency_seconds)
+            first_token = self._rng.lognormvariate(log_median, self.latency_sigma)
+        per_token = 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+        return first_token, per_token
+
+    def _tokens(self, messages: list[BaseMessage]) -> list[str]:
+        """The response, split into output tokens."""
+        # The question is the final message's last block; memory context precedes it
+        content = messages[-1].content if messages else ""
+        if isinstance(content, list):
+            content = content[-1:]
+        question = " ".join(chunk_text(content).split()[:12])
+        tokens = ["[INTERPRETIVE] ", "Mock ", "answer ", "to: ", f"{question}. "]
+        while len(tokens) < self.output_tokens:
+            tokens.append(_FILLER[len(tokens) % len(_FILLER)] + " ")
+        tokens = tokens[: self.output_tokens]
+        tokens[-1] = tokens[-1].rstrip() + "."
+        return tokens
+
+    def _usage(self, messages: list[BaseMessage]) -> UsageMetadata:
+        """Estimated input tokens and the configured output tokens."""
+        input_tokens = sum(
+            estimate_tokens(chunk_text(message)) + MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        )
+        return UsageMetadata(
+            input_tokens=input_tokens,
+            output_tokens=self.output_tokens,
+            total_tokens=input_tokens + self.output_tokens,
+        )
+
+    def _result(self, messages: list[BaseMessage]) -> ChatResult:
+        """A complete response."""
+        message = AIMessage(
+            content="".join(self._tokens(messages)), usage_metadata=self._usage(messages)
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, messages: list[BaseMessage]) -> Iterator[ChatGenerationChunk]:
+        """The response as one chunk per token; usage rides on the last one."""
+        tokens = self._tokens(messages)
+        for index, token in enumerate(tokens):
+            usage = self._usage(messages) if index == len(tokens) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
@@ -0,0 +1,379 @@
+"""
+Resilient invocation - Timeouts, retries, hedging and circuit breaking for LLM calls.
+
+A single slow or overloaded provider response should not stall a research
+session. ``ResilientInvoker`` wraps each LLM request in:
+
+- a per-attempt timeout (``llm_timeout_seconds``),
+- retries with jittered exponential backoff on retryable errors
+  (timeouts, connection errors, HTTP 408/409/429 and 5xx including
+  Anthropic's 529 "overloaded"); other errors are raised immediately,
+- optional hedging (``llm_hedging``): if an attempt has not finished after
+  the observed p95 latency, a duplicate request is sent and whichever
+  succeeds first is used,
+- a circuit breaker: after ``llm_circuit_failure_threshold`` consecutive
+  retryable failures, calls fail fast with ``CircuitOpenError`` for
+  ``llm_circuit_reset_seconds``, then a single trial request decides
+  whether to close the circuit again.
+
+Counters for attempts, retries, timeouts, hedges and rejected calls are
+kept in ``InvocationStats``.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, TypeVar
+
+import numpy as np
+import structlog
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Status codes worth retrying: timeout, conflict, rate limit; 5xx is added below
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Provider SDK errors that carry no status code but are transient
+RETRYABLE_ERROR_NAMES = frozenset(
+    {"APIConnectionError", "APITimeoutError", "RateLimitError", "OverloadedError"}
+)
+
+# Latency samples needed before the p95 is trusted as a hedge delay
+HEDGE_MIN_SAMPLES = 20
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider that is failing."""
+
+
+class CircuitState(str, Enum):
+    """States of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an error is transient and worth another attempt."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return type(exc).__name__ in RETRYABLE_ERROR_NAMES
+
+
+@dataclass
+class InvocationStats:
+    """Counters describing LLM invocation reliability."""
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    circuit_rejections: int = 0
+    circuit_opens: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the breaker (closed).
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial request
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._threshold = failure_threshold
+        self._reset = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CircuitState.CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit."""
+        return self._state
+
+    def check(self) -> bool:
+        """
+        Admit a request or fail fast.
+
+        Once the reset time has passed, one request is admitted as a trial
+        (half-open); others keep failing fast until its outcome is recorded
+        or the trial is abandoned.
+
+        Returns:
+            True if the request was admitted as the half-open trial
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a trial is in flight
+        """
+        if self._state is CircuitState.CLOSED:
+            return False
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._reset:
+            self._state = CircuitState.HALF_OPEN
+            return True
+        raise CircuitOpenError("LLM provider circuit is open; failing fast")
+
+    def abandon_trial(self) -> None:
+        """Free the trial slot of a request that ended without an outcome (e.g. cancelled)."""
+        if self._state is CircuitState.HALF_OPEN:
+            # The reset time has already passed, so the next request is the new trial
+            self._state = CircuitState.OPEN
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        self._failures = 0
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> bool:
+        """
+        Count a failure.
+
+        Returns:
+            True if this failure opened the circuit
+        """
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or (
+            self._state is CircuitState.CLOSED and self._failures >= self._threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            return True
+        return False
+
+
+class ResilientInvoker:
+    """Runs LLM requests with timeouts, retries, optional hedging and a circuit breaker."""
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        max_retries: int,
+        backoff_initial_seconds: float,
+        backoff_max_seconds: float,
+        breaker: CircuitBreaker,
+        hedging: bool = False,
+        hedge_min_delay_seconds: float = 1.0,
+        limiter: AbstractAsyncContextManager[Any] | None = None,
+        latency_window: int = 200,
+    ) -> None:
+        """
+        Initialize the invoker.
+
+        Args:
+            timeout_seconds: Limit for each attempt (excluding time queued in the limiter)
+            max_retries: Retries after the first attempt
+            backoff_initial_seconds: Backoff scale; waits grow exponentially with jitter
+            backoff_max_seconds: Cap on a single backoff wait
+            breaker: Circuit breaker shared by all requests
+            hedging: Send a duplicate request when an attempt runs past the p95
+            hedge_min_delay_seconds: Never hedge earlier than this
+            limiter: Async context manager entered around every request (incl. hedges)
+            latency_window: Recent successful latencies kept for the p95
+        """
+        self._timeout = timeout_seconds
+        self._max_retries = max_retries
+        self._backoff_initial = backoff_initial_seconds
+        self._backoff_max = backoff_max_seconds
+        self._breaker = breaker
+        self._hedging = hedging
+        self._hedge_min_delay = hedge_min_delay_seconds
+        self._limiter = limiter
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._stats = InvocationStats()
+
+    async def invoke(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``call`` resiliently.
+
+        Args:
+            call: Creates the request coroutine; called once per attempt (and hedge)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            CircuitOpenError: If the provider circuit is open
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        self._stats.calls += 1
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self._max_retries + 1),
+            wait=wait_random_exponential(multiplier=self._backoff_initial, max=self._backoff_max),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=self._before_retry,
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    return await self._attempt(call)
+        except Exception:
+            self._stats.failures += 1
+            raise
+        raise AssertionError("unreachable: tenacity either returns or re-raises")
+
+    def guard(self) -> "_Guard":
+        """Circuit-breaker guard for requests that cannot be retried (e.g. streams)."""
+        return _Guard(self)
+
+    @property
+    def stats(self) -> InvocationStats:
+        """Current invocation counters."""
+        return self._stats
+
+    @property
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a hedge is sent, or None while hedging is off or warming up."""
+        if not self._hedging or len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        p95 = float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), 95))
+        return max(self._hedge_min_delay, p95)
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]]) -> T:
+        """One attempt, admitted by the breaker, hedged if it runs long."""
+        try:
+            trial = self._breaker.check()
+        except CircuitOpenError:
+            self._stats.circuit_rejections += 1
+            raise
+        try:
+            result = await self._hedged(call)
+        except Exception as exc:
+            self._record_outcome(exc)
+            raise
+        except BaseException:
+            # Cancellation: no verdict on the provider, but the trial slot is freed
+            if trial:
+                self._breaker.abandon_trial()
+            raise
+        self._record_outcome(None)
+        return result
+
+    async def _hedged(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run one request, racing a duplicate against it past the hedge delay."""
+        delay = self.hedge_delay
+        if delay is None:
+            return await self._request(call)
+
+        primary = asyncio.ensure_future(self._request(call))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+
+        self._stats.hedges += 1
+        hedge = asyncio.ensure_future(self._request(call))
+        pending = {primary, hedge}
+        errors: list[BaseException] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            self._stats.hedge_wins += 1
+                        return task.result()
+                    errors.append(error)
+            raise errors[0]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, call: Callable[[], Awaitable[T]]) -> T:
+        """A single provider request under the limiter and the attempt timeout."""
+        async with self._limiter if self._limiter is not None else nullcontext():
+            self._stats.attempts += 1
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(call(), timeout=self._timeout)
+            except TimeoutError:
+                self._stats.timeouts += 1
+                raise
+            self._latencies.append(time.perf_counter() - start)
+            return result
+
+    def _record_outcome(self, error: BaseException | None) -> None:
+        """Feed an attempt's outcome to the circuit breaker."""
+        # Non-retryable errors (e.g. a bad request) still prove the provider is up
+        if error is None or not is_retryable(error):
+            self._breaker.record_success()
+        elif self._breaker.record_failure():
+            self._stats.circuit_opens += 1
+            logger.warning("llm_circuit_opened", error=str(error))
+
+    def _before_retry(self, state: RetryCallState) -> None:
+        """Count and log a retry before its backoff wait."""
+        self._stats.retries += 1
+        error = state.outcome.exception() if state.outcome else None
+        logger.warning(
+            "llm_retry",
+            attempt=state.attempt_number,
+            wait_seconds=round(state.upcoming_sleep, 3),
+            error=f"{type(error).__name__}: {error}" if error else None,
+        )
+
+
+class _Guard:
+    """Async context manager applying the circuit breaker to one request."""
+
+    def __init__(self, invoker: ResilientInvoker) -> None:
+        self._invoker = invoker
+        self._trial = False
+
+    async def __aenter__(self) -> None:
+        self._invoker._stats.calls += 1
+        try:
+            self._trial = self._invoker._breaker.check()
+        except CircuitOpenError:
+            self._invoker._stats.circuit_rejections += 1
+            raise
+
+    async def __aexit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        if exc is not None and not isinstance(exc, Exception):
+            # Cancellation: no verdict on the provider, but the trial slot is freed
+            if self._trial:
+                self._invoker._breaker.abandon_trial()
+            return
+        self._invoker._record_outcome(exc)
+        if exc is not None:
+            self._invoker._stats.failures += 1
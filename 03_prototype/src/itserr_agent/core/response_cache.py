@@ -0,0 +1,172 @@
+"""
+Response cache - Reusing answers to near-identical questions.
+
+Researchers (and the demo scenarios) often ask the same question again in
+slightly different words. When the response cache is enabled, the agent
+looks up the query embedding among recent answers before calling the LLM;
+an answer is reused when its query is at least ``similarity_threshold``
+cosine-similar *and* it was generated under the same context key (model id
+plus the memory and conversation the answer depended on). Answers are
+stored already tagged, so a hit returns exactly what the researcher saw
+the first time.
+
+Entries expire after ``ttl_seconds`` and the least recently used entry is
+evicted once ``max_entries`` are held. The cache lives in process memory
+only; a restart starts cold.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ResponseCacheStats:
+    """Hit/miss counters for the response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+@dataclass
+class _Entry:
+    """One cached answer."""
+
+    vector: np.ndarray
+    context_key: str
+    response: str
+    created: float
+
+
+class ResponseCache:
+    """In-memory, similarity-keyed cache of tagged responses with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries held before the least recently used is evicted
+            ttl_seconds: Age after which an entry is no longer served
+            similarity_threshold: Minimum cosine similarity between queries for a hit
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._threshold = similarity_threshold
+        self._clock = clock
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._by_context: dict[str, set[int]] = {}
+        self._next_id = 0
+        self._stats = ResponseCacheStats()
+
+    def get(self, embedding: Sequence[float], context_key: str) -> str | None:
+        """
+        Look up the answer to the most similar cached query.
+
+        Args:
+            embedding: Embedding of the current query
+            context_key: Key of the context the answer must have been generated under
+
+        Returns:
+            The cached tagged response, or None on a miss
+        """
+        self._expire(context_key)
+        ids = list(self._by_context.get(context_key, ()))
+        if ids:
+            matrix = np.stack([self._entries[entry_id].vector for entry_id in ids])
+            similarities = matrix @ _normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self._threshold:
+                entry_id = ids[best]
+                self._entries.move_to_end(entry_id)
+                self._stats.hits += 1
+                logger.debug("response_cache_hit", similarity=float(similarities[best]))
+                return self._entries[entry_id].response
+        self._stats.misses += 1
+        return None
+
+    def put(self, embedding: Sequence[float], context_key: str, response: str) -> None:
+        """
+        Cache a tagged response.
+
+        Args:
+            embedding: Embedding of the query the response answers
+            context_key: Key of the context the response was generated under
+            response: The tagged response text
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(
+            vector=_normalize(embedding),
+            context_key=context_key,
+            response=response,
+            created=self._clock(),
+        )
+        self._by_context.setdefault(context_key, set()).add(entry_id)
+        while len(self._entries) > self._max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+        self._stats.entries = len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+        self._by_context.clear()
+        self._stats.entries = 0
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        """Current hit/miss counters."""
+        return self._stats
+
+    def _expire(self, context_key: str) -> None:
+        """Remove expired entries for one context key."""
+        cutoff = self._clock() - self._ttl
+        for entry_id in list(self._by_context.get(context_key, ())):
+            if self._entries[entry_id].created <= cutoff:
+                self._remove(entry_id)
+                self._stats.expirations += 1
+        self._stats.entries = len(self._entries)
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove one entry from both indexes."""
+        entry = self._entries.pop(entry_id)
+        ids = self._by_context[entry.context_key]
+        ids.discard(entry_id)
+        if not ids:
+            del self._by_context[entry.context_key]
+
+
+def _normalize(embedding: Sequence[float]) -> np.ndarray:
+    """Unit-length float32 copy of an embedding (zero vectors stay zero)."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
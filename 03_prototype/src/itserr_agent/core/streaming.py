@@ -0,0 +1,62 @@
+"""
+Streaming response events for the ITSERR Agent.
+
+``ITSERRAgent.astream`` yields these events so that interfaces can show
+tokens as soon as the LLM produces them, then swap in the epistemically
+tagged version of each sentence once it is complete.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+class StreamEventType(str, Enum):
+    """Kinds of events produced while streaming a response."""
+
+    TOKEN = "token"
+    """Raw text as received from the LLM"""
+
+    SENTENCE = "sentence"
+    """A completed sentence carrying its epistemic indicator"""
+
+    COMPLETE = "complete"
+    """The full tagged response, emitted once after the exchange is stored"""
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """
+    A single event in a streamed agent response.
+
+    Attributes:
+        type: What kind of event this is
+        text: The token, tagged sentence, or full tagged response
+        preview: Tagged sentences so far followed by the untagged text still
+            being streamed; suitable for re-rendering a live display
+    """
+
+    type: StreamEventType
+    text: str
+    preview: str = ""
+
+
+def chunk_text(chunk: Any) -> str:
+    """
+    Extract plain text from a streamed LLM message chunk.
+
+    Providers differ in chunk shape: OpenAI chunks carry a string, while
+    Anthropic chunks may carry a list of content blocks.
+    """
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and block.get("type", "text") == "text":
+                parts.append(block.get("text", ""))
+        return "".join(parts)
+    return ""
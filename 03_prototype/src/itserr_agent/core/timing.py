@@ -0,0 +1,238 @@
+"""
+Timing - Lightweight spans and latency histograms for the turn pipeline.
+
+A slow turn can come from embedding, the vector store, the LLM,
+classification or the memory write. Each of those steps runs inside a
+``span``; its duration is recorded in a process-wide ``TimingRegistry`` of
+log-bucketed histograms, from which p50/p95/p99 are read. Recording is a
+``perf_counter`` call and a bucket increment, so spans can stay on in
+production.
+
+Spans nested inside ``collect_spans()`` are also gathered per turn; the
+agent logs them as ``<span>_ms`` fields on one ``turn_timings`` event.
+
+Histograms are kept in memory; ``save``/``load`` merge them into a JSON
+file so ``itserr-agent stats`` can report across runs.
+"""
+
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TIMINGS_FILENAME = "latency_stats.json"
+
+# Bucket i covers [BASE * GROWTH**i, BASE * GROWTH**(i+1)) seconds:
+# 10 microseconds up to ~10 minutes with ~9% resolution
+_BASE_SECONDS = 1e-5
+_GROWTH = 2 ** (1 / 8)
+_BUCKETS = 256
+
+_turn_spans: ContextVar[dict[str, float] | None] = ContextVar("turn_spans", default=None)
+
+
+@dataclass
+class LatencyHistogram:
+    """Log-bucketed latency histogram."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: dict[int, int] = field(default_factory=dict)
+
+    def record(self, seconds: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        index = _bucket(seconds)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate the ``q`` quantile (0-1) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            in_bucket = self.buckets[index]
+            if seen + in_bucket >= rank:
+                low = _BASE_SECONDS * _GROWTH**index if index else 0.0
+                high = _BASE_SECONDS * _GROWTH ** (index + 1)
+                # Interpolate within the bucket, never beyond the observed max
+                value = low + (high - low) * (rank - seen) / in_bucket
+                return min(value, self.max_seconds)
+            seen += in_bucket
+        return self.max_seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's observations to this one."""
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def summary(self) -> dict[str, Any]:
+        """Count, mean, p50/p95/p99 and max in milliseconds."""
+        mean = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class TimingRegistry:
+    """Thread-safe collection of named latency histograms."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one duration for ``name``."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Per-span summaries, sorted by span name."""
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def histogram(self, name: str) -> LatencyHistogram | None:
+        """Get the histogram for one span, if recorded."""
+        return self._histograms.get(name)
+
+    def reset(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+    def save(self, path: Path) -> None:
+        """
+        Merge this registry into a JSON file and clear it.
+
+        Clearing keeps repeated saves from counting observations twice.
+        """
+        merged = TimingRegistry.load(path)
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                merged._histograms.setdefault(name, LatencyHistogram()).merge(histogram)
+            self._histograms.clear()
+        data = {
+            name: {
+                "count": h.count,
+                "total_seconds": h.total_seconds,
+                "max_seconds": h.max_seconds,
+                "buckets": {str(index): count for index, count in h.buckets.items()},
+            }
+            for name, h in merged._histograms.items()
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TimingRegistry":
+        """Read a registry saved with ``save`` (empty if the file is missing)."""
+        registry = cls()
+        if not path.exists():
+            return registry
+        for name, entry in json.loads(path.read_text(encoding="utf-8")).items():
+            registry._histograms[name] = LatencyHistogram(
+                count=entry["count"],
+                total_seconds=entry["total_seconds"],
+                max_seconds=entry["max_seconds"],
+                buckets={int(index): count for index, count in entry["buckets"].items()},
+            )
+        return registry
+
+
+# Process-wide registry used by spans
+TIMINGS = TimingRegistry()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block and record it under ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        TIMINGS.record(name, elapsed)
+        spans = _turn_spans.get()
+        if spans is not None:
+            spans[name] = spans.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def collect_spans() -> Iterator[dict[str, float]]:
+    """
+    Gather the durations (seconds) of spans finished inside this block.
+
+    Spans of the same name are summed. Work handed to other tasks that
+    were started earlier (e.g. the write-behind worker) is not included.
+    """
+    spans: dict[str, float] = {}
+    token = _turn_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _turn_spans.reset(token)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function or coroutine function to run inside ``span(name)``."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def span_fields(spans: dict[str, float]) -> dict[str, float]:
+    """Turn collected spans into ``<name>_ms`` log fields (dots become underscores)."""
+    return {
+        f"{name.replace('.', '_')}_ms": round(seconds * 1000, 3) for name, seconds in spans.items()
+    }
+
+
+def _bucket(seconds: float) -> int:
+    """Histogram bucket index for a duration."""
+    if seconds <= _BASE_SECONDS:
+        return 0
+    return min(_BUCKETS - 1, int(math.log(seconds / _BASE_SECONDS, _GROWTH)))
@@ -21,6 +21,9 @@ from itserr_agent.epistemic.indicators import (
 
 logger = structlog.get_logger()
 
+_TAG_PATTERN = re.compile(r"\[(FACTUAL|INTERPRETIVE|DEFERRED)\]")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
 
 class EpistemicClassifier:
     """
@@ -67,7 +70,7 @@ class EpistemicClassifier:
             Content with epistemic indicator tags inserted
         """
         # If content already has tags, preserve them
-        if re.search(r"\[(FACTUAL|INTERPRETIVE|DEFERRED)\]", content):
+        if _TAG_PATTERN.search(content):
             logger.debug("content_already_tagged")
             return content
 
@@ -80,11 +83,19 @@ class EpistemicClassifier:
                 classified.append(sentence)
                 continue
 
-            indicator = self.classify_sentence(sentence)
-            classified.append(f"{indicator.tag} {sentence.strip()}")
+            classified.append(self.tag_sentence(sentence))
 
         return " ".join(classified)
 
+    def tag_sentence(self, sentence: str) -> str:
+        """Classify a single sentence and prefix it with its indicator tag."""
+        indicator = self.classify_sentence(sentence)
+        return f"{indicator.tag} {sentence.strip()}"
+
+    def incremental_tagger(self) -> "IncrementalTagger":
+        """Create a tagger that classifies streamed text sentence by sentence."""
+        return IncrementalTagger(self)
+
     def classify_sentence(self, sentence: str) -> EpistemicIndicator:
         """
         Classify a single sentence.
@@ -188,7 +199,7 @@ class EpistemicClassifier:
 
         TODO: Replace regex splitter with NLTK or spaCy sentence segmentation for production use.
         """
-        sentences = re.split(r"(?<=[.!?])\s+", text)
+        sentences = _SENTENCE_BOUNDARY.split(text)
         return sentences
 
     def classify_gnorm_annotation(
@@ -239,3 +250,95 @@ class EpistemicClassifier:
             explanation += "  ⚠️  Flagged for human review\n"
 
         return explanation
+
+
+class IncrementalTagger:
+    """
+    Applies epistemic tags to streamed text as each sentence completes.
+
+    Tokens are buffered until a sentence boundary (terminal punctuation
+    followed by whitespace and further text) is seen; the completed sentence
+    is then tagged with ``tag_sentence``, as ``classify_and_tag`` tags it.
+    Once the LLM is observed adding its own indicators, the remaining text
+    is passed through unchanged.
+
+    The result equals ``classify_and_tag`` when the LLM adds no tags or
+    starts with one. If its first tag comes mid-text, the sentences already
+    emitted keep their heuristic tags, whereas the batch path would return
+    the whole text unchanged: a streamed sentence cannot be taken back.
+
+    Example:
+        ```python
+        tagger = classifier.incremental_tagger()
+        for token in tokens:
+            for sentence in tagger.feed(token):
+                print(sentence)
+        for sentence in tagger.flush():
+            print(sentence)
+        final_text = tagger.text
+        ```
+    """
+
+    def __init__(self, classifier: EpistemicClassifier) -> None:
+        """Initialize the tagger with the classifier used for each sentence."""
+        self._classifier = classifier
+        self._buffer = ""
+        self._parts: list[str] = []
+        self._separator = ""
+        self._passthrough = False
+
+    def feed(self, token: str) -> list[str]:
+        """
+        Add streamed text and return any sentences completed by it.
+
+        Args:
+            token: The next chunk of raw LLM output
+
+        Returns:
+            Tagged sentences completed by this chunk, in order
+        """
+        self._buffer += token
+        completed: list[str] = []
+
+        while True:
+            match = _SENTENCE_BOUNDARY.search(self._buffer)
+            # The whitespace run is only known to be finished once more text follows it
+            if match is None or match.end() == len(self._buffer):
+                break
+            sentence = self._buffer[: match.start()]
+            separator = match.group()
+            self._buffer = self._buffer[match.end():]
+            completed.append(self._emit(sentence))
+            self._separator = separator
+
+        return completed
+
+    def flush(self) -> list[str]:
+        """Tag whatever remains buffered once the stream has ended."""
+        remainder, self._buffer = self._buffer, ""
+        if not remainder.strip():
+            return []
+        return [self._emit(remainder)]
+
+    @property
+    def text(self) -> str:
+        """The tagged text emitted so far."""
+        return "".join(self._parts)
+
+    @property
+    def pending(self) -> str:
+        """Raw text buffered for the sentence currently being streamed."""
+        return self._buffer
+
+    def _emit(self, sentence: str) -> str:
+        """Tag (or pass through) a completed sentence and record it."""
+        if not self._passthrough and _TAG_PATTERN.search(sentence):
+            self._passthrough = True
+
+        if self._passthrough:
+            self._parts.append(self._separator + sentence)
+            return sentence
+
+        tagged = self._classifier.tag_sentence(sentence)
+        self._parts.append((" " if self._parts else "") + tagged)
+        return tagged
@@ -308,3 +308,7 @@ class GNORMTool(BaseTool):
             )
 
         return "\n".join(lines)
+
+    async def close(self) -> None:
+        """Close the GNORM client."""
+        await self._gnorm_client.close()
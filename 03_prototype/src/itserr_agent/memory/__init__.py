@@ -6,21 +6,39 @@ This module implements the three-stream memory architecture:
 - Research Stream: Sources consulted and notes created
 - Decision Stream: Choices made and alternatives considered
 
-Uses ChromaDB for vector storage and semantic retrieval.
+Uses ChromaDB (or the in-process NumPy store) for vector storage and
+semantic retrieval.
 """
 
-from itserr_agent.memory.narrative import NarrativeMemorySystem
+from typing import TYPE_CHECKING, Any
+
+from itserr_agent.memory.backend import MemoryBackend
 from itserr_agent.memory.streams import (
     ConversationStream,
     DecisionStream,
     MemoryItem,
     ResearchStream,
+    RetrievedMemory,
 )
 
+if TYPE_CHECKING:
+    from itserr_agent.memory.narrative import NarrativeMemorySystem
+
 __all__ = [
+    "MemoryBackend",
     "NarrativeMemorySystem",
     "ConversationStream",
     "ResearchStream",
     "DecisionStream",
     "MemoryItem",
+    "RetrievedMemory",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the memory system (NumPy, SQLite, embeddings) on first access."""
+    if name == "NarrativeMemorySystem":
+        from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+        return NarrativeMemorySystem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,213 @@
+"""
+Memory backends - Pluggable vector storage for the Narrative Memory System.
+
+NarrativeMemorySystem talks to its vector store through the small
+``MemoryBackend`` protocol below. The protocol deliberately mirrors the
+subset of the ChromaDB collection API the memory system uses (including
+Chroma's ``where`` filter syntax and result shapes), so ChromaDB remains a
+thin pass-through implementation and other stores only need to speak the
+same dialect.
+
+Every backend reports query distances on the same scale, cosine distance
+(``1 - cos``, in [0, 2]), so re-ranking and relevance scores do not depend
+on which backend is configured.
+
+Available backends (``ITSERR_MEMORY_BACKEND``):
+- chroma: ChromaDB PersistentClient (default)
+- numpy: In-process memory-mapped matrix with exact top-k search
+  (see ``memory/vector_store.py``)
+"""
+
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+import numpy as np
+
+from itserr_agent.core.config import AgentConfig, MemoryBackendType
+
+Where = dict[str, Any]
+
+# Distance scale of MemoryBackend.query results (Chroma's name for it)
+DISTANCE_SPACE = "cosine"
+
+
+@runtime_checkable
+class MemoryBackend(Protocol):
+    """
+    Vector store used by the Narrative Memory System.
+
+    Results follow ChromaDB's shapes: ``query`` returns one list per query
+    embedding under each included key, ``get`` returns flat lists. Query
+    distances are in ``DISTANCE_SPACE`` (``1 - cos``). Filters
+    use Chroma's ``where`` syntax (``{"key": value}``, ``$eq``, ``$ne``,
+    ``$in``, ``$nin``, ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$and``, ``$or``).
+    """
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """Store documents with their embeddings and metadata."""
+        ...
+
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        where: Where | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Find the nearest stored documents for each query embedding, nearest first."""
+        ...
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: Where | None = None,
+        limit: int | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch documents by id and/or metadata filter."""
+        ...
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        ...
+
+    def delete(self, ids: list[str] | None = None, where: Where | None = None) -> None:
+        """Remove documents by id and/or metadata filter."""
+        ...
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        ...
+
+
+class ChromaBackend:
+    """MemoryBackend backed by a ChromaDB persistent collection."""
+
+    def __init__(self, path: Path, collection_name: str) -> None:
+        """
+        Open (or create) the ChromaDB collection.
+
+        Args:
+            path: Directory for ChromaDB's persistent storage
+            collection_name: Name of the collection to use
+        """
+        import chromadb
+        from chromadb.config import Settings
+
+        # Initialize ChromaDB with persistence using PersistentClient (ChromaDB 0.4+)
+        self._client = chromadb.PersistentClient(
+            path=str(path),
+            settings=Settings(
+                anonymized_telemetry=False,
+            ),
+        )
+        self.collection = self._client.get_or_create_collection(
+            name=collection_name,
+            metadata={
+                "description": "ITSERR Agent narrative memory",
+                "hnsw:space": DISTANCE_SPACE,
+            },
+        )
+        # The space is fixed when a collection is created; collections made
+        # before it was requested use Chroma's default, squared L2
+        metadata = self.collection.metadata or {}
+        self._cosine_space = metadata.get("hnsw:space", "l2") == DISTANCE_SPACE
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """Store documents with their embeddings and metadata."""
+        self.collection.add(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+        )
+
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        where: Where | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Find the nearest stored documents for each query embedding."""
+        include = include or ["documents", "metadatas", "distances"]
+        rescore = not self._cosine_space and "distances" in include
+        results: dict[str, Any] = self.collection.query(  # type: ignore[assignment]
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            include=[*include, "embeddings"] if rescore else include,
+        )
+        if rescore:
+            results["distances"] = [
+                _cosine_distances(query, rows)
+                for query, rows in zip(query_embeddings, results["embeddings"])
+            ]
+            if "embeddings" not in include:
+                del results["embeddings"]
+        return results
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: Where | None = None,
+        limit: int | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch documents by id and/or metadata filter."""
+        return self.collection.get(  # type: ignore[no-any-return]
+            ids=ids,
+            where=where,
+            limit=limit,
+            include=include or ["documents", "metadatas"],
+        )
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return int(self.collection.count())
+
+    def delete(self, ids: list[str] | None = None, where: Where | None = None) -> None:
+        """Remove documents by id and/or metadata filter."""
+        self.collection.delete(ids=ids, where=where)
+
+    def close(self) -> None:
+        """ChromaDB persists on write; nothing to release."""
+
+
+def _cosine_distances(query: list[float], rows: Any) -> list[float]:
+    """Cosine distances (``1 - cos``) from ``query`` to each row."""
+    vectors = np.asarray(rows, dtype=np.float64).reshape(len(rows), -1)
+    if not len(vectors):
+        return []
+    q = np.asarray(query, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(q) or 1.0)
+    return (1.0 - vectors @ q / np.where(norms == 0, 1.0, norms)).tolist()
+
+
+def create_backend(config: AgentConfig) -> MemoryBackend:
+    """
+    Create the configured memory backend.
+
+    Args:
+        config: Agent configuration (backend type, persistence path)
+
+    Returns:
+        An open MemoryBackend
+    """
+    if config.memory_backend == MemoryBackendType.NUMPY:
+        from itserr_agent.memory.vector_store import NumpyVectorStore
+
+        return NumpyVectorStore(
+            config.memory_persist_path / "vectors",
+            dtype=config.memory_vector_dtype,
+        )
+    return ChromaBackend(config.memory_persist_path, config.memory_collection_name)
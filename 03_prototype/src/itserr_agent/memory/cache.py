@@ -0,0 +1,258 @@
+"""
+Embedding cache - Persistent, content-addressed storage of embeddings.
+
+The same text is embedded again and again: repeated questions, re-ingested
+research notes, and the fixed probe strings used by reflection and session
+summaries. The cache keys each vector by (embedding provider, embedding
+model, sha256 of the text), so a vector is only ever reused for the exact
+model that produced it.
+
+Two tiers:
+- An in-memory LRU front for the hottest texts (no I/O)
+- A SQLite file under ``memory_persist_path`` shared across restarts,
+  bounded in size with least-recently-used eviction
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+CACHE_FILENAME = "embedding_cache.sqlite3"
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+_SQL_CHUNK = 500
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for the embedding cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + SQLite) embedding cache.
+
+    All methods are thread-safe: lookups on the event loop use ``peek``
+    (memory only), while the embedding worker threads use ``get_many`` and
+    ``put_many``, which also touch the disk tier.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        provider: str,
+        model: str,
+        max_entries: int = 100_000,
+        memory_entries: int = 2048,
+    ) -> None:
+        """
+        Initialize the cache, creating the SQLite file if needed.
+
+        Args:
+            path: Directory in which to place the cache file
+            provider: Embedding provider name (part of every key)
+            model: Embedding model identifier (part of every key)
+            max_entries: Maximum vectors kept on disk for this provider/model
+            memory_entries: Maximum vectors kept in the in-memory LRU
+        """
+        self._provider = provider
+        self._model = model
+        self._max_entries = max_entries
+        self._memory_entries = memory_entries
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = EmbeddingCacheStats()
+
+        path.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path / CACHE_FILENAME, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (provider, model, text_hash)
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_lru "
+            "ON embeddings (provider, model, last_used)"
+        )
+        self._db.commit()
+        self._stats.entries = self._db.execute(
+            "SELECT COUNT(*) FROM embeddings WHERE provider = ? AND model = ?",
+            (provider, model),
+        ).fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Content address for a text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def peek(self, text: str) -> list[float] | None:
+        """Look a text up in the in-memory tier only (no I/O)."""
+        key = self.text_hash(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats.memory_hits += 1
+            return vector
+
+    def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """
+        Look texts up in both tiers.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Mapping of text to vector for every text found
+        """
+        found: dict[str, list[float]] = {}
+        on_disk: dict[str, str] = {}
+
+        with self._lock:
+            for text in texts:
+                key = self.text_hash(text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    found[text] = vector
+                else:
+                    on_disk[key] = text
+
+            if on_disk:
+                keys = list(on_disk)
+                rows = []
+                for start in range(0, len(keys), _SQL_CHUNK):
+                    chunk = keys[start : start + _SQL_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(
+                        self._db.execute(
+                            f"SELECT text_hash, vector FROM embeddings "
+                            f"WHERE provider = ? AND model = ? AND text_hash IN ({placeholders})",
+                            (self._provider, self._model, *chunk),
+                        ).fetchall()
+                    )
+                now = time.time()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                    found[on_disk[key]] = vector
+                    self._remember(key, vector)
+                self._stats.disk_hits += len(rows)
+                self._stats.misses += len(keys) - len(rows)
+                if rows:
+                    self._db.executemany(
+                        "UPDATE embeddings SET last_used = ? "
+                        "WHERE provider = ? AND model = ? AND text_hash = ?",
+                        [(now, self._provider, self._model, key) for key, _ in rows],
+                    )
+                    self._db.commit()
+
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        """
+        Store freshly computed vectors in both tiers.
+
+        Args:
+            items: Mapping of text to its embedding vector
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in items.items():
+                key = self.text_hash(text)
+                self._remember(key, vector)
+                rows.append(
+                    (
+                        self._provider,
+                        self._model,
+                        key,
+                        np.asarray(vector, dtype=np.float32).tobytes(),
+                        now,
+                    )
+                )
+
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO embeddings "
+                "(provider, model, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._stats.entries += self._db.total_changes - before
+            if self._stats.entries > self._max_entries:
+                self._evict()
+            self._db.commit()
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used disk entries (caller holds the lock)."""
+        # Evict down to 90% of capacity so eviction is amortized across writes
+        excess = self._stats.entries - int(self._max_entries * 0.9)
+        self._db.execute(
+            """
+            DELETE FROM embeddings WHERE rowid IN (
+                SELECT rowid FROM embeddings
+                WHERE provider = ? AND model = ?
+                ORDER BY last_used, rowid LIMIT ?
+            )
+            """,
+            (self._provider, self._model, excess),
+        )
+        self._stats.entries -= excess
+        self._stats.evictions += excess
+        logger.debug("embedding_cache_evicted", evicted=excess, entries=self._stats.entries)
+
+    @property
+    def stats(self) -> EmbeddingCacheStats:
+        """Get a snapshot of cache statistics."""
+        with self._lock:
+            return EmbeddingCacheStats(**asdict(self._stats))
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
+        logger.debug("embedding_cache_closed", **self.stats.to_dict())
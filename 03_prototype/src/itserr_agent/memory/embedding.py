@@ -0,0 +1,241 @@
+"""
+Embedding service - Non-blocking, micro-batched text embedding.
+
+Encoding text with a SentenceTransformer (or calling the OpenAI embeddings
+API) is blocking work. Running it directly inside ``async def`` methods
+stalls the event loop and serializes every concurrent session. The
+EmbeddingService moves encoding onto a thread pool and coalesces requests
+that arrive within a short window into a single batched call, which is
+considerably cheaper per text than one call per text.
+
+Threads rather than processes are used deliberately: the model is loaded
+once and shared, and both PyTorch inference and HTTP requests release the
+GIL while they work.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+
+from itserr_agent.core.config import AgentConfig, EmbeddingProvider
+from itserr_agent.memory.cache import EmbeddingCache
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters describing embedding batching efficiency."""
+
+    requests: int = 0
+    batches: int = 0
+    texts_encoded: int = 0
+    largest_batch: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of distinct texts encoded per batch."""
+        return self.texts_encoded / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return {**asdict(self), "mean_batch_size": self.mean_batch_size}
+
+
+class EmbeddingService:
+    """
+    Runs embedding in a worker pool, coalescing concurrent requests.
+
+    The first request in an idle period opens a batching window of
+    ``embedding_batch_window_ms``; every request arriving before it closes
+    (or until ``embedding_max_batch_size`` is reached) is encoded in the
+    same call. Identical texts within a batch are encoded once, and texts
+    already in the optional EmbeddingCache are not encoded at all.
+
+    Works with both providers:
+    - LOCAL: ``SentenceTransformer.encode(texts)``
+    - OPENAI: ``OpenAIEmbeddings.embed_documents(texts)``
+
+    The model can be supplied ready-made or as a ``loader`` that is called on
+    first use (or by ``warm_up``), so constructing the service is cheap.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        config: AgentConfig,
+        cache: EmbeddingCache | None = None,
+        loader: Callable[[], Any] | None = None,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            embeddings: The underlying embedding model or client (None to use ``loader``)
+            config: Agent configuration (provider, window, batch size, workers)
+            cache: Optional persistent cache consulted before encoding
+            loader: Creates the model on first use when ``embeddings`` is None
+        """
+        if embeddings is None and loader is None:
+            raise ValueError("Either embeddings or a loader is required")
+        self._embeddings = embeddings
+        self._loader = loader
+        self._load_lock = threading.Lock()
+        self._cache = cache
+        self._provider = config.embedding_provider
+        self._window = config.embedding_batch_window_ms / 1000
+        self._max_batch_size = config.embedding_max_batch_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.embedding_workers,
+            thread_name_prefix="itserr-embed",
+        )
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+        self._stats = EmbeddingStats()
+        self._stats_lock = threading.Lock()
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed a single text, batched with any concurrent requests.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            The embedding vector
+        """
+        self._stats.requests += 1
+        if self._cache is not None:
+            cached = self._cache.peek(text)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush, loop)
+
+        return await future
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several texts in a single call off the event loop.
+
+        Unlike ``embed``, this does not wait for a batching window: the
+        caller already has a batch.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per input text, in order
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        self._stats.requests += len(texts)
+        return await loop.run_in_executor(self._executor, self._resolve_batch, texts)
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Close the current window and dispatch its texts as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = loop.create_task(self._run_batch(batch))
+            # Hold a reference until done so the task is not garbage collected
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future[list[float]]]]) -> None:
+        """Encode a batch in the pool and resolve each waiting request."""
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        loop = asyncio.get_running_loop()
+
+        try:
+            vectors = await loop.run_in_executor(
+                self._executor, self._resolve_batch, unique_texts
+            )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+    def _resolve_batch(self, texts: list[str]) -> list[list[float]]:
+        """Serve texts from the cache, encoding only the misses (runs in the pool)."""
+        if self._cache is None:
+            vectors = self._encode_batch(texts)
+            self._record_batch(len(texts))
+            return vectors
+
+        found = self._cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            fresh = dict(zip(missing, self._encode_batch(missing)))
+            self._cache.put_many(fresh)
+            self._record_batch(len(missing))
+            found.update(fresh)
+        return [found[text] for text in texts]
+
+    def load(self) -> Any:
+        """Get the embedding model, loading it first if needed (blocking)."""
+        if self._embeddings is None:
+            with self._load_lock:
+                if self._embeddings is None:
+                    assert self._loader is not None
+                    self._embeddings = self._loader()
+                    logger.info("embedding_model_loaded", provider=self._provider.value)
+        return self._embeddings
+
+    def warm_up(self) -> Future[Any]:
+        """Start loading the embedding model in the worker pool."""
+        return self._executor.submit(self.load)
+
+    def _encode_batch(self, texts: list[str]) -> list[list[float]]:
+        """Encode texts with the configured provider (runs in the pool)."""
+        model = self.load()
+        if self._provider == EmbeddingProvider.OPENAI:
+            return [list(v) for v in model.embed_documents(texts)]
+        return model.encode(texts).tolist()
+
+    def _record_batch(self, size: int) -> None:
+        """Update batching statistics."""
+        with self._stats_lock:
+            self._stats.batches += 1
+            self._stats.texts_encoded += size
+            self._stats.largest_batch = max(self._stats.largest_batch, size)
+
+    @property
+    def stats(self) -> EmbeddingStats:
+        """Get a snapshot of batching statistics."""
+        return EmbeddingStats(**asdict(self._stats))
+
+    @property
+    def cache(self) -> EmbeddingCache | None:
+        """The embedding cache, if one is configured."""
+        return self._cache
+
+    def close(self) -> None:
+        """Shut down the worker pool and close the cache."""
+        self._executor.shutdown(wait=True)
+        if self._cache is not None:
+            self._cache.close()
+        logger.debug("embedding_service_closed", **self._stats.to_dict())
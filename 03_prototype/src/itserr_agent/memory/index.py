@@ -0,0 +1,506 @@
+"""
+Memory index - Time-ordered sidecar index for the vector store.
+
+The vector store answers "what is similar to this?", but reflection and
+session summaries need "what happened most recently?". Asking the vector
+store that question means embedding a fake query and sorting whatever
+similar items come back. The MemoryIndex records every stored item's id,
+session, stream and creation time in a small SQLite table under
+``memory_persist_path``. A B-tree index on (session_id, stream_type,
+timestamp_epoch) serves the last N items of a stream in O(log n + N),
+independent of collection size.
+
+A second table keeps per-session, per-stream counters together with the
+first and last creation times. It is updated in the same transaction as each
+recorded item, so session statistics are exact and cost a single lookup no
+matter how many items a session holds.
+
+A third table holds the reflection tree: conversation exchanges are level-0
+nodes, each reflection is a node one level above the items it summarizes
+(its ``child_ids`` metadata), and a node's parent is the reflection that
+summarized it. Retrieval descends the tree from its roots (see
+``NarrativeMemorySystem.retrieve_items``).
+
+The index is derived data: it can always be rebuilt from the collection's
+metadata.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from itserr_agent.memory.ranking import metadata_epoch
+
+logger = structlog.get_logger()
+
+INDEX_FILENAME = "memory_index.sqlite3"
+
+# Tree node: (doc_id, session_id, level, child ids)
+TreeNode = tuple[str, str, int, list[str]]
+
+
+def tree_node(doc_id: str, meta: dict[str, Any]) -> TreeNode | None:
+    """The reflection tree node for a stored item, or None if it is not part of the tree."""
+    stream_type = meta.get("stream_type")
+    session_id = meta.get("session_id", "default")
+    if stream_type == "conversation":
+        return (doc_id, session_id, 0, [])
+    if stream_type == "reflection":
+        children = meta.get("child_ids") or ""
+        level = int(meta.get("reflection_level", 1))
+        return (doc_id, session_id, level, children.split(",") if children else [])
+    return None
+
+
+@dataclass
+class StreamStats:
+    """Counters for one stream of one session."""
+
+    count: int
+    first_epoch: float
+    last_epoch: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class MemoryIndex:
+    """SQLite-backed index of memory items ordered by creation time."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            path: Directory in which to place the index file
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path / INDEX_FILENAME, check_same_thread=False)
+        # WAL with relaxed syncing keeps the per-item commit cheap
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                doc_id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                stream_type TEXT NOT NULL,
+                timestamp_epoch REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS items_by_session "
+            "ON items (session_id, stream_type, timestamp_epoch)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS items_by_stream ON items (stream_type, timestamp_epoch)"
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_stats (
+                session_id TEXT NOT NULL,
+                stream_type TEXT NOT NULL,
+                item_count INTEGER NOT NULL,
+                first_epoch REAL NOT NULL,
+                last_epoch REAL NOT NULL,
+                PRIMARY KEY (session_id, stream_type)
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tree (
+                doc_id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                parent_id TEXT
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tree_by_parent ON tree (parent_id)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS tree_by_session ON tree (session_id, level, parent_id)"
+        )
+        # Index files written before the reflection tree existed need a rebuild
+        self.tree_missing = (
+            self._db.execute("SELECT 1 FROM tree LIMIT 1").fetchone() is None
+            and self._db.execute(
+                "SELECT 1 FROM items WHERE stream_type IN ('conversation', 'reflection') LIMIT 1"
+            ).fetchone()
+            is not None
+        )
+        # Index files written before session statistics existed
+        has_stats = self._db.execute("SELECT 1 FROM session_stats LIMIT 1").fetchone()
+        if has_stats is None:
+            self._recount()
+        self._db.commit()
+
+    def record(self, doc_id: str, session_id: str, stream_type: str, epoch: float) -> None:
+        """
+        Record a newly stored item.
+
+        Args:
+            doc_id: Vector store document id
+            session_id: Session the item belongs to
+            stream_type: Stream the item belongs to
+            epoch: Creation time in seconds since the epoch
+        """
+        self.record_many([(doc_id, session_id, stream_type, epoch)])
+
+    def record_many(self, items: Iterable[tuple[str, str, str, float]]) -> None:
+        """
+        Record several newly stored items in one transaction.
+
+        Args:
+            items: (doc_id, session_id, stream_type, epoch) per item
+        """
+        with self._lock:
+            for doc_id, session_id, stream_type, epoch in items:
+                inserted = self._db.execute(
+                    "INSERT OR IGNORE INTO items VALUES (?, ?, ?, ?)",
+                    (doc_id, session_id, stream_type, epoch),
+                ).rowcount
+                # Re-recording an existing id must not inflate the counters
+                if inserted:
+                    self._db.execute(
+                        """
+                        INSERT INTO session_stats VALUES (?, ?, 1, ?, ?)
+                        ON CONFLICT (session_id, stream_type) DO UPDATE SET
+                            item_count = item_count + 1,
+                            first_epoch = MIN(first_epoch, excluded.first_epoch),
+                            last_epoch = MAX(last_epoch, excluded.last_epoch)
+                        """,
+                        (session_id, stream_type, epoch, epoch),
+                    )
+            self._db.commit()
+
+    def recent(
+        self,
+        stream_type: str,
+        session_id: str | None = None,
+        limit: int = 10,
+    ) -> list[str]:
+        """
+        Get the ids of the most recent items in a stream.
+
+        Args:
+            stream_type: Stream to read
+            session_id: Optional session filter (None spans all sessions)
+            limit: Maximum number of ids to return
+
+        Returns:
+            Document ids, newest first
+        """
+        with self._lock:
+            if session_id is None:
+                rows = self._db.execute(
+                    "SELECT doc_id FROM items WHERE stream_type = ? "
+                    "ORDER BY timestamp_epoch DESC LIMIT ?",
+                    (stream_type, limit),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT doc_id FROM items WHERE session_id = ? AND stream_type = ? "
+                    "ORDER BY timestamp_epoch DESC LIMIT ?",
+                    (session_id, stream_type, limit),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def oldest(self, stream_type: str, session_id: str, limit: int) -> list[str]:
+        """
+        Get the ids of the oldest items of one session's stream.
+
+        Args:
+            stream_type: Stream to read
+            session_id: Session to read
+            limit: Maximum number of ids to return
+
+        Returns:
+            Document ids, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT doc_id FROM items WHERE session_id = ? AND stream_type = ? "
+                "ORDER BY timestamp_epoch ASC LIMIT ?",
+                (session_id, stream_type, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def eviction_counts(
+        self,
+        stream_type: str,
+        before_epoch: float | None = None,
+        keep_per_session: int | None = None,
+    ) -> dict[str, int]:
+        """
+        Count, per session, the oldest items of a stream that fall outside a limit.
+
+        Args:
+            stream_type: Stream to inspect
+            before_epoch: Items created before this time are out
+            keep_per_session: Items beyond the newest this many of a session are out
+
+        Returns:
+            Mapping of session id to the number of its oldest items to evict
+        """
+        counts: dict[str, int] = {}
+        with self._lock:
+            if keep_per_session is not None:
+                for session_id, over in self._db.execute(
+                    "SELECT session_id, item_count - ? FROM session_stats "
+                    "WHERE stream_type = ? AND item_count > ?",
+                    (keep_per_session, stream_type, keep_per_session),
+                ):
+                    counts[session_id] = over
+            if before_epoch is not None:
+                for session_id, expired in self._db.execute(
+                    "SELECT session_id, COUNT(*) FROM items "
+                    "WHERE stream_type = ? AND timestamp_epoch < ? GROUP BY session_id",
+                    (stream_type, before_epoch),
+                ):
+                    counts[session_id] = max(counts.get(session_id, 0), expired)
+        return counts
+
+    def remove_many(self, doc_ids: Iterable[str]) -> int:
+        """
+        Forget deleted items and update their sessions' statistics.
+
+        Args:
+            doc_ids: Ids of items deleted from the vector store
+
+        Returns:
+            Number of items removed
+        """
+        removed = 0
+        with self._lock:
+            groups: set[tuple[str, str]] = set()
+            for doc_id in doc_ids:
+                row = self._db.execute(
+                    "SELECT session_id, stream_type FROM items WHERE doc_id = ?", (doc_id,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("DELETE FROM items WHERE doc_id = ?", (doc_id,))
+                    groups.add(row)
+                    removed += 1
+                self._db.execute("DELETE FROM tree WHERE doc_id = ?", (doc_id,))
+                # Children of a deleted reflection become roots again
+                self._db.execute(
+                    "UPDATE tree SET parent_id = NULL WHERE parent_id = ?", (doc_id,)
+                )
+            for session_id, stream_type in groups:
+                self._db.execute(
+                    "DELETE FROM session_stats WHERE session_id = ? AND stream_type = ?",
+                    (session_id, stream_type),
+                )
+                self._db.execute(
+                    """
+                    INSERT INTO session_stats
+                    SELECT session_id, stream_type, COUNT(*),
+                           MIN(timestamp_epoch), MAX(timestamp_epoch)
+                    FROM items WHERE session_id = ? AND stream_type = ?
+                    GROUP BY session_id, stream_type
+                    """,
+                    (session_id, stream_type),
+                )
+            self._db.commit()
+        return removed
+
+    def record_tree(self, nodes: Iterable[TreeNode]) -> None:
+        """
+        Add reflection tree nodes and attach their children to them.
+
+        Args:
+            nodes: (doc_id, session_id, level, child ids) per node
+        """
+        with self._lock:
+            self._insert_nodes(nodes)
+            self._db.commit()
+
+    def _insert_nodes(self, nodes: Iterable[TreeNode]) -> None:
+        """
+        Insert tree nodes, then link their children (lock held by caller).
+
+        A node already summarized keeps its first parent.
+        """
+        nodes = list(nodes)
+        self._db.executemany(
+            "INSERT INTO tree VALUES (?, ?, ?, NULL) ON CONFLICT (doc_id) DO UPDATE SET "
+            "session_id = excluded.session_id, level = excluded.level",
+            [(doc_id, session_id, level) for doc_id, session_id, level, _ in nodes],
+        )
+        self._db.executemany(
+            "UPDATE tree SET parent_id = ? WHERE doc_id = ? AND parent_id IS NULL",
+            [(doc_id, child) for doc_id, _, _, children in nodes for child in children],
+        )
+
+    def tree_roots(self, session_id: str | None = None) -> list[str]:
+        """
+        Get the ids of the tree's top nodes.
+
+        Args:
+            session_id: Restrict to one session; its nodes summarized only by a
+                cross-session (researcher) reflection count as its roots
+
+        Returns:
+            Root ids, highest level first
+        """
+        with self._lock:
+            if session_id is None:
+                rows = self._db.execute(
+                    "SELECT doc_id FROM tree WHERE parent_id IS NULL ORDER BY level DESC"
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    """
+                    SELECT t.doc_id FROM tree t LEFT JOIN tree p ON p.doc_id = t.parent_id
+                    WHERE t.session_id = ?
+                      AND (p.doc_id IS NULL OR p.session_id != t.session_id)
+                    ORDER BY t.level DESC
+                    """,
+                    (session_id,),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def tree_children(self, parent_ids: list[str], session_id: str | None = None) -> list[str]:
+        """
+        Get the ids of the nodes directly under ``parent_ids``.
+
+        Args:
+            parent_ids: Nodes to expand
+            session_id: Optional session filter for the children
+        """
+        if not parent_ids:
+            return []
+        marks = ",".join("?" * len(parent_ids))
+        query = f"SELECT doc_id FROM tree WHERE parent_id IN ({marks})"
+        params: list[Any] = list(parent_ids)
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params.append(session_id)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    def unsummarized(
+        self,
+        level: int,
+        session_id: str | None,
+        limit: int,
+        among: list[str] | None = None,
+    ) -> list[str]:
+        """
+        Get the oldest nodes of one level that no reflection summarizes yet.
+
+        Args:
+            level: Tree level
+            session_id: Restrict to one session (None spans all sessions)
+            limit: Maximum number of ids to return
+            among: Only consider these node ids
+
+        Returns:
+            Node ids, oldest first
+        """
+        query = (
+            "SELECT t.doc_id FROM tree t JOIN items i ON i.doc_id = t.doc_id "
+            "WHERE t.level = ? AND t.parent_id IS NULL"
+        )
+        params: list[Any] = [level]
+        if session_id is not None:
+            query += " AND t.session_id = ?"
+            params.append(session_id)
+        if among is not None:
+            query += f" AND t.doc_id IN ({','.join('?' * len(among))})"
+            params.extend(among)
+        query += " ORDER BY i.timestamp_epoch ASC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    def rebuild(self, ids: Iterable[str], metadatas: Iterable[dict[str, Any]]) -> int:
+        """
+        Replace the index contents with entries derived from collection metadata.
+
+        Args:
+            ids: Document ids from the vector store
+            metadatas: Matching metadata dictionaries
+
+        Returns:
+            Number of items indexed
+        """
+        ids, metadatas = list(ids), list(metadatas)
+        rows = [
+            (
+                doc_id,
+                meta.get("session_id", "default"),
+                meta.get("stream_type", "unknown"),
+                metadata_epoch(meta),
+            )
+            for doc_id, meta in zip(ids, metadatas)
+        ]
+        nodes = [
+            node
+            for doc_id, meta in zip(ids, metadatas)
+            if (node := tree_node(doc_id, meta)) is not None
+        ]
+        with self._lock:
+            self._db.execute("DELETE FROM items")
+            self._db.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", rows)
+            self._recount()
+            self._db.execute("DELETE FROM tree")
+            self._insert_nodes(nodes)
+            self._db.commit()
+        self.tree_missing = False
+        logger.info("memory_index_rebuilt", items=len(rows))
+        return len(rows)
+
+    def session_stats(self, session_id: str) -> dict[str, StreamStats]:
+        """
+        Get exact per-stream statistics for a session.
+
+        Args:
+            session_id: Session to describe
+
+        Returns:
+            Mapping of stream type to its statistics (empty for unknown sessions)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT stream_type, item_count, first_epoch, last_epoch "
+                "FROM session_stats WHERE session_id = ?",
+                (session_id,),
+            ).fetchall()
+        return {
+            stream: StreamStats(count=count, first_epoch=first, last_epoch=last)
+            for stream, count, first, last in rows
+        }
+
+    def _recount(self) -> None:
+        """Recompute session statistics from the items table (lock held by caller)."""
+        self._db.execute("DELETE FROM session_stats")
+        self._db.execute(
+            """
+            INSERT INTO session_stats
+            SELECT session_id, stream_type, COUNT(*), MIN(timestamp_epoch), MAX(timestamp_epoch)
+            FROM items GROUP BY session_id, stream_type
+            """
+        )
+
+    @property
+    def count(self) -> int:
+        """Number of indexed items."""
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,105 @@
+"""
+Bulk ingestion - Importing existing research material into memory.
+
+Researchers arrive with an existing bibliography or annotation set. Storing
+those one note at a time costs one model call and one vector store round
+trip per note. The helpers here read JSONL/CSV exports as a stream of
+records and split any iterable into fixed-size chunks, so that
+``NarrativeMemorySystem.store_research_notes_bulk`` and
+``store_decisions_bulk`` can embed and add each chunk in a single call.
+
+Record fields mirror the keyword arguments of the single-item methods:
+
+- research: ``content`` (required), ``source``, ``session_id``
+- decision: ``decision`` (required), ``rationale``, ``alternatives``,
+  ``session_id``. In CSV files, alternatives are separated by ``;``.
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+SUPPORTED_FORMATS = (".jsonl", ".csv")
+
+
+@dataclass
+class BulkImportStats:
+    """Progress and throughput of a bulk import."""
+
+    stream_type: str
+    stored: int = 0
+    failed: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        """Stored items per second of wall-clock time."""
+        return self.stored / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return {**asdict(self), "items_per_second": self.items_per_second}
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Split an iterable into lists of at most ``size`` items.
+
+    The input is consumed lazily, so arbitrarily large sources are never
+    held in memory at once.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def read_records(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Stream records from a JSONL or CSV file.
+
+    Args:
+        path: File to read; the format is chosen by extension
+
+    Yields:
+        One dictionary per non-empty line (JSONL) or row (CSV)
+
+    Raises:
+        ValueError: If the extension is unsupported or a JSONL line is not an object
+    """
+    suffix = path.suffix.lower()
+    if suffix not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported import format '{suffix}'; expected one of {', '.join(SUPPORTED_FORMATS)}"
+        )
+
+    with path.open(encoding="utf-8", newline="") as handle:
+        if suffix == ".csv":
+            for row in csv.DictReader(handle):
+                # Empty cells mean "not provided"
+                yield {key: value for key, value in row.items() if value not in (None, "")}
+            return
+
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+            yield record
+
+
+def parse_alternatives(value: Any) -> list[str] | None:
+    """Normalize a decision's alternatives from a list or ``;``-separated string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(";") if part.strip()] or None
+    return [str(part) for part in value] or None
@@ -0,0 +1,455 @@
+"""
+Stream log - Durable, segmented, append-only log of memory stream items.
+
+The conversation, research and decision streams are in-memory views; the
+vector store holds the same items but can only list them by scanning. Each
+item the memory system stores is therefore also appended to this log, and
+replaying the log at startup rebuilds the streams without touching the
+vector store.
+
+Layout under ``<memory_persist_path>/stream_log/``:
+
+- ``segment-00000001.jsonl`` ...: one compact JSON array per line
+  (``[stream_type, timestamp_us, session_id, content, metadata]``). The
+  active segment is rolled over once it exceeds ``segment_bytes``.
+- ``checkpoint.json``: the sealed segments with their sizes and record
+  counts, rewritten atomically whenever a segment is sealed and on close.
+
+Compaction (``rewrite``) replaces the log with its live records: new
+segments are written as ``.tmp`` files, the checkpoint switches to them
+(``first_segment``), and only then are they renamed into place and the old
+segments deleted. Startup finishes or discards an interrupted rewrite.
+
+Durability: appends are buffered and fsynced in batches, after
+``sync_every`` records or ``sync_interval_seconds``, whichever comes first,
+and always on ``sync``/``close``. The interval is enforced by a timer, so a
+record is durable at most ``sync_interval_seconds`` after its append even if
+nothing else is written. A crash loses at most that window; a torn last
+line is detected at replay and truncated away.
+
+Replay maps each segment into memory and decodes it as one JSON document,
+then returns records in log order. (Decoding is CPU-bound under the GIL, so
+threads would not speed it up.)
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+LOG_DIRNAME = "stream_log"
+CHECKPOINT_FILENAME = "checkpoint.json"
+_SEGMENT_NAME = re.compile(r"^segment-(\d{8})\.jsonl$")
+
+
+class LogRecord(NamedTuple):
+    """One stream item as stored in the log."""
+
+    stream_type: str
+    timestamp_us: int
+    session_id: str
+    content: str
+    metadata: dict[str, Any] | None = None
+
+
+@dataclass
+class StreamLogStats:
+    """Counters describing log writes and the last replay."""
+
+    appended: int = 0
+    syncs: int = 0
+    segments: int = 0
+    replayed: int = 0
+    rewrites: int = 0
+    replay_ms: float = 0.0
+    truncated_bytes: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+def _segment_name(number: int) -> str:
+    """File name of segment ``number``."""
+    return f"segment-{number:08d}.jsonl"
+
+
+def _encode(record: LogRecord) -> bytes:
+    """One log line."""
+    return (
+        json.dumps(list(record), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        + b"\n"
+    )
+
+
+def _decode_lines(data: bytes) -> tuple[list[LogRecord], int]:
+    """Decode newline-terminated lines one at a time, stopping at the first bad one."""
+    records: list[LogRecord] = []
+    start = 0
+    while (end := data.find(b"\n", start)) != -1:
+        try:
+            records.append(LogRecord(*json.loads(data[start:end])))
+        except (ValueError, TypeError):
+            break
+        start = end + 1
+    return records, start
+
+
+def _read_segment(path: Path) -> tuple[list[LogRecord], int]:
+    """
+    Decode a segment.
+
+    Returns:
+        The complete records and the byte length they cover; a trailing
+        partial or corrupt line is excluded
+    """
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return [], 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Everything up to the last newline; a torn write has none after it
+            complete = data.rfind(b"\n") + 1
+            body = data[:complete]
+    # Encoded records never contain a raw newline, so the lines of a healthy
+    # segment decode as one JSON array; fall back to per-line on corruption
+    try:
+        rows = json.loads(b"[" + body.replace(b"\n", b",")[:-1] + b"]") if body else []
+        return list(map(LogRecord._make, rows)), complete
+    except (ValueError, TypeError):
+        return _decode_lines(body)
+
+
+class StreamLog:
+    """Segmented append-only log with batched fsync, checkpoints and replay."""
+
+    def __init__(
+        self,
+        path: Path,
+        segment_bytes: int = 8 * 1024 * 1024,
+        sync_every: int = 64,
+        sync_interval_seconds: float = 1.0,
+    ) -> None:
+        """
+        Open (or create) the log; call ``replay`` before appending.
+
+        Args:
+            path: Directory in which to place the ``stream_log`` directory
+            segment_bytes: Size after which the active segment is sealed
+            sync_every: Appended records per fsync
+            sync_interval_seconds: Longest time an appended record stays unsynced
+        """
+        self._dir = path / LOG_DIRNAME
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval_seconds
+        self._lock = threading.Lock()
+        self._stats = StreamLogStats()
+        # Appends held back while a rewrite runs (see begin_rewrite)
+        self._deferred: list[LogRecord] | None = None
+        self._deferred_lock = threading.Lock()
+
+        self._first_segment = 1
+        self._sealed: dict[str, dict[str, int]] = self._load_checkpoint()
+        self._file: BinaryIO | None = None
+        self._segment_number = 0
+        self._segment_size = 0
+        self._segment_records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._sync_timer: threading.Timer | None = None
+
+    def _segments(self) -> list[Path]:
+        """Segment files in log order."""
+        return sorted(p for p in self._dir.iterdir() if _SEGMENT_NAME.match(p.name))
+
+    def _load_checkpoint(self) -> dict[str, dict[str, int]]:
+        """Sealed segments recorded by the last checkpoint."""
+        checkpoint = self._dir / CHECKPOINT_FILENAME
+        if not checkpoint.exists():
+            return {}
+        try:
+            data = json.loads(checkpoint.read_text())
+            segments: dict[str, dict[str, int]] = data["segments"]
+            self._first_segment = data.get("first_segment", 1)
+            return segments
+        except (ValueError, KeyError) as exc:
+            logger.warning("stream_log_checkpoint_unreadable", error=str(exc))
+            return {}
+
+    def _recover_rewrite(self) -> None:
+        """Finish a rewrite the checkpoint committed to, or discard an uncommitted one."""
+        for tmp in self._dir.glob("segment-*.jsonl.tmp"):
+            final = tmp.with_suffix("")
+            if final.name in self._sealed:
+                tmp.replace(final)
+            else:
+                tmp.unlink()
+        for path in self._segments():
+            if int(path.name[8:16]) < self._first_segment:
+                path.unlink()
+
+    def replay(self) -> list[LogRecord]:
+        """
+        Read every record in log order and open the log for appending.
+
+        A torn tail (from a crash during a write) is truncated so new records
+        start on a clean line.
+
+        Returns:
+            All complete records, oldest first
+        """
+        started = time.perf_counter()
+        self._recover_rewrite()
+        segments = self._segments()
+        decoded = [_read_segment(path) for path in segments]
+
+        records: list[LogRecord] = []
+        for path, (segment_records, valid_bytes) in zip(segments, decoded):
+            records.extend(segment_records)
+            size = path.stat().st_size
+            sealed = self._sealed.get(path.name)
+            if sealed is not None and sealed["bytes"] != size:
+                logger.warning(
+                    "stream_log_segment_changed",
+                    segment=path.name,
+                    expected_bytes=sealed["bytes"],
+                    actual_bytes=size,
+                )
+            if valid_bytes < size:
+                with path.open("r+b") as file:
+                    file.truncate(valid_bytes)
+                self._stats.truncated_bytes += size - valid_bytes
+                logger.warning(
+                    "stream_log_tail_truncated", segment=path.name, bytes=size - valid_bytes
+                )
+
+        self._open_active(segments, len(decoded[-1][0]) if decoded else 0)
+        self._stats.replayed = len(records)
+        self._stats.replay_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "stream_log_replayed",
+            records=len(records),
+            segments=len(segments),
+            replay_ms=round(self._stats.replay_ms, 2),
+        )
+        return records
+
+    def _open_active(self, segments: list[Path], last_records: int) -> None:
+        """Continue the newest unsealed segment, or start a new one."""
+        last = int(segments[-1].name[8:16]) if segments else self._first_segment - 1
+        if segments and segments[-1].name not in self._sealed:
+            self._segment_number = last
+            self._segment_records = last_records
+        else:
+            self._segment_number = last + 1
+            self._segment_records = 0
+        self._file = (self._dir / _segment_name(self._segment_number)).open("ab")
+        self._segment_size = self._file.tell()
+        self._stats.segments = len(self._sealed) + 1
+
+    def append(self, record: LogRecord) -> None:
+        """Append one record (durable after the next sync)."""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[LogRecord]) -> None:
+        """Append records in order (durable after the next sync)."""
+        # Locks are always taken in this order: _deferred_lock, then _lock
+        with self._deferred_lock:
+            if self._deferred is not None:
+                self._deferred.extend(records)
+                return
+            with self._lock:
+                if self._file is None:
+                    raise RuntimeError("StreamLog.replay must be called before appending")
+                self._write(records)
+
+    def _write(self, records: Iterable[LogRecord]) -> None:
+        """Write records to the active segment, rolling and syncing as due (lock held)."""
+        assert self._file is not None
+        for record in records:
+            line = _encode(record)
+            self._file.write(line)
+            self._segment_size += len(line)
+            self._segment_records += 1
+            self._unsynced += 1
+            self._stats.appended += 1
+            if self._segment_size >= self._segment_bytes:
+                self._roll()
+        if self._unsynced >= self._sync_every or (
+            self._unsynced and time.monotonic() - self._last_sync >= self._sync_interval
+        ):
+            self._sync()
+        elif self._unsynced and self._sync_timer is None:
+            # Sync these records within the interval even if no append follows
+            self._sync_timer = threading.Timer(self._sync_interval, self._timed_sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _timed_sync(self) -> None:
+        """Timer callback: sync whatever is still unsynced."""
+        with self._lock:
+            self._sync_timer = None
+            if self._unsynced:
+                self._sync()
+
+    def sync(self) -> None:
+        """Make every appended record durable (deferred ones once the rewrite ends)."""
+        with self._deferred_lock:
+            if self._deferred is not None:
+                return
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def _sync(self) -> None:
+        """Flush and fsync the active segment (caller holds the lock)."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._stats.syncs += 1
+
+    def _roll(self) -> None:
+        """Seal the active segment, checkpoint and start the next one (caller holds the lock)."""
+        assert self._file is not None
+        self._sync()
+        self._file.close()
+        name = _segment_name(self._segment_number)
+        self._sealed[name] = {"bytes": self._segment_size, "records": self._segment_records}
+        self._write_checkpoint()
+
+        self._segment_number += 1
+        self._file = (self._dir / _segment_name(self._segment_number)).open("ab")
+        self._segment_size = 0
+        self._segment_records = 0
+        self._stats.segments += 1
+
+    def begin_rewrite(self) -> None:
+        """
+        Hold back appends until the next ``rewrite`` completes.
+
+        Call this when taking the snapshot to rewrite, so records appended
+        afterwards are neither lost by the rewrite nor stuck behind its lock;
+        ``rewrite`` writes them after the new segments.
+        """
+        with self._deferred_lock:
+            if self._deferred is None:
+                self._deferred = []
+
+    def rewrite(self, records: Iterable[LogRecord]) -> None:
+        """
+        Replace the log's contents with ``records`` (e.g. after evictions).
+
+        Crash-safe: until the new checkpoint is in place the old segments
+        remain the log; after it, startup completes the switch. Safe to run
+        in a worker thread after ``begin_rewrite``.
+        """
+        try:
+            self._rewrite(records)
+        finally:
+            with self._deferred_lock, self._lock:
+                deferred, self._deferred = self._deferred, None
+                if deferred and self._file is not None:
+                    self._write(deferred)
+                    self._sync()
+        logger.info("stream_log_rewritten", **self._stats.to_dict())
+
+    def _rewrite(self, records: Iterable[LogRecord]) -> None:
+        """Write ``records`` as new segments and switch the log to them."""
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("StreamLog.replay must be called before rewriting")
+            self._sync()
+            self._file.close()
+            old = self._segments()
+
+            first = number = self._segment_number + 1
+            sealed: dict[str, dict[str, int]] = {}
+            written: list[Path] = []
+            file: BinaryIO | None = None
+            for record in records:
+                if file is None:
+                    written.append(self._dir / f"{_segment_name(number)}.tmp")
+                    file = written[-1].open("wb")
+                    sealed[_segment_name(number)] = {"bytes": 0, "records": 0}
+                line = _encode(record)
+                file.write(line)
+                entry = sealed[_segment_name(number)]
+                entry["bytes"] += len(line)
+                entry["records"] += 1
+                if entry["bytes"] >= self._segment_bytes:
+                    file.flush()
+                    os.fsync(file.fileno())
+                    file.close()
+                    file = None
+                    number += 1
+            if file is not None:
+                file.flush()
+                os.fsync(file.fileno())
+                file.close()
+                number += 1
+
+            self._sealed = sealed
+            self._first_segment = first
+            self._write_checkpoint()
+            for tmp in written:
+                tmp.replace(tmp.with_suffix(""))
+            for path in old:
+                path.unlink()
+
+            self._segment_number = number
+            self._file = (self._dir / _segment_name(number)).open("ab")
+            self._segment_size = 0
+            self._segment_records = 0
+            self._unsynced = 0
+            self._stats.segments = len(sealed) + 1
+            self._stats.rewrites += 1
+
+    def _write_checkpoint(self) -> None:
+        """Atomically record the sealed segments."""
+        checkpoint = self._dir / CHECKPOINT_FILENAME
+        tmp = checkpoint.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "segments": self._sealed,
+                    "first_segment": self._first_segment,
+                    "records": sum(s["records"] for s in self._sealed.values()),
+                },
+                file,
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        tmp.replace(checkpoint)
+
+    @property
+    def stats(self) -> StreamLogStats:
+        """Get a snapshot of log statistics."""
+        return StreamLogStats(**asdict(self._stats))
+
+    def close(self) -> None:
+        """Sync, checkpoint and close the active segment."""
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+            self._write_checkpoint()
+        logger.debug("stream_log_closed", **self._stats.to_dict())
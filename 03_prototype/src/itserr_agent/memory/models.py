@@ -0,0 +1,158 @@
+"""
+Embedding model registry - One shared embedding model per process.
+
+Every NarrativeMemorySystem needs an embedding model, and a local
+SentenceTransformer costs ~90 MB and a few seconds to load. Tests, the demo
+and multi-agent hosts (e.g. ``itserr-agent serve``) create many memory
+systems in one process, so models are loaded through ``EMBEDDING_MODELS``,
+which keeps a single instance per ``(provider, model)`` and counts the
+memory systems using it.
+
+Shared instances are used from several embedding worker threads at once;
+both SentenceTransformer inference and the OpenAI embeddings client are
+safe to call concurrently.
+
+A model whose last user releases it stays loaded, so the next agent starts
+without reloading (set ``embedding_keep_loaded=false`` to drop it
+instead); ``unload`` frees idle models explicitly.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from itserr_agent.core.config import AgentConfig, EmbeddingProvider
+
+logger = structlog.get_logger()
+
+ModelKey = tuple[str, str]
+
+
+@dataclass
+class _Entry:
+    """A loaded model and the number of memory systems holding it."""
+
+    model: Any
+    references: int = 0
+
+
+def model_key(config: AgentConfig) -> ModelKey:
+    """Registry key for the embedding model selected by ``config``."""
+    return (config.embedding_provider.value, config.embedding_model)
+
+
+def load_embedding_model(config: AgentConfig) -> Any:
+    """Create the embedding model or client selected by ``config`` (blocking)."""
+    if config.embedding_provider == EmbeddingProvider.OPENAI:
+        from langchain_openai import OpenAIEmbeddings
+
+        return OpenAIEmbeddings(model=config.embedding_model, api_key=config.openai_api_key)
+
+    # Local embeddings using sentence-transformers
+    if config.embedding_torch_threads:
+        import torch
+
+        # Process-wide: caps intra-op threads used by every local model
+        torch.set_num_threads(config.embedding_torch_threads)
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(config.embedding_model)
+
+
+class EmbeddingModelRegistry:
+    """Thread-safe, reference-counted cache of embedding models."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._entries: dict[ModelKey, _Entry] = {}
+        self._lock = threading.Lock()
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+
+    def acquire(self, config: AgentConfig) -> Any:
+        """
+        Get the shared model for ``config``, loading it on first use.
+
+        Each call must be paired with a ``release``. Loading happens outside
+        the registry lock, so different models load in parallel while
+        concurrent requests for the same model wait for a single load.
+
+        Args:
+            config: Configuration selecting the provider and model
+
+        Returns:
+            The shared embedding model or client
+        """
+        key = model_key(config)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.references += 1
+                    return entry.model
+            model = load_embedding_model(config)
+            with self._lock:
+                self._entries[key] = _Entry(model, references=1)
+            logger.info("embedding_model_registered", provider=key[0], model=key[1])
+            return model
+
+    def release(self, config: AgentConfig, unload: bool = False) -> None:
+        """
+        Drop one reference to the model for ``config``.
+
+        Args:
+            config: Configuration the model was acquired with
+            unload: Also unload the model if this was its last reference
+        """
+        key = model_key(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.references = max(0, entry.references - 1)
+            if unload and entry.references == 0:
+                del self._entries[key]
+                logger.info("embedding_model_unloaded", provider=key[0], model=key[1])
+
+    def unload(self, force: bool = False) -> int:
+        """
+        Unload idle models (no memory system holds them).
+
+        Args:
+            force: Also forget models still in use; their holders keep working
+                and the next ``acquire`` loads a fresh instance
+
+        Returns:
+            Number of models unloaded
+        """
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if force or e.references == 0]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            logger.info("embedding_models_unloaded", count=len(keys))
+        return len(keys)
+
+    def references(self, config: AgentConfig) -> int:
+        """Number of memory systems holding the model for ``config``."""
+        with self._lock:
+            entry = self._entries.get(model_key(config))
+            return entry.references if entry else 0
+
+    def __contains__(self, config: AgentConfig) -> bool:
+        """Whether the model for ``config`` is loaded."""
+        with self._lock:
+            return model_key(config) in self._entries
+
+    def __len__(self) -> int:
+        """Number of loaded models."""
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide registry used by NarrativeMemorySystem
+EMBEDDING_MODELS = EmbeddingModelRegistry()
@@ -5,17 +5,104 @@ The narrative memory preserves the researcher's hermeneutical journey through
 three distinct streams, each with different retention and retrieval characteristics.
 """
 
+import asyncio
+import contextlib
+import threading
+import time
 import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
 from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
 import structlog
 
 from itserr_agent.core.config import AgentConfig
-from itserr_agent.memory.streams import ConversationStream, DecisionStream, ResearchStream
+from itserr_agent.core.timing import span, timed
+from itserr_agent.memory.backend import create_backend
+from itserr_agent.memory.cache import EmbeddingCache, EmbeddingCacheStats
+from itserr_agent.memory.embedding import EmbeddingService, EmbeddingStats
+from itserr_agent.memory.index import MemoryIndex, tree_node
+from itserr_agent.memory.ingest import BulkImportStats, chunked, parse_alternatives
+from itserr_agent.memory.log import LogRecord, StreamLog, StreamLogStats
+from itserr_agent.memory.models import EMBEDDING_MODELS
+from itserr_agent.memory.ranking import metadata_epoch, rerank, top_k_indices
+from itserr_agent.memory.retention import (
+    CompactionStats,
+    PeriodicTask,
+    RetentionPolicy,
+    retention_policies,
+)
+from itserr_agent.memory.streams import (
+    CONTEXT_SEPARATOR,
+    BaseStream,
+    ConversationStream,
+    DecisionStream,
+    ResearchStream,
+    RetrievedMemory,
+    StreamType,
+    to_micros,
+)
+from itserr_agent.memory.writer import WriteBehindQueue, WriteBehindStats
 
 logger = structlog.get_logger()
 
+# Session of reflections that roll up reflections from several sessions
+RESEARCHER_SESSION = "__researcher__"
+
+# Streams searched directly; conversation and reflections are reached through the tree
+_FLAT_STREAMS = ["research", "decision"]
+
+# Metadata keys carried by the stream item itself rather than its metadata
+_ITEM_FIELDS = frozenset({"stream_type", "timestamp", "timestamp_epoch", "session_id"})
+
+
+def _format_decision(
+    decision: str,
+    alternatives: list[str] | None = None,
+    rationale: str | None = None,
+) -> str:
+    """Render a decision and its context as a memory document."""
+    doc = f"Decision: {decision}"
+    if rationale:
+        doc += f"\nRationale: {rationale}"
+    if alternatives:
+        doc += f"\nAlternatives considered: {', '.join(alternatives)}"
+    return doc
+
+
+def _format_epoch(epoch: float) -> str:
+    """Format an epoch timestamp as ISO 8601 (UTC)."""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+def _metadata_datetime(metadata: dict[str, Any]) -> datetime:
+    """
+    A stored item's creation time as an aware UTC datetime.
+
+    Items stored before this series may lack ``timestamp_epoch`` or carry a
+    naive ISO ``timestamp``; those are read as UTC, as ``metadata_epoch`` does.
+    """
+    try:
+        timestamp = datetime.fromisoformat(str(metadata["timestamp"]))
+    except (KeyError, ValueError):
+        return datetime.fromtimestamp(metadata_epoch(metadata), tz=timezone.utc)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def _log_record(document: str, metadata: dict[str, Any]) -> LogRecord:
+    """Stream log record for a stored document and its vector store metadata."""
+    extra = {k: v for k, v in metadata.items() if k not in _ITEM_FIELDS}
+    return LogRecord(
+        metadata["stream_type"],
+        to_micros(_metadata_datetime(metadata)),
+        metadata.get("session_id", "default"),
+        document,
+        extra or None,
+    )
+
 
 class NarrativeMemorySystem:
     """
@@ -23,8 +110,14 @@ class NarrativeMemorySystem:
 
     Architecture:
     - Three memory streams (Conversation, Research, Decision)
-    - Vector store (ChromaDB) for semantic retrieval
-    - Reflection layer for periodic summarization
+    - Vector store (ChromaDB or in-process NumPy, see memory/backend.py)
+      for semantic retrieval
+    - Time-ordered sidecar index for "most recent" access paths
+    - Append-only stream log (see memory/log.py) rebuilding the streams at startup
+    - Reflection tree: periodic summaries, rolled up level by level, that
+      retrieval descends instead of searching every exchange
+    - Write-behind queue keeping exchange storage off the response path
+    - Per-stream retention applied by background compaction (see memory/retention.py)
 
     Design Philosophy:
     Preserves the researcher's hermeneutical journey, not just data.
@@ -34,64 +127,233 @@ class NarrativeMemorySystem:
     def __init__(self, config: AgentConfig) -> None:
         """Initialize the narrative memory system."""
         self.config = config
-        self._client: Any = None
         self._collection: Any = None
-        self._embeddings: Any = None
+        self._embedder: EmbeddingService | None = None
+        self._index: MemoryIndex | None = None
+        # Guards the model reference against a close racing a background load
+        self._model_lock = threading.Lock()
+        self._holds_embedding_model = False
+        self._closed = False
 
         # Memory streams
         self._conversation = ConversationStream()
         self._research = ResearchStream()
         self._decision = DecisionStream()
+        self._streams: dict[str, BaseStream] = {
+            stream.stream_type.value: stream
+            for stream in (self._conversation, self._research, self._decision)
+        }
+        self._stream_log: StreamLog | None = None
+
+        # Exchanges stored per session since its last reflection
+        self._exchange_counts: dict[str, int] = {}
 
-        # Track exchanges for reflection triggers
-        self._exchange_count = 0
+        # Reflection and compaction both summarize a session's unsummarized
+        # exchanges; a per-session lock keeps them from folding one in twice
+        self._summary_locks: dict[str, asyncio.Lock] = {}
+        self._summary_users: dict[str, int] = {}
+
+        # Background writer for exchanges (see submit_exchange)
+        self._writer = WriteBehindQueue(maxsize=config.memory_write_queue_size)
+
+        # Retention, applied by a periodic background job started on first store
+        self._retention = retention_policies(config)
+        self._compactor = PeriodicTask(
+            config.memory_compaction_interval_seconds, self.compact, name="memory-compaction"
+        )
+        self._last_compaction: CompactionStats | None = None
 
         self._initialize_storage()
 
     def _initialize_storage(self) -> None:
-        """Initialize ChromaDB storage and embeddings."""
-        import chromadb
-        from chromadb.config import Settings
-
-        # Initialize ChromaDB with persistence using PersistentClient (ChromaDB 0.4+)
-        self._client = chromadb.PersistentClient(
-            path=str(self.config.memory_persist_path),
-            settings=Settings(
-                anonymized_telemetry=False,
-            ),
-        )
+        """Initialize the vector store backend and embeddings."""
+        self._collection = create_backend(self.config)
 
-        # Get or create collection
-        self._collection = self._client.get_or_create_collection(
-            name=self.config.memory_collection_name,
-            metadata={"description": "ITSERR Agent narrative memory"},
+        # Time-ordered index, rebuilt if it is missing for an existing collection
+        self._index = MemoryIndex(self.config.memory_persist_path)
+        if self._index.tree_missing or (
+            self._index.count == 0 and self._collection.count() > 0
+        ):
+            self.rebuild_index()
+
+        if self.config.stream_log_enabled:
+            self._open_stream_log()
+
+        # Embeddings are encoded off the event loop in micro-batches; the
+        # model itself is loaded on first use (or by warm_up)
+        self._embedder = EmbeddingService(
+            None,
+            self.config,
+            cache=self._create_embedding_cache(),
+            loader=self._create_embeddings,
         )
 
-        # Initialize embeddings
-        self._embeddings = self._create_embeddings()
-
         logger.info(
             "memory_initialized",
             persist_path=str(self.config.memory_persist_path),
+            backend=self.config.memory_backend.value,
             collection=self.config.memory_collection_name,
         )
 
-    def _create_embeddings(self) -> Any:
-        """Create the embedding function based on configuration."""
-        from itserr_agent.core.config import EmbeddingProvider
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the time-ordered index from the collection's metadata.
 
-        if self.config.embedding_provider == EmbeddingProvider.OPENAI:
-            from langchain_openai import OpenAIEmbeddings
+        Returns:
+            Number of items indexed
+        """
+        if self._index is None:
+            raise RuntimeError("Memory index not initialized")
+        existing = self._collection.get(include=["metadatas"])
+        return self._index.rebuild(existing["ids"], existing["metadatas"])
+
+    def _open_stream_log(self) -> None:
+        """Replay the stream log into the streams, backfilling it for an existing collection."""
+        log = StreamLog(
+            self.config.memory_persist_path,
+            segment_bytes=self.config.stream_log_segment_bytes,
+            sync_every=self.config.stream_log_sync_every,
+            sync_interval_seconds=self.config.stream_log_sync_interval_ms / 1000,
+        )
+        records = log.replay()
+        self._stream_log = log
+        if records:
+            self._restore_streams(records)
+        elif self._collection.count() > 0:
+            existing = self._collection.get(include=["documents", "metadatas"])
+            stored = sorted(
+                zip(existing["documents"], existing["metadatas"]),
+                key=lambda pair: metadata_epoch(pair[1]),
+            )
+            self._record_streams([doc for doc, _ in stored], [meta for _, meta in stored])
+            log.sync()
+
+    def _restore_streams(self, records: Iterable[LogRecord]) -> None:
+        """Add logged records to their in-memory streams."""
+        streams = self._streams
+        for record in records:
+            stream = streams.get(record.stream_type)
+            if stream is not None:
+                stream.restore(
+                    record.content, record.timestamp_us, record.session_id, record.metadata
+                )
+
+    def _record_streams(self, documents: list[str], metadatas: list[dict[str, Any]]) -> None:
+        """Add stored documents to their streams and append them to the stream log."""
+        records = [
+            _log_record(doc, meta)
+            for doc, meta in zip(documents, metadatas)
+            if meta.get("stream_type") in self._streams
+        ]
+        if not records:
+            return
+        self._restore_streams(records)
+        if self._stream_log is not None:
+            self._stream_log.append_many(records)
 
-            return OpenAIEmbeddings(
-                model=self.config.embedding_model,
-                api_key=self.config.openai_api_key,
+    def _record_stored(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """Record items just added to the vector store in the index and streams."""
+        if self._index is not None:
+            self._index.record_many(
+                (doc_id, meta["session_id"], meta["stream_type"], meta["timestamp_epoch"])
+                for doc_id, meta in zip(ids, metadatas)
+            )
+            self._index.record_tree(
+                node
+                for doc_id, meta in zip(ids, metadatas)
+                if (node := tree_node(doc_id, meta)) is not None
             )
-        else:
-            # Local embeddings using sentence-transformers
-            from sentence_transformers import SentenceTransformer
+        self._record_streams(documents, metadatas)
+        if self.config.memory_compaction_enabled:
+            self._compactor.ensure_started()
+
+    def stream(self, stream_type: StreamType) -> BaseStream:
+        """Get the in-memory stream for ``stream_type``."""
+        return self._streams[stream_type.value]
+
+    @property
+    def stream_log_stats(self) -> StreamLogStats | None:
+        """Stream log statistics, or None when the log is disabled."""
+        return self._stream_log.stats if self._stream_log is not None else None
+
+    def _get_by_ids(self, ids: list[str]) -> list[tuple[str, dict[str, Any]]]:
+        """Fetch documents by id, preserving the order of ``ids``."""
+        return [(doc, meta) for _, doc, meta in self._get_with_ids(ids)]
+
+    def _get_with_ids(self, ids: list[str]) -> list[tuple[str, str, dict[str, Any]]]:
+        """Fetch (id, document, metadata) by id, preserving the order of ``ids``."""
+        if not ids:
+            return []
+        results = self._collection.get(ids=ids, include=["documents", "metadatas"])
+        by_id = {
+            doc_id: (doc_id, doc, meta)
+            for doc_id, doc, meta in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        }
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
 
-            return SentenceTransformer(self.config.embedding_model)
+    def warm_up(self) -> None:
+        """Load the embedding model now instead of on the first query (blocking)."""
+        if self._embedder is not None:
+            self._embedder.load()
+
+    def _create_embeddings(self) -> Any:
+        """Get the process-wide shared embedding model (see memory/models.py)."""
+        model = EMBEDDING_MODELS.acquire(self.config)
+        with self._model_lock:
+            if not self._closed:
+                self._holds_embedding_model = True
+                return model
+        # Closed while the model was loading (e.g. by warm-up): return the reference now
+        EMBEDDING_MODELS.release(self.config, unload=not self.config.embedding_keep_loaded)
+        return model
+
+    def _create_embedding_cache(self) -> EmbeddingCache | None:
+        """Create the persistent embedding cache, if enabled."""
+        if not self.config.embedding_cache_enabled:
+            return None
+        return EmbeddingCache(
+            path=self.config.memory_persist_path,
+            provider=self.config.embedding_provider.value,
+            model=self.config.embedding_model,
+            max_entries=self.config.embedding_cache_max_entries,
+            memory_entries=self.config.embedding_cache_memory_entries,
+        )
+
+    @timed("memory.embed")
+    async def _embed(self, text: str) -> list[float]:
+        """Embed text without blocking the event loop."""
+        if self._embedder is None:
+            raise RuntimeError("Embedding service not initialized")
+        return await self._embedder.embed(text)
+
+    @timed("memory.embed_many")
+    async def _embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed a caller-assembled batch without blocking the event loop."""
+        if self._embedder is None:
+            raise RuntimeError("Embedding service not initialized")
+        return await self._embedder.embed_many(texts)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a query with the memory's embedding model (and cache)."""
+        return await self._embed(query)
+
+    @property
+    def embedding_stats(self) -> EmbeddingStats:
+        """Embedding batching statistics."""
+        return self._embedder.stats if self._embedder else EmbeddingStats()
+
+    @property
+    def embedding_cache_stats(self) -> EmbeddingCacheStats | None:
+        """Embedding cache hit/miss statistics, or None if caching is disabled."""
+        cache = self._embedder.cache if self._embedder else None
+        return cache.stats if cache else None
 
     async def retrieve_context(
         self,
@@ -104,6 +366,7 @@ class NarrativeMemorySystem:
 
         Uses semantic similarity search with recency weighting to find
         the most relevant prior exchanges, research notes, and decisions.
+        See ``retrieve_items`` for the retrieval itself.
 
         Args:
             query: The current user query
@@ -113,50 +376,185 @@ class NarrativeMemorySystem:
         Returns:
             Formatted context string, or None if no relevant context found
         """
+        items = await self.retrieve_items(query, session_id=session_id, top_k=top_k)
+        if not items:
+            return None
+        return CONTEXT_SEPARATOR.join(item.format() for item in items)
+
+    @timed("memory.retrieve")
+    async def retrieve_items(
+        self,
+        query: str,
+        session_id: str | None = None,
+        top_k: int | None = None,
+    ) -> list[RetrievedMemory]:
+        """
+        Retrieve the most relevant memory items, best first.
+
+        The vector store is over-fetched (``memory_overfetch_factor`` x k
+        candidates) and the candidates are re-ranked by a combination of
+        similarity, exponential time decay and per-stream weights. With
+        ``memory_mmr_lambda`` below 1 the k items are then picked by maximal
+        marginal relevance so near-duplicates do not crowd out other context.
+
+        Args:
+            query: The current user query
+            session_id: Optional session filter
+            top_k: Number of items to retrieve (defaults to config value)
+
+        Returns:
+            Retrieved items ordered by combined score (empty if none found)
+        """
         k = top_k or self.config.memory_top_k
 
+        # Read-your-writes: include every exchange already acknowledged
+        # (unfiltered retrieval spans all sessions, so wait for all of them)
+        with span("memory.write_wait"):
+            await self._writer.wait_for(session_id)
+
         # Generate embedding for query
-        if hasattr(self._embeddings, "embed_query"):
-            query_embedding = self._embeddings.embed_query(query)
-        else:
-            query_embedding = self._embeddings.encode(query).tolist()
-
-        # Query ChromaDB
-        where_filter = {"session_id": session_id} if session_id else None
-
-        results = self._collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            where=where_filter,
-            include=["documents", "metadatas", "distances"],
+        query_embedding = await self._embed(query)
+
+        # Conversation and reflections are reached by descending the reflection
+        # tree; the vector store is then only searched for the other streams
+        roots = (
+            self._index.tree_roots(session_id)
+            if self.config.reflection_tree_enabled and self._index is not None
+            else []
         )
+        where_filter: dict[str, Any] | None = {"session_id": session_id} if session_id else None
+        if roots:
+            streams_filter = {"stream_type": {"$in": _FLAT_STREAMS}}
+            where_filter = (
+                {"$and": [where_filter, streams_filter]} if where_filter else streams_filter
+            )
 
-        if not results["documents"] or not results["documents"][0]:
-            return None
+        # Query the vector store for an over-fetched candidate set
+        diversify = self.config.memory_mmr_lambda < 1.0
+        include = ["documents", "metadatas", "distances"]
+        if diversify:
+            include.append("embeddings")
+        with span("memory.vector_query"):
+            results = self._collection.query(
+                query_embeddings=[query_embedding],
+                n_results=k * self.config.memory_overfetch_factor,
+                where=where_filter,
+                include=include,
+            )
 
-        # Format retrieved context
-        context_parts = []
-        for doc, meta, distance in zip(
-            results["documents"][0],
-            results["metadatas"][0],
-            results["distances"][0],
-        ):
-            stream_type = meta.get("stream_type", "unknown")
-            timestamp = meta.get("timestamp", "unknown")
-            relevance = 1 - distance  # Convert distance to relevance
+        documents: list[str] = list(results["documents"][0]) if results["documents"] else []
+        metadatas: list[dict[str, Any]] = (
+            list(results["metadatas"][0]) if results["metadatas"] else []
+        )
+        distances: list[float] = list(results["distances"][0]) if results["distances"] else []
+        # Chroma may hand embeddings back as NumPy arrays, so avoid truthiness
+        result_embeddings = results.get("embeddings") if diversify else None
+        embeddings: list[Any] | None = (
+            list(result_embeddings[0])
+            if result_embeddings is not None and len(result_embeddings)
+            else None
+        )
+
+        # Tree nodes are scored here and flat hits by the backend, both as
+        # cosine distances (DISTANCE_SPACE), so one rerank can compare them
+        if roots:
+            with span("memory.tree_descent"):
+                tree_docs, tree_metas, tree_distances, tree_embeddings = self._descend_tree(
+                    query_embedding, roots, session_id
+                )
+            documents += tree_docs
+            metadatas += tree_metas
+            distances += tree_distances
+            if embeddings is not None:
+                embeddings += tree_embeddings
+
+        if not documents:
+            return []
+
+        # Re-rank by similarity, recency and stream weights, then diversify
+        with span("memory.rerank"):
+            order, scores = rerank(
+                distances,
+                metadatas,
+                k,
+                embeddings=embeddings,
+                diversity_lambda=self.config.memory_mmr_lambda,
+            )
 
-            context_parts.append(
-                f"[{stream_type.upper()}] (relevance: {relevance:.2f}, from: {timestamp})\n{doc}"
+        items = [
+            RetrievedMemory(
+                document=documents[index],
+                stream_type=metadatas[index].get("stream_type", "unknown"),
+                timestamp=metadatas[index].get("timestamp", "unknown"),
+                relevance=1 - distances[index],  # Convert distance to relevance
+                score=score,
             )
+            for index, score in zip(order.tolist(), scores.tolist())
+        ]
 
         logger.debug(
             "context_retrieved",
-            num_items=len(context_parts),
+            num_items=len(items),
+            num_candidates=len(documents),
             query_length=len(query),
         )
 
-        return "\n\n---\n\n".join(context_parts)
+        return items
+
+    def _descend_tree(
+        self,
+        query_embedding: list[float],
+        roots: list[str],
+        session_id: str | None,
+    ) -> tuple[list[str], list[dict[str, Any]], list[float], list[Any]]:
+        """
+        Collect candidates by descending the reflection tree from ``roots``.
 
+        Each level's nodes are scored by cosine similarity to the query; only
+        the ``reflection_tree_beam`` best reflections are expanded into their
+        children. The candidate set is the roots plus beam x fanout nodes per
+        level, so it grows with the tree's depth rather than the history.
+
+        Returns:
+            Documents, metadata, cosine distances and embeddings of every
+            scored node
+        """
+        query = np.asarray(query_embedding, dtype=np.float64)
+        query /= np.linalg.norm(query) or 1.0
+        documents: list[str] = []
+        metadatas: list[dict[str, Any]] = []
+        distances: list[float] = []
+        embeddings: list[Any] = []
+
+        frontier = roots
+        while frontier:
+            nodes = self._collection.get(
+                ids=frontier, include=["documents", "metadatas", "embeddings"]
+            )
+            if not len(nodes["ids"]):
+                break
+            vectors = np.asarray(nodes["embeddings"], dtype=np.float64)
+            norms = np.linalg.norm(vectors, axis=1)
+            similarities = vectors @ query / np.where(norms == 0, 1.0, norms)
+
+            documents.extend(nodes["documents"])
+            metadatas.extend(nodes["metadatas"])
+            distances.extend((1.0 - similarities).tolist())
+            embeddings.extend(vectors)
+
+            reflections = np.flatnonzero(
+                [meta.get("stream_type") == "reflection" for meta in nodes["metadatas"]]
+            )
+            if not len(reflections) or self._index is None:
+                break
+            beam = top_k_indices(similarities[reflections], self.config.reflection_tree_beam)
+            frontier = self._index.tree_children(
+                [nodes["ids"][index] for index in reflections[beam].tolist()], session_id
+            )
+
+        return documents, metadatas, distances, embeddings
+
+    @timed("memory.store_exchange")
     async def store_exchange(
         self,
         user_input: str,
@@ -174,34 +572,32 @@ class NarrativeMemorySystem:
             agent_response: The agent's response
             session_id: Optional session identifier
         """
-        timestamp = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
 
         # Create document combining both sides of exchange
         doc = f"User: {user_input}\n\nAssistant: {agent_response}"
 
         # Generate embedding
-        if hasattr(self._embeddings, "embed_query"):
-            embedding = self._embeddings.embed_query(doc)
-        else:
-            embedding = self._embeddings.encode(doc).tolist()
+        embedding = await self._embed(doc)
 
-        # Store in ChromaDB using UUID for unique document IDs
+        # Store in the vector store using UUID for unique document IDs
         doc_id = f"conv_{uuid.uuid4().hex}"
 
+        metadata: dict[str, Any] = {
+            "stream_type": "conversation",
+            "timestamp": now.isoformat(),
+            "timestamp_epoch": now.timestamp(),
+            "session_id": session_id or "default",
+            "user_input_length": len(user_input),
+            "response_length": len(agent_response),
+        }
+
         try:
             self._collection.add(
                 ids=[doc_id],
                 embeddings=[embedding],
                 documents=[doc],
-                metadatas=[
-                    {
-                        "stream_type": "conversation",
-                        "timestamp": timestamp,
-                        "session_id": session_id or "default",
-                        "user_input_length": len(user_input),
-                        "response_length": len(agent_response),
-                    }
-                ],
+                metadatas=[metadata],
             )
         except Exception as exc:
             logger.error(
@@ -214,9 +610,12 @@ class NarrativeMemorySystem:
             # Continue without storing - memory is non-critical for agent operation
             return
 
-        # Update exchange count and check for reflection trigger
-        self._exchange_count += 1
-        if self._exchange_count >= self.config.reflection_trigger_count:
+        self._record_stored([doc_id], [doc], [metadata])
+
+        # Update the session's exchange count and check for reflection trigger
+        session_key = metadata["session_id"]
+        self._exchange_counts[session_key] = self._exchange_counts.get(session_key, 0) + 1
+        if self._exchange_counts[session_key] >= self.config.reflection_trigger_count:
             await self._trigger_reflection(session_id)
 
         logger.debug(
@@ -225,6 +624,46 @@ class NarrativeMemorySystem:
             session_id=session_id,
         )
 
+    async def submit_exchange(
+        self,
+        user_input: str,
+        agent_response: str,
+        session_id: str | None = None,
+    ) -> None:
+        """
+        Acknowledge a conversation exchange and store it in the background.
+
+        With ``memory_write_behind`` enabled, this returns as soon as the
+        exchange is queued; embedding, the vector store write and any
+        reflection it triggers run in a background worker. Subsequent
+        ``retrieve_context`` calls for the same session wait for the write,
+        so an acknowledged exchange is always visible to the next turn.
+        When the queue is full, this waits for space (backpressure).
+
+        Args:
+            user_input: The user's query
+            agent_response: The agent's response
+            session_id: Optional session identifier
+        """
+        if not self.config.memory_write_behind:
+            await self.store_exchange(user_input, agent_response, session_id)
+            return
+
+        async def write() -> None:
+            await self.store_exchange(user_input, agent_response, session_id)
+
+        await self._writer.submit(session_id or "default", write)
+
+    async def flush(self) -> None:
+        """Wait until all acknowledged exchanges have been written."""
+        await self._writer.flush()
+
+    @property
+    def write_stats(self) -> WriteBehindStats:
+        """Write-behind queue statistics (throughput and backpressure)."""
+        return self._writer.stats()
+
+    @timed("memory.store_research_note")
     async def store_research_note(
         self,
         content: str,
@@ -232,28 +671,26 @@ class NarrativeMemorySystem:
         session_id: str | None = None,
     ) -> None:
         """Store a research note (source consulted, annotation created)."""
-        timestamp = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
 
-        if hasattr(self._embeddings, "embed_query"):
-            embedding = self._embeddings.embed_query(content)
-        else:
-            embedding = self._embeddings.encode(content).tolist()
+        embedding = await self._embed(content)
 
         doc_id = f"research_{uuid.uuid4().hex}"
 
+        metadata: dict[str, Any] = {
+            "stream_type": "research",
+            "timestamp": now.isoformat(),
+            "timestamp_epoch": now.timestamp(),
+            "session_id": session_id or "default",
+            "source": source or "unknown",
+        }
+
         try:
             self._collection.add(
                 ids=[doc_id],
                 embeddings=[embedding],
                 documents=[content],
-                metadatas=[
-                    {
-                        "stream_type": "research",
-                        "timestamp": timestamp,
-                        "session_id": session_id or "default",
-                        "source": source or "unknown",
-                    }
-                ],
+                metadatas=[metadata],
             )
         except Exception as exc:
             logger.error(
@@ -265,8 +702,11 @@ class NarrativeMemorySystem:
             )
             return
 
+        self._record_stored([doc_id], [content], [metadata])
+
         logger.debug("research_note_stored", doc_id=doc_id)
 
+    @timed("memory.store_decision")
     async def store_decision(
         self,
         decision: str,
@@ -275,33 +715,27 @@ class NarrativeMemorySystem:
         session_id: str | None = None,
     ) -> None:
         """Store a decision made during research."""
-        timestamp = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
 
-        doc = f"Decision: {decision}"
-        if rationale:
-            doc += f"\nRationale: {rationale}"
-        if alternatives:
-            doc += f"\nAlternatives considered: {', '.join(alternatives)}"
+        doc = _format_decision(decision, alternatives, rationale)
 
-        if hasattr(self._embeddings, "embed_query"):
-            embedding = self._embeddings.embed_query(doc)
-        else:
-            embedding = self._embeddings.encode(doc).tolist()
+        embedding = await self._embed(doc)
 
         doc_id = f"decision_{uuid.uuid4().hex}"
 
+        metadata: dict[str, Any] = {
+            "stream_type": "decision",
+            "timestamp": now.isoformat(),
+            "timestamp_epoch": now.timestamp(),
+            "session_id": session_id or "default",
+        }
+
         try:
             self._collection.add(
                 ids=[doc_id],
                 embeddings=[embedding],
                 documents=[doc],
-                metadatas=[
-                    {
-                        "stream_type": "decision",
-                        "timestamp": timestamp,
-                        "session_id": session_id or "default",
-                    }
-                ],
+                metadatas=[metadata],
             )
         except Exception as exc:
             logger.error(
@@ -313,8 +747,147 @@ class NarrativeMemorySystem:
             )
             return
 
+        self._record_stored([doc_id], [doc], [metadata])
+
         logger.debug("decision_stored", doc_id=doc_id)
 
+    async def store_research_notes_bulk(
+        self,
+        notes: Iterable[dict[str, Any]],
+        session_id: str | None = None,
+        chunk_size: int | None = None,
+        progress: Callable[[BulkImportStats], None] | None = None,
+    ) -> BulkImportStats:
+        """
+        Store many research notes, embedding and adding them chunk by chunk.
+
+        Args:
+            notes: Records with ``content`` and optional ``source``/``session_id``
+            session_id: Session for records that do not name their own
+            chunk_size: Records per chunk (defaults to ``memory_import_chunk_size``)
+            progress: Optional callback invoked with running totals after each chunk
+
+        Returns:
+            Import statistics (stored, failed, skipped, throughput)
+        """
+
+        def prepare(note: dict[str, Any]) -> tuple[str, dict[str, Any]] | None:
+            content = str(note.get("content") or "").strip()
+            if not content:
+                return None
+            return content, {
+                "session_id": note.get("session_id") or session_id or "default",
+                "source": note.get("source") or "unknown",
+            }
+
+        return await self._store_bulk("research", notes, prepare, chunk_size, progress)
+
+    async def store_decisions_bulk(
+        self,
+        decisions: Iterable[dict[str, Any]],
+        session_id: str | None = None,
+        chunk_size: int | None = None,
+        progress: Callable[[BulkImportStats], None] | None = None,
+    ) -> BulkImportStats:
+        """
+        Store many decisions, embedding and adding them chunk by chunk.
+
+        Args:
+            decisions: Records with ``decision`` and optional ``rationale``,
+                ``alternatives`` (list or ``;``-separated) and ``session_id``
+            session_id: Session for records that do not name their own
+            chunk_size: Records per chunk (defaults to ``memory_import_chunk_size``)
+            progress: Optional callback invoked with running totals after each chunk
+
+        Returns:
+            Import statistics (stored, failed, skipped, throughput)
+        """
+
+        def prepare(record: dict[str, Any]) -> tuple[str, dict[str, Any]] | None:
+            decision = str(record.get("decision") or "").strip()
+            if not decision:
+                return None
+            doc = _format_decision(
+                decision,
+                parse_alternatives(record.get("alternatives")),
+                record.get("rationale"),
+            )
+            return doc, {"session_id": record.get("session_id") or session_id or "default"}
+
+        return await self._store_bulk("decision", decisions, prepare, chunk_size, progress)
+
+    @timed("memory.store_bulk")
+    async def _store_bulk(
+        self,
+        stream_type: str,
+        records: Iterable[dict[str, Any]],
+        prepare: Callable[[dict[str, Any]], tuple[str, dict[str, Any]] | None],
+        chunk_size: int | None,
+        progress: Callable[[BulkImportStats], None] | None,
+    ) -> BulkImportStats:
+        """
+        Shared chunked ingestion loop.
+
+        Each chunk is embedded with one ``embed_many`` call and written with
+        one ``collection.add`` call. A failing chunk is logged and counted;
+        later chunks are still imported.
+        """
+        stats = BulkImportStats(stream_type=stream_type)
+        size = chunk_size or self.config.memory_import_chunk_size
+        started = time.perf_counter()
+
+        for chunk in chunked(records, size):
+            documents: list[str] = []
+            metadatas: list[dict[str, Any]] = []
+            for record in chunk:
+                prepared = prepare(record)
+                if prepared is None:
+                    stats.skipped += 1
+                    continue
+                doc, extra = prepared
+                now = datetime.now(timezone.utc)
+                documents.append(doc)
+                metadatas.append({
+                    "stream_type": stream_type,
+                    "timestamp": now.isoformat(),
+                    "timestamp_epoch": now.timestamp(),
+                    **extra,
+                })
+
+            if documents:
+                ids = [f"{stream_type}_{uuid.uuid4().hex}" for _ in documents]
+                try:
+                    embeddings = await self._embed_many(documents)
+                    self._collection.add(
+                        ids=ids,
+                        embeddings=embeddings,
+                        documents=documents,
+                        metadatas=metadatas,
+                    )
+                except Exception as exc:
+                    stats.failed += len(documents)
+                    logger.error(
+                        "memory_bulk_store_failed",
+                        stream_type=stream_type,
+                        chunk=stats.chunks,
+                        items=len(documents),
+                        error=str(exc),
+                        exc_info=True,
+                    )
+                else:
+                    stats.stored += len(documents)
+                    self._record_stored(ids, documents, metadatas)
+
+            stats.chunks += 1
+            stats.elapsed_seconds = time.perf_counter() - started
+            logger.debug("memory_bulk_chunk_stored", **stats.to_dict())
+            if progress is not None:
+                progress(stats)
+
+        logger.info("memory_bulk_import_complete", **stats.to_dict())
+        return stats
+
+    @timed("memory.reflection")
     async def _trigger_reflection(self, session_id: str | None = None) -> None:
         """
         Trigger periodic reflection to summarize recent exchanges.
@@ -323,86 +896,95 @@ class NarrativeMemorySystem:
         the essential narrative of the research journey.
 
         The reflection process:
-        1. Retrieves recent conversation exchanges
+        1. Retrieves the session's oldest exchanges no reflection covers yet
         2. Generates a summary capturing key research themes and questions
         3. Stores the summary as a reflection document for future retrieval
-        4. Resets the exchange counter
+        4. Resets the session's exchange counter
         """
+        session_key = session_id or "default"
         logger.info(
             "reflection_triggered",
-            exchange_count=self._exchange_count,
+            exchange_count=self._exchange_counts.get(session_key, 0),
             session_id=session_id,
         )
 
+        async with self._summarizing(session_key):
+            try:
+                # Step 1: Retrieve unsummarized exchanges for summarization
+                recent_exchanges = await self._retrieve_unsummarized_exchanges(
+                    session_id=session_key,
+                    limit=self.config.reflection_trigger_count,
+                )
+
+                if not recent_exchanges:
+                    logger.debug("no_exchanges_to_reflect", session_id=session_id)
+                    self._exchange_counts.pop(session_key, None)
+                    return
+
+                # Step 2: Generate reflection summary
+                summary = await self._generate_reflection_summary(recent_exchanges)
+
+                # Step 3: Store reflection as special document
+                await self._store_reflection(
+                    summary=summary,
+                    session_id=session_id,
+                    exchange_count=len(recent_exchanges),
+                    child_ids=[exchange["id"] for exchange in recent_exchanges],
+                )
+
+                logger.info(
+                    "reflection_completed",
+                    session_id=session_id,
+                    exchanges_summarized=len(recent_exchanges),
+                )
+
+            except Exception as exc:
+                logger.error(
+                    "reflection_failed",
+                    session_id=session_id,
+                    error=str(exc),
+                    exc_info=True,
+                )
+
+        self._exchange_counts.pop(session_key, None)
+
+    @contextlib.asynccontextmanager
+    async def _summarizing(self, session_id: str) -> AsyncIterator[None]:
+        """Hold a session's summarization lock, dropping it once nobody holds or awaits it."""
+        lock = self._summary_locks.setdefault(session_id, asyncio.Lock())
+        self._summary_users[session_id] = self._summary_users.get(session_id, 0) + 1
         try:
-            # Step 1: Retrieve recent exchanges for summarization
-            recent_exchanges = await self._retrieve_recent_exchanges(
-                session_id=session_id,
-                limit=self.config.reflection_trigger_count,
-            )
-
-            if not recent_exchanges:
-                logger.debug("no_exchanges_to_reflect", session_id=session_id)
-                self._exchange_count = 0
-                return
-
-            # Step 2: Generate reflection summary
-            summary = await self._generate_reflection_summary(recent_exchanges)
-
-            # Step 3: Store reflection as special document
-            await self._store_reflection(
-                summary=summary,
-                session_id=session_id,
-                exchange_count=len(recent_exchanges),
-            )
-
-            logger.info(
-                "reflection_completed",
-                session_id=session_id,
-                exchanges_summarized=len(recent_exchanges),
-            )
-
-        except Exception as exc:
-            logger.error(
-                "reflection_failed",
-                session_id=session_id,
-                error=str(exc),
-                exc_info=True,
-            )
-
-        self._exchange_count = 0
-
-    async def _retrieve_recent_exchanges(
+            async with lock:
+                yield
+        finally:
+            self._summary_users[session_id] -= 1
+            if not self._summary_users[session_id]:
+                del self._summary_users[session_id]
+                del self._summary_locks[session_id]
+
+    async def _retrieve_unsummarized_exchanges(
         self,
-        session_id: str | None = None,
-        limit: int = 10,
+        session_id: str,
+        limit: int,
     ) -> list[dict[str, Any]]:
-        """Retrieve recent conversation exchanges for reflection."""
-        where_filter: dict[str, Any] = {"stream_type": "conversation"}
-        if session_id:
-            where_filter["session_id"] = session_id
-
-        results = self._collection.query(
-            query_texts=["recent conversation exchange"],
-            n_results=limit,
-            where=where_filter,
-            include=["documents", "metadatas"],
-        )
+        """
+        Retrieve a session's oldest exchanges that no reflection summarizes yet.
 
-        if not results["documents"] or not results["documents"][0]:
+        Reflecting over these rather than the newest exchanges means every
+        exchange is summarized exactly once, however sessions interleave.
+        """
+        if self._index is None:
             return []
-
-        exchanges = []
-        for doc, meta in zip(results["documents"][0], results["metadatas"][0]):
-            exchanges.append({
+        ids = self._index.unsummarized(0, session_id, limit)
+        return [
+            {
+                "id": doc_id,
                 "content": doc,
                 "timestamp": meta.get("timestamp", "unknown"),
                 "session_id": meta.get("session_id", "default"),
-            })
-
-        # Sort by timestamp (most recent last for narrative flow)
-        exchanges.sort(key=lambda x: x["timestamp"])
-        return exchanges
+            }
+            for doc_id, doc, meta in self._get_with_ids(ids)
+        ]
 
     async def _generate_reflection_summary(
         self,
@@ -467,31 +1049,41 @@ class NarrativeMemorySystem:
         summary: str,
         session_id: str | None = None,
         exchange_count: int = 0,
-    ) -> None:
-        """Store a reflection summary in the memory system."""
-        timestamp = datetime.now(timezone.utc).isoformat()
+        child_ids: list[str] | None = None,
+        level: int = 1,
+    ) -> str | None:
+        """
+        Store a reflection summary; returns its id, or None if storing failed.
+
+        The reflection becomes a tree node at ``level`` above ``child_ids``;
+        if that leaves enough unsummarized nodes at its level, they are
+        rolled up into the next (see ``_roll_up``).
+        """
+        now = datetime.now(timezone.utc)
 
-        if hasattr(self._embeddings, "embed_query"):
-            embedding = self._embeddings.embed_query(summary)
-        else:
-            embedding = self._embeddings.encode(summary).tolist()
+        embedding = await self._embed(summary)
 
         doc_id = f"reflection_{uuid.uuid4().hex}"
 
+        metadata: dict[str, Any] = {
+            "stream_type": "reflection",
+            "timestamp": now.isoformat(),
+            "timestamp_epoch": now.timestamp(),
+            "session_id": session_id or "default",
+            "exchange_count": exchange_count,
+            "is_reflection": True,
+            "reflection_level": level,
+        }
+        if child_ids:
+            # Chroma metadata values are scalars
+            metadata["child_ids"] = ",".join(child_ids)
+
         try:
             self._collection.add(
                 ids=[doc_id],
                 embeddings=[embedding],
                 documents=[summary],
-                metadatas=[
-                    {
-                        "stream_type": "reflection",
-                        "timestamp": timestamp,
-                        "session_id": session_id or "default",
-                        "exchange_count": exchange_count,
-                        "is_reflection": True,
-                    }
-                ],
+                metadatas=[metadata],
             )
         except Exception as exc:
             logger.error(
@@ -500,16 +1092,237 @@ class NarrativeMemorySystem:
                 error=str(exc),
                 exc_info=True,
             )
+            return None
+
+        self._record_stored([doc_id], [summary], [metadata])
+
+        logger.debug("reflection_stored", doc_id=doc_id, session_id=session_id, level=level)
+        if self.config.reflection_tree_enabled:
+            await self._roll_up(level, metadata["session_id"])
+        return doc_id
+
+    async def _roll_up(self, level: int, session_id: str) -> None:
+        """
+        Summarize ``reflection_tree_fanout`` unsummarized reflections into one a level up.
+
+        A session's own reflections are rolled up first; once the sessions
+        together (but none alone) have enough, they are rolled up across
+        sessions into a researcher-level reflection.
+        """
+        if self._index is None:
+            return
+        fanout = self.config.reflection_tree_fanout
+        group = self._index.unsummarized(level, session_id, fanout)
+        scope = session_id
+        if len(group) < fanout:
+            group = self._index.unsummarized(level, None, fanout)
+            scope = RESEARCHER_SESSION
+        if len(group) < fanout:
             return
 
-        logger.debug("reflection_stored", doc_id=doc_id, session_id=session_id)
+        reflections = self._get_by_ids(group)
+        summary = await self._generate_rollup_summary(reflections, level + 1)
+        await self._store_reflection(
+            summary=summary,
+            session_id=scope,
+            exchange_count=sum(int(meta.get("exchange_count", 0)) for _, meta in reflections),
+            child_ids=group,
+            level=level + 1,
+        )
+        logger.info("reflections_rolled_up", level=level + 1, session_id=scope, children=fanout)
+
+    async def _generate_rollup_summary(
+        self,
+        reflections: list[tuple[str, dict[str, Any]]],
+        level: int,
+    ) -> str:
+        """
+        Condense reflections into a higher-level reflection.
+
+        Keeps the research questions the children recorded (first occurrence
+        wins) and the overall activity span, so each level stays about the
+        size of one reflection.
+        """
+        questions: list[str] = []
+        for doc, _ in reflections:
+            for line in doc.splitlines():
+                if line.startswith("- ") and line not in questions:
+                    questions.append(line)
+
+        summary_parts = []
+        if questions:
+            summary_parts.append("**Research Questions Explored:**\n" + "\n".join(questions[:5]))
+
+        timestamps = sorted(str(meta.get("timestamp", "unknown")) for _, meta in reflections)
+        exchanges = sum(int(meta.get("exchange_count", 0)) for _, meta in reflections)
+        summary_parts.append(
+            f"**Session Activity:** {exchanges} exchanges in {len(reflections)} reflections "
+            f"from {timestamps[0]} to {timestamps[-1]}"
+        )
+        sessions = sorted({str(meta.get("session_id", "default")) for _, meta in reflections})
+        if len(sessions) > 1:
+            summary_parts.append(f"**Sessions:** {', '.join(sessions)}")
+
+        return (
+            f"## Reflection Summary (level {level})\n\n"
+            "This reflection condenses earlier reflections on the researcher's journey.\n\n"
+            + "\n\n".join(summary_parts)
+        )
+
+    @timed("memory.compaction")
+    async def compact(self) -> CompactionStats:
+        """
+        Apply the retention policies once.
+
+        For each stream with limits, the time-ordered index selects each
+        session's oldest items past the maximum age or beyond the per-session
+        cap. They are processed oldest first in batches of
+        ``memory_compaction_batch_size``: a summarizing policy first folds
+        the batch's items that no reflection covers yet into one, then the
+        originals are deleted from the vector store, the index and the
+        stream. A batch whose reflection or delete fails is kept and retried
+        on the next run. If anything was evicted, the stream log is rewritten
+        without it in a worker thread.
+
+        Returns:
+            Statistics including the collection size before and after
+        """
+        if self._index is None:
+            raise RuntimeError("Memory index not initialized")
+        started = time.perf_counter()
+        stats = CompactionStats(collection_before=self._collection.count())
+        now = time.time()
+
+        for policy in self._retention.values():
+            if policy.keeps_forever:
+                continue
+            counts = self._index.eviction_counts(
+                policy.stream_type.value,
+                before_epoch=now - policy.max_age_seconds if policy.max_age_seconds else None,
+                keep_per_session=policy.max_items_per_session,
+            )
+            for session_id, count in counts.items():
+                remaining = count
+                while remaining > 0:
+                    ids = self._index.oldest(
+                        policy.stream_type.value,
+                        session_id,
+                        min(remaining, self.config.memory_compaction_batch_size),
+                    )
+                    if not ids or not await self._evict_batch(policy, session_id, ids, stats):
+                        break
+                    remaining -= len(ids)
+
+        if stats.total_evicted and self._stream_log is not None:
+            # Snapshot the streams on the loop; appends made while the rewrite
+            # runs are held back by the log and written after it
+            self._stream_log.begin_rewrite()
+            records = [
+                LogRecord(stream_type, timestamp_us, session_id, content, metadata)
+                for stream_type, stream in self._streams.items()
+                for content, timestamp_us, session_id, metadata in stream.rows()
+            ]
+            await asyncio.to_thread(self._stream_log.rewrite, records)
+
+        stats.collection_after = self._collection.count()
+        stats.elapsed_seconds = time.perf_counter() - started
+        self._last_compaction = stats
+        logger.info("memory_compacted", **stats.to_dict())
+        return stats
+
+    async def _evict_batch(
+        self,
+        policy: RetentionPolicy,
+        session_id: str,
+        ids: list[str],
+        stats: CompactionStats,
+    ) -> bool:
+        """Summarize (if the policy says so) and delete one batch; False if it was kept."""
+        rows = self._get_with_ids(ids)
+        if policy.summarize and not await self._summarize_evicted(session_id, rows, stats):
+            return False
+
+        try:
+            self._collection.delete(ids=ids)
+        except Exception as exc:
+            stats.failed_batches += 1
+            logger.error(
+                "memory_compaction_delete_failed",
+                stream_type=policy.stream_type.value,
+                items=len(ids),
+                error=str(exc),
+                exc_info=True,
+            )
+            return False
+
+        if self._index is not None:
+            self._index.remove_many(ids)
+        if rows:
+            through = max(_metadata_datetime(meta) for _, _, meta in rows)
+            self._streams[policy.stream_type.value].evict(session_id, through)
+
+        stream_type = policy.stream_type.value
+        stats.evicted[stream_type] = stats.evicted.get(stream_type, 0) + len(ids)
+        stats.batches += 1
+        # Let queued turns and writes run between batches
+        await asyncio.sleep(0)
+        return True
+
+    async def _summarize_evicted(
+        self,
+        session_id: str,
+        rows: list[tuple[str, str, dict[str, Any]]],
+        stats: CompactionStats,
+    ) -> bool:
+        """Fold the evicted exchanges no reflection covers yet into one; False if that failed."""
+        if self._index is None:
+            return True
+        async with self._summarizing(session_id):
+            # Exchanges already folded into a reflection are not summarized again
+            pending = set(
+                self._index.unsummarized(
+                    0, session_id, len(rows), among=[doc_id for doc_id, _, _ in rows]
+                )
+            )
+            if not pending:
+                return True
+            exchanges = [
+                {
+                    "content": doc,
+                    "timestamp": meta.get("timestamp", "unknown"),
+                    "session_id": session_id,
+                }
+                for doc_id, doc, meta in rows
+                if doc_id in pending
+            ]
+            summary = await self._generate_reflection_summary(exchanges)
+            reflection_id = await self._store_reflection(
+                summary,
+                session_id,
+                len(exchanges),
+                child_ids=[doc_id for doc_id, _, _ in rows if doc_id in pending],
+            )
+        if reflection_id is None:
+            stats.failed_batches += 1
+            return False
+        stats.reflections += 1
+        return True
+
+    @property
+    def compaction_stats(self) -> CompactionStats | None:
+        """Statistics of the last compaction run, or None before the first."""
+        return self._last_compaction
 
     async def persist(self) -> None:
-        """Persist memory to disk."""
-        if self._client:
-            # ChromaDB with persistence auto-saves, but we can force it
+        """Persist memory to disk, flushing any queued writes first."""
+        await self.flush()
+        if self._stream_log is not None:
+            self._stream_log.sync()
+        if self._collection is not None:
+            # Both backends write through on add; nothing further to force
             logger.info("memory_persisted")
 
+    @timed("memory.session_summary")
     async def get_session_summary(self, session_id: str) -> str | None:
         """
         Get a comprehensive summary of a research session.
@@ -525,55 +1338,63 @@ class NarrativeMemorySystem:
         Returns:
             A formatted summary string, or None if session not found
         """
-        # First, check for existing reflection summaries
-        reflection_results = self._collection.query(
-            query_texts=["reflection summary"],
-            n_results=5,
-            where={"session_id": session_id, "is_reflection": True},
-            include=["documents", "metadatas"],
-        )
+        await self._writer.wait_for(session_id)
 
-        # Query for all items in session to get statistics
-        all_results = self._collection.query(
-            query_texts=["session overview"],
-            n_results=50,
-            where={"session_id": session_id},
-            include=["documents", "metadatas"],
-        )
+        # First, find the latest reflection summary via the time-ordered index
+        latest_reflection: str | None = None
+        if self._index is not None:
+            reflections = self._get_by_ids(
+                self._index.recent("reflection", session_id=session_id, limit=1)
+            )
+            if reflections:
+                latest_reflection = reflections[0][0]
 
-        if not all_results["documents"] or not all_results["documents"][0]:
+        # Exact per-stream counters, maintained incrementally by the index
+        stats = self._index.session_stats(session_id) if self._index is not None else {}
+        if not stats:
             return None
 
-        # Calculate stream statistics
-        stream_counts: dict[str, int] = {
-            "conversation": 0,
-            "research": 0,
-            "decision": 0,
-            "reflection": 0,
-        }
-
-        for meta in all_results["metadatas"][0]:
-            stream_type = meta.get("stream_type", "unknown")
-            if stream_type in stream_counts:
-                stream_counts[stream_type] += 1
+        counts = {stream_type: stream.count for stream_type, stream in stats.items()}
+        first_epoch = min(stream.first_epoch for stream in stats.values())
+        last_epoch = max(stream.last_epoch for stream in stats.values())
 
         # Build summary
         summary_parts = [
             f"## Session Summary: {session_id}\n",
             "### Memory Statistics",
-            f"- Conversation exchanges: {stream_counts['conversation']}",
-            f"- Research notes: {stream_counts['research']}",
-            f"- Decisions recorded: {stream_counts['decision']}",
-            f"- Reflections generated: {stream_counts['reflection']}",
-            f"- **Total items:** {len(all_results['documents'][0])}",
+            f"- Conversation exchanges: {counts.get('conversation', 0)}",
+            f"- Research notes: {counts.get('research', 0)}",
+            f"- Decisions recorded: {counts.get('decision', 0)}",
+            f"- Reflections generated: {counts.get('reflection', 0)}",
+            f"- **Total items:** {sum(counts.values())}",
+            f"- First activity: {_format_epoch(first_epoch)}",
+            f"- Last activity: {_format_epoch(last_epoch)}",
         ]
 
         # Include latest reflection if available
-        if reflection_results["documents"] and reflection_results["documents"][0]:
-            latest_reflection = reflection_results["documents"][0][0]
+        if latest_reflection:
             summary_parts.extend([
                 "\n### Latest Reflection",
                 latest_reflection,
             ])
 
         return "\n".join(summary_parts)
+
+    async def close(self) -> None:
+        """Stop compaction, drain the write-behind queue, stop its worker and persist."""
+        await self._compactor.stop()
+        await self._writer.close()
+        await self.persist()
+        if self._embedder is not None:
+            self._embedder.close()
+        with self._model_lock:
+            self._closed = True
+            holds, self._holds_embedding_model = self._holds_embedding_model, False
+        if holds:
+            EMBEDDING_MODELS.release(self.config, unload=not self.config.embedding_keep_loaded)
+        if self._stream_log is not None:
+            self._stream_log.close()
+        if self._index is not None:
+            self._index.close()
+        if self._collection is not None:
+            self._collection.close()
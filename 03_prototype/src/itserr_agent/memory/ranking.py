@@ -0,0 +1,213 @@
+"""
+Retrieval re-ranking for the Narrative Memory System.
+
+The vector store returns candidates ordered by semantic distance alone.
+Following the stream characteristics in ``memory/streams.py``, the final
+ordering also accounts for age:
+
+- Conversation: recent dialogue matters most (high recency weight, fast decay)
+- Research: scholarly sources stay relevant (high semantic weight, slow decay)
+- Decision: past choices shape the trajectory (long-lived, very slow decay)
+
+Scores are computed for the whole candidate set at once with NumPy, which
+keeps re-ranking of a few hundred candidates well under a millisecond.
+
+Near-duplicates (the same question asked twice, a reflection next to the
+exchanges it summarizes) would otherwise fill several of the k slots with
+the same context. When candidate embeddings are available, the k items are
+chosen by maximal marginal relevance (MMR): each pick maximizes
+``lambda * score - (1 - lambda) * max cosine similarity to the items
+already picked``, using one candidate x candidate similarity matrix.
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+_LN2 = math.log(2)
+_HOUR = 3600.0
+
+
+@dataclass(frozen=True)
+class StreamWeights:
+    """How a stream trades semantic similarity against recency."""
+
+    semantic: float
+    recency: float
+    half_life_hours: float
+
+
+STREAM_WEIGHTS: dict[str, StreamWeights] = {
+    "conversation": StreamWeights(semantic=0.5, recency=0.5, half_life_hours=24.0),
+    "research": StreamWeights(semantic=0.8, recency=0.2, half_life_hours=24.0 * 30),
+    "decision": StreamWeights(semantic=0.7, recency=0.3, half_life_hours=24.0 * 365),
+    "reflection": StreamWeights(semantic=0.7, recency=0.3, half_life_hours=24.0 * 7),
+}
+
+DEFAULT_WEIGHTS = StreamWeights(semantic=0.7, recency=0.3, half_life_hours=24.0 * 7)
+
+# Lookup table (semantic, recency, half-life seconds) indexed by stream code;
+# the final row holds the default weights for unrecognized streams.
+_STREAM_CODES = {stream: code for code, stream in enumerate(STREAM_WEIGHTS)}
+_WEIGHT_TABLE = np.array(
+    [
+        [w.semantic, w.recency, w.half_life_hours * _HOUR]
+        for w in (*STREAM_WEIGHTS.values(), DEFAULT_WEIGHTS)
+    ]
+)
+
+
+def metadata_epoch(meta: dict[str, Any]) -> float:
+    """
+    Get a memory item's creation time as seconds since the epoch.
+
+    Items stored before ``timestamp_epoch`` was recorded fall back to their
+    ISO ``timestamp`` (naive values treated as UTC); items with neither are
+    treated as very old.
+    """
+    epoch = meta.get("timestamp_epoch")
+    if epoch is not None:
+        return float(epoch)
+    try:
+        timestamp = datetime.fromisoformat(str(meta["timestamp"]))
+    except (KeyError, ValueError):
+        return 0.0
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def distances_to_similarity(distances: Sequence[float]) -> np.ndarray:
+    """Convert vector store distances into similarities clipped to [0, 1]."""
+    return np.clip(1.0 - np.asarray(distances, dtype=np.float64), 0.0, 1.0)
+
+
+def hybrid_scores(
+    similarities: np.ndarray,
+    epochs: np.ndarray,
+    stream_types: Sequence[str],
+    now: float,
+) -> np.ndarray:
+    """
+    Score candidates by similarity, exponential time decay and stream weight.
+
+    score = w_semantic * similarity + w_recency * 0.5 ** (age / half_life)
+
+    Args:
+        similarities: Semantic similarity per candidate, in [0, 1]
+        epochs: Creation time per candidate (seconds since the epoch)
+        stream_types: Stream type per candidate
+        now: Current time (seconds since the epoch)
+
+    Returns:
+        Combined score per candidate
+    """
+    default_code = len(_STREAM_CODES)
+    codes = np.fromiter(
+        (_STREAM_CODES.get(stream, default_code) for stream in stream_types),
+        dtype=np.intp,
+        count=len(stream_types),
+    )
+    weights = _WEIGHT_TABLE[codes]
+
+    age = np.maximum(now - epochs, 0.0)
+    decay = np.exp(-_LN2 * age / weights[:, 2])
+    return weights[:, 0] * similarities + weights[:, 1] * decay
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def mmr_indices(
+    scores: np.ndarray,
+    embeddings: np.ndarray,
+    k: int,
+    diversity_lambda: float,
+) -> np.ndarray:
+    """
+    Pick ``k`` candidates by maximal marginal relevance, in pick order.
+
+    Args:
+        scores: Relevance score per candidate
+        embeddings: Embedding per candidate (rows; need not be normalized)
+        k: Number of candidates to pick
+        diversity_lambda: Weight of relevance against novelty; 1.0 is plain top-k
+
+    Returns:
+        Indices of the picked candidates
+    """
+    count = len(scores)
+    k = min(k, count)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if diversity_lambda >= 1.0:
+        return top_k_indices(scores, k)
+
+    vectors = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1.0, norms)
+    similarity = vectors @ vectors.T
+
+    relevance = diversity_lambda * scores
+    redundancy = np.full(count, -np.inf)
+    picked = np.zeros(count, dtype=bool)
+    order = np.empty(k, dtype=np.intp)
+    for position in range(k):
+        # Before the first pick there is nothing to be redundant with
+        marginal = relevance - (1.0 - diversity_lambda) * np.maximum(redundancy, 0.0)
+        marginal[picked] = -np.inf
+        best = int(np.argmax(marginal))
+        order[position] = best
+        picked[best] = True
+        redundancy = np.maximum(redundancy, similarity[best])
+    return order
+
+
+def rerank(
+    distances: Sequence[float],
+    metadatas: Sequence[dict[str, Any]],
+    k: int,
+    now: float | None = None,
+    embeddings: Sequence[Sequence[float]] | np.ndarray | None = None,
+    diversity_lambda: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Re-rank over-fetched vector store candidates.
+
+    Args:
+        distances: Vector store distance per candidate
+        metadatas: Metadata per candidate (stream_type, timestamp_epoch)
+        k: Number of candidates to keep
+        now: Current time in epoch seconds (defaults to the wall clock)
+        embeddings: Candidate embeddings; with ``diversity_lambda`` < 1 the
+            k candidates are selected by MMR instead of plain top-k
+        diversity_lambda: MMR trade-off between score (1.0) and novelty (0.0)
+
+    Returns:
+        Tuple of (selected candidate indices best first, their scores)
+    """
+    if not metadatas:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    similarities = distances_to_similarity(distances)
+    epochs = np.fromiter(
+        (metadata_epoch(m) for m in metadatas), dtype=np.float64, count=len(metadatas)
+    )
+    streams = [m.get("stream_type", "unknown") for m in metadatas]
+
+    scores = hybrid_scores(similarities, epochs, streams, now)
+    if embeddings is not None and len(embeddings) == len(scores):
+        order = mmr_indices(scores, np.asarray(embeddings), k, diversity_lambda)
+    else:
+        order = top_k_indices(scores, k)
+    return order, scores[order]
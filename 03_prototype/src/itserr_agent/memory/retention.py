@@ -0,0 +1,139 @@
+"""
+Retention policies and background compaction for the memory streams.
+
+Without retention the collection, its ANN index and the stream log grow for
+as long as the agent is used, and query latency grows with them. Each stream
+gets a ``RetentionPolicy``:
+
+- Conversation: evicted past a maximum age or beyond the newest N exchanges
+  of a session, after the evicted exchanges are summarized into a reflection
+  (the "shorter retention" of ``ConversationStream``).
+- Research: kept forever unless a maximum age is configured.
+- Decision: always kept; the research trajectory must stay reconstructable.
+
+Reflections are the compacted form and are never evicted.
+
+Compaction runs periodically in a background task (``PeriodicTask``) and
+deletes originals in batches; see ``NarrativeMemorySystem.compact``.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import structlog
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.streams import StreamType
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long one stream keeps its items."""
+
+    stream_type: StreamType
+    max_age_seconds: float | None = None
+    max_items_per_session: int | None = None
+    summarize: bool = False
+
+    @property
+    def keeps_forever(self) -> bool:
+        """Whether the policy never evicts anything."""
+        return self.max_age_seconds is None and self.max_items_per_session is None
+
+
+def retention_policies(config: AgentConfig) -> dict[StreamType, RetentionPolicy]:
+    """Build the per-stream policies from configuration (0 disables a limit)."""
+    return {
+        StreamType.CONVERSATION: RetentionPolicy(
+            StreamType.CONVERSATION,
+            max_age_seconds=config.conversation_retention_hours * 3600 or None,
+            max_items_per_session=config.conversation_retention_max_items or None,
+            summarize=True,
+        ),
+        StreamType.RESEARCH: RetentionPolicy(
+            StreamType.RESEARCH,
+            max_age_seconds=config.research_retention_hours * 3600 or None,
+        ),
+        StreamType.DECISION: RetentionPolicy(StreamType.DECISION),
+    }
+
+
+@dataclass
+class CompactionStats:
+    """Outcome of one compaction run."""
+
+    collection_before: int = 0
+    collection_after: int = 0
+    evicted: dict[str, int] = field(default_factory=dict)
+    reflections: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def total_evicted(self) -> int:
+        """Items deleted across all streams."""
+        return sum(self.evicted.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+class PeriodicTask:
+    """Runs a coroutine every ``interval_seconds`` in a background task."""
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        job: Callable[[], Awaitable[Any]],
+        name: str,
+    ) -> None:
+        """
+        Initialize the task (not started).
+
+        Args:
+            interval_seconds: Delay before each run
+            job: Coroutine function to run; failures are logged, not raised
+            name: Name of the asyncio task
+        """
+        self._interval = interval_seconds
+        self._job = job
+        self._name = name
+        self._task: asyncio.Task[None] | None = None
+
+    def ensure_started(self) -> None:
+        """Start the task on first use, bound to the running event loop (if any)."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = asyncio.create_task(self._run(), name=self._name)
+
+    async def _run(self) -> None:
+        """Sleep, run, repeat until cancelled."""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self._job()
+            except Exception as exc:
+                logger.error("periodic_task_failed", task=self._name, error=str(exc), exc_info=True)
+
+    async def stop(self) -> None:
+        """Cancel the task and wait for it to finish."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        if task.get_loop() is not asyncio.get_running_loop():
+            return
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
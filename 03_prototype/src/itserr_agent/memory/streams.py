@@ -5,19 +5,44 @@ Each stream has distinct characteristics for retention and retrieval:
 - Conversation: Recent exchanges, high recency weight
 - Research: Sources and notes, high relevance weight
 - Decision: Choices made, preserved long-term
+
+Streams keep their items in a ``StreamStore``: columns (content, timestamp,
+session, metadata) instead of one object per item, plus time-ordered
+position indexes overall and per session, so ``get_recent`` touches only
+the items it returns.
 """
 
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 def _utc_now() -> datetime:
     """Return current UTC time as timezone-aware datetime."""
     return datetime.now(timezone.utc)
 
 
+def to_micros(timestamp: datetime) -> int:
+    """Exact UTC microseconds since the epoch."""
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime:
+    """Inverse of ``to_micros``."""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+# Separates memory items in the prompt's context section
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
 class StreamType(str, Enum):
     """Types of memory streams."""
 
@@ -26,12 +51,33 @@ class StreamType(str, Enum):
     DECISION = "decision"
 
 
-@dataclass
+@dataclass(frozen=True)
+class RetrievedMemory:
+    """A memory item selected for the prompt, with its ranking scores."""
+
+    document: str
+    stream_type: str
+    timestamp: str
+    relevance: float
+    score: float
+
+    def format(self) -> str:
+        """Render the item as a block of prompt context."""
+        return (
+            f"[{self.stream_type.upper()}] (relevance: {self.relevance:.2f}, "
+            f"score: {self.score:.2f}, from: {self.timestamp})\n{self.document}"
+        )
+
+
+@dataclass(slots=True)
 class MemoryItem:
     """A single item in a memory stream.
 
     Note: All timestamps use UTC timezone for consistency across sessions
     and to avoid timezone-related issues in age calculations.
+
+    Streams store items column-wise and return ``MemoryItem`` snapshots;
+    changing a returned item does not change the stream.
     """
 
     content: str
@@ -77,13 +123,180 @@ class MemoryItem:
         )
 
 
+class StreamStore:
+    """
+    Columnar, append-only storage for the items of one stream.
+
+    Each item costs a content reference, an 8-byte timestamp, a 4-byte
+    session number, a metadata reference (None when empty) and 4-byte
+    entries in two position indexes, instead of a dataclass instance with
+    its own ``datetime`` and metadata dict.
+
+    Positions are kept in timestamp order, overall and per session.
+    Timestamps normally arrive in order, so adding an item is an append;
+    an out-of-order timestamp (e.g. a clock step back) is inserted in place.
+    """
+
+    __slots__ = (
+        "_contents",
+        "_timestamps",
+        "_sessions",
+        "_metadata",
+        "_session_names",
+        "_session_numbers",
+        "_order",
+        "_by_session",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._contents: list[str] = []
+        self._timestamps = array("q")  # UTC microseconds since the epoch
+        self._sessions = array("I")  # index into _session_names
+        self._metadata: list[dict[str, Any] | None] = []
+        self._session_names: list[str] = []
+        self._session_numbers: dict[str, int] = {}
+        self._order = array("I")  # positions, oldest first
+        self._by_session: dict[int, array[int]] = {}
+
+    def append(
+        self,
+        content: str,
+        timestamp: datetime,
+        session_id: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Store one item."""
+        self.append_micros(content, to_micros(timestamp), session_id, metadata)
+
+    def append_micros(
+        self,
+        content: str,
+        micros: int,
+        session_id: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Store one item whose timestamp is in UTC microseconds since the epoch."""
+        position = len(self._contents)
+        session = self._session_numbers.get(session_id)
+        if session is None:
+            session = self._session_numbers[session_id] = len(self._session_names)
+            self._session_names.append(session_id)
+            self._by_session[session] = array("I")
+
+        self._contents.append(content)
+        self._timestamps.append(micros)
+        self._sessions.append(session)
+        self._metadata.append(metadata or None)
+        self._insert(self._order, position, micros)
+        self._insert(self._by_session[session], position, micros)
+
+    def _insert(self, positions: "array[int]", position: int, micros: int) -> None:
+        """Add a position to a time-ordered index (an append unless out of order)."""
+        if not positions or self._timestamps[positions[-1]] <= micros:
+            positions.append(position)
+        else:
+            at = bisect_right(positions, micros, key=self._timestamps.__getitem__)
+            positions.insert(at, position)
+
+    def recent(
+        self,
+        count: int,
+        stream_type: StreamType,
+        session_id: str | None = None,
+    ) -> list[MemoryItem]:
+        """The ``count`` newest items, newest first, in O(count)."""
+        if session_id:
+            session = self._session_numbers.get(session_id)
+            if session is None:
+                return []
+            positions = self._by_session[session]
+        else:
+            positions = self._order
+        if count <= 0:
+            return []
+        newest = positions[-count:]
+        return [self._item(position, stream_type) for position in reversed(newest)]
+
+    def _item(self, position: int, stream_type: StreamType) -> MemoryItem:
+        """Materialize the item at ``position``."""
+        metadata = self._metadata[position]
+        return MemoryItem(
+            content=self._contents[position],
+            stream_type=stream_type,
+            timestamp=_from_micros(self._timestamps[position]),
+            session_id=self._session_names[self._sessions[position]],
+            metadata=dict(metadata) if metadata else {},
+        )
+
+    def evict(self, session_id: str, through_micros: int) -> int:
+        """
+        Remove a session's items with timestamps up to ``through_micros``.
+
+        Compacts every column and index in one pass, so evict in batches
+        rather than item by item.
+
+        Returns:
+            Number of items removed
+        """
+        session = self._session_numbers.get(session_id)
+        if session is None:
+            return 0
+        positions = self._by_session[session]
+        count = bisect_right(positions, through_micros, key=self._timestamps.__getitem__)
+        if count == 0:
+            return 0
+        dead = set(positions[:count])
+
+        remap: dict[int, int] = {}
+        contents: list[str] = []
+        timestamps = array("q")
+        sessions = array("I")
+        metadata: list[dict[str, Any] | None] = []
+        for position in range(len(self._contents)):
+            if position in dead:
+                continue
+            remap[position] = len(contents)
+            contents.append(self._contents[position])
+            timestamps.append(self._timestamps[position])
+            sessions.append(self._sessions[position])
+            metadata.append(self._metadata[position])
+        self._contents = contents
+        self._timestamps = timestamps
+        self._sessions = sessions
+        self._metadata = metadata
+        self._order = array("I", (remap[p] for p in self._order if p not in dead))
+        for number, indexed in self._by_session.items():
+            self._by_session[number] = array("I", (remap[p] for p in indexed if p not in dead))
+        return count
+
+    def rows(self) -> Iterator[tuple[str, int, str, dict[str, Any] | None]]:
+        """Every item as (content, timestamp_us, session_id, metadata), oldest first."""
+        for position in self._order:
+            yield (
+                self._contents[position],
+                self._timestamps[position],
+                self._session_names[self._sessions[position]],
+                self._metadata[position],
+            )
+
+    def session_count(self, session_id: str) -> int:
+        """Number of items in one session."""
+        session = self._session_numbers.get(session_id)
+        return len(self._by_session[session]) if session is not None else 0
+
+    def __len__(self) -> int:
+        """Number of stored items."""
+        return len(self._contents)
+
+
 class BaseStream:
     """Base class for memory streams."""
 
     stream_type: StreamType
 
     def __init__(self) -> None:
-        self._items: list[MemoryItem] = []
+        self._store = StreamStore()
 
     def add(self, content: str, session_id: str = "default", **metadata: Any) -> MemoryItem:
         """Add an item to the stream."""
@@ -91,22 +304,41 @@ class BaseStream:
             content=content,
             stream_type=self.stream_type,
             session_id=session_id,
-            metadata=metadata,
+            metadata=dict(metadata),
         )
-        self._items.append(item)
+        self._store.append(content, item.timestamp, session_id, metadata)
         return item
 
+    def restore(
+        self,
+        content: str,
+        timestamp_us: int,
+        session_id: str = "default",
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Add a previously stored item, keeping its original timestamp (UTC microseconds)."""
+        self._store.append_micros(content, timestamp_us, session_id, metadata)
+
     def get_recent(self, count: int = 10, session_id: str | None = None) -> list[MemoryItem]:
-        """Get the most recent items from the stream."""
-        items = self._items
-        if session_id:
-            items = [i for i in items if i.session_id == session_id]
-        return sorted(items, key=lambda x: x.timestamp, reverse=True)[:count]
+        """Get the most recent items from the stream, newest first."""
+        return self._store.recent(count, self.stream_type, session_id)
+
+    def evict(self, session_id: str, through: datetime) -> int:
+        """Remove a session's items created at or before ``through``; returns the count."""
+        return self._store.evict(session_id, to_micros(through))
+
+    def rows(self) -> Iterator[tuple[str, int, str, dict[str, Any] | None]]:
+        """Every item as (content, timestamp_us, session_id, metadata), oldest first."""
+        return self._store.rows()
+
+    def session_count(self, session_id: str) -> int:
+        """Get the number of items one session has in the stream."""
+        return self._store.session_count(session_id)
 
     @property
     def count(self) -> int:
         """Get the number of items in the stream."""
-        return len(self._items)
+        return len(self._store)
 
 
 class ConversationStream(BaseStream):
@@ -0,0 +1,431 @@
+"""
+NumPy vector store - In-process exact search over a memory-mapped matrix.
+
+A researcher's memory holds tens to a few hundred thousand items. At that
+size an exact search is a single matrix-vector product, which NumPy does in
+a few milliseconds, and there is no index to build or load. The store keeps:
+
+- ``vectors.f32`` / ``vectors.f16``: a row-per-item embedding matrix,
+  memory-mapped so that opening the store reads nothing up front
+- ``items.sqlite3``: ids, documents and JSON metadata keyed by row number
+
+Embeddings are L2-normalized on insert, so the dot product is the cosine
+similarity and reported distances are cosine distances (``1 - cos``), the
+scale every ``MemoryBackend`` reports.
+
+Metadata filters (Chroma ``where`` syntax) are evaluated on dictionary
+encoded columns: each filtered key is loaded once into an integer code per
+row plus a small table of distinct values. A predicate is evaluated on the
+distinct values and broadcast to all rows with one vectorized lookup.
+
+Deleted rows are tombstoned; their space is not reclaimed.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+_INITIAL_CAPACITY = 1024
+# Rows scored per step when float16 storage is upcast to float32
+_SCORE_BLOCK = 16_384
+_NO_MATCH = np.empty(0, dtype=np.intp)
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+}
+
+
+class _Column:
+    """Dictionary-encoded values of one metadata key, one code per row."""
+
+    def __init__(self, capacity: int) -> None:
+        self.codes = np.zeros(capacity, dtype=np.int32)
+        self.values: list[Any] = []
+        self._lookup: dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        # Unhashable values (lists) cannot be filtered on; treat them as missing
+        if isinstance(value, (list, dict)):
+            value = None
+        # SQLite's json_extract yields 1/0 for JSON booleans
+        elif isinstance(value, bool):
+            value = int(value)
+        code = self._lookup.get((type(value), value))
+        if code is None:
+            code = len(self.values)
+            self._lookup[(type(value), value)] = code
+            self.values.append(value)
+        return code
+
+    def grow(self, capacity: int) -> None:
+        codes = np.zeros(capacity, dtype=np.int32)
+        codes[: len(self.codes)] = self.codes
+        self.codes = codes
+
+    def mask(self, rows: int, predicate: Callable[[Any], bool]) -> np.ndarray:
+        matches = np.fromiter(
+            (_safe(predicate, value) for value in self.values),
+            dtype=bool,
+            count=len(self.values),
+        )
+        return matches[self.codes[:rows]]
+
+
+def _safe(predicate: Callable[[Any], bool], value: Any) -> bool:
+    """Evaluate a predicate, treating incomparable types as a non-match."""
+    try:
+        return bool(predicate(value))
+    except TypeError:
+        return False
+
+
+class NumpyVectorStore:
+    """MemoryBackend storing embeddings in a memory-mapped NumPy matrix."""
+
+    def __init__(self, path: Path, dtype: Literal["float32", "float16"] = "float32") -> None:
+        """
+        Open (or create) the store.
+
+        Args:
+            path: Directory holding the matrix and metadata files
+            dtype: Storage precision for new stores (existing stores keep theirs)
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path / "items.sqlite3", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                row INTEGER PRIMARY KEY,
+                doc_id TEXT NOT NULL UNIQUE,
+                document TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        settings = dict(self._db.execute("SELECT key, value FROM settings").fetchall())
+        self._dtype = np.dtype(settings.get("dtype", dtype))
+        self._dim = int(settings["dim"]) if "dim" in settings else 0
+        self._matrix_path = path / ("vectors.f16" if self._dtype == np.float16 else "vectors.f32")
+
+        # Row numbers are positions in the matrix; rows past the last live
+        # item are free space
+        rows = self._db.execute("SELECT row, doc_id FROM items ORDER BY row").fetchall()
+        self._rows = rows[-1][0] + 1 if rows else 0
+        self._row_of: dict[str, int] = {doc_id: row for row, doc_id in rows}
+        self._capacity = max(_INITIAL_CAPACITY, self._rows)
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._alive[list(self._row_of.values())] = True
+        self._columns: dict[str, _Column] = {}
+
+        self._matrix: np.memmap | None = None
+        if self._dim:
+            self._capacity = max(self._capacity, self._file_rows())
+            self._alive = np.resize(self._alive, self._capacity)
+            self._alive[self._rows :] = False
+            self._map()
+
+        logger.debug("vector_store_opened", path=str(path), items=len(self._row_of))
+
+    # ------------------------------------------------------------------
+    # MemoryBackend
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """Store documents; ids that already exist are ignored (as in ChromaDB)."""
+        with self._lock:
+            new = [i for i, doc_id in enumerate(ids) if doc_id not in self._row_of]
+            if len(new) < len(ids):
+                logger.warning("vector_store_duplicate_ids", skipped=len(ids) - len(new))
+            if not new:
+                return
+
+            vectors = np.asarray([embeddings[i] for i in new], dtype=np.float32)
+            if not self._dim:
+                self._initialize_matrix(vectors.shape[1])
+            if vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store ({self._dim})"
+                )
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1.0, norms)
+
+            start = self._rows
+            self._ensure_capacity(start + len(new))
+            assert self._matrix is not None
+            self._matrix[start : start + len(new)] = vectors
+
+            records = [
+                (start + offset, ids[i], documents[i], json.dumps(metadatas[i]))
+                for offset, i in enumerate(new)
+            ]
+            self._db.executemany("INSERT INTO items VALUES (?, ?, ?, ?)", records)
+            self._db.commit()
+
+            for offset, i in enumerate(new):
+                row = start + offset
+                self._row_of[ids[i]] = row
+                for key, column in self._columns.items():
+                    column.codes[row] = column.encode(metadatas[i].get(key))
+            self._alive[start : start + len(new)] = True
+            self._rows = start + len(new)
+
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        where: dict[str, Any] | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Exact top-k cosine search for each query embedding."""
+        include = include or ["documents", "metadatas", "distances"]
+        results: dict[str, Any] = {"ids": [], **{key: [] for key in include}}
+
+        with self._lock:
+            candidates = self._candidate_rows(where)
+            for query in query_embeddings:
+                rows, similarities = self._top_k(query, candidates, n_results)
+                self._append_rows(results, rows, include, nested=True)
+                if "distances" in include:
+                    results["distances"].append((1.0 - similarities).tolist())
+        return results
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: dict[str, Any] | None = None,
+        limit: int | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch documents by id (in the given order) and/or metadata filter."""
+        include = include or ["documents", "metadatas"]
+        results: dict[str, Any] = {"ids": [], **{key: [] for key in include}}
+
+        with self._lock:
+            if ids is not None:
+                rows = np.fromiter(
+                    (self._row_of[doc_id] for doc_id in ids if doc_id in self._row_of),
+                    dtype=np.intp,
+                )
+                if where is not None:
+                    rows = rows[self._where_mask(where)[rows]]
+            else:
+                rows = self._candidate_rows(where)
+            if limit is not None:
+                rows = rows[:limit]
+            self._append_rows(results, rows, include, nested=False)
+        return results
+
+    def count(self) -> int:
+        """Number of stored (non-deleted) documents."""
+        return len(self._row_of)
+
+    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None) -> None:
+        """Tombstone documents matching the ids and/or filter."""
+        with self._lock:
+            rows = self.get(ids=ids, where=where, include=[])["ids"]
+            if not rows:
+                return
+            doc_rows = [self._row_of.pop(doc_id) for doc_id in rows]
+            self._alive[doc_rows] = False
+            self._db.executemany("DELETE FROM items WHERE row = ?", [(row,) for row in doc_rows])
+            self._db.commit()
+
+    def close(self) -> None:
+        """Flush the matrix to disk and close the metadata database."""
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _top_k(
+        self, query: list[float], candidates: np.ndarray, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and cosine similarities of the ``k`` best candidates, best first."""
+        if self._matrix is None or not len(candidates) or k <= 0:
+            return _NO_MATCH, np.empty(0, dtype=np.float32)
+
+        q = np.asarray(query, dtype=np.float32)
+        q /= np.linalg.norm(q) or 1.0
+        scores = self._scores(q, candidates)
+
+        if k < len(scores):
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return candidates[best], scores[best]
+
+    def _scores(self, q: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Dot products of the query with the candidate rows."""
+        assert self._matrix is not None
+        dense = len(candidates) == self._rows and self._rows > 0
+        if self._dtype == np.float32:
+            block = self._matrix[: self._rows] if dense else self._matrix[candidates]
+            return np.asarray(block @ q)
+
+        # float16 has no BLAS path; upcast block by block
+        scores = np.empty(len(candidates), dtype=np.float32)
+        for start in range(0, len(candidates), _SCORE_BLOCK):
+            chunk = candidates[start : start + _SCORE_BLOCK]
+            if dense:
+                block = self._matrix[chunk[0] : chunk[-1] + 1]
+            else:
+                block = self._matrix[chunk]
+            scores[start : start + len(chunk)] = block.astype(np.float32) @ q
+        return scores
+
+    def _candidate_rows(self, where: dict[str, Any] | None) -> np.ndarray:
+        """Live rows satisfying the filter, in insertion order."""
+        mask = self._alive[: self._rows]
+        if where:
+            mask = mask & self._where_mask(where)
+        return np.flatnonzero(mask)
+
+    def _where_mask(self, where: dict[str, Any]) -> np.ndarray:
+        """Evaluate a Chroma-style ``where`` filter to a row mask."""
+        mask = np.ones(self._rows, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._where_mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(self._rows, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._where_mask(clause)
+                mask &= any_mask
+            else:
+                column = self._column(key)
+                operators = condition if isinstance(condition, dict) else {"$eq": condition}
+                for operator, target in operators.items():
+                    if operator not in _COMPARISONS:
+                        raise ValueError(f"Unsupported filter operator '{operator}'")
+                    compare = _COMPARISONS[operator]
+                    mask &= column.mask(self._rows, lambda v, c=compare, t=target: c(v, t))
+        return mask
+
+    def _column(self, key: str) -> _Column:
+        """Load (once) the dictionary-encoded column for a metadata key."""
+        column = self._columns.get(key)
+        if column is None:
+            column = _Column(self._capacity)
+            for row, value in self._db.execute(
+                "SELECT row, json_extract(metadata, ?) FROM items", (f'$."{key}"',)
+            ):
+                column.codes[row] = column.encode(value)
+            # Tombstoned and unused rows decode to None but are masked by _alive
+            self._columns[key] = column
+        return column
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _append_rows(
+        self,
+        results: dict[str, Any],
+        rows: np.ndarray,
+        include: Iterable[str],
+        nested: bool,
+    ) -> None:
+        """Load ids/documents/metadata for rows and add them to a result dict."""
+        row_list = rows.tolist()
+        records: dict[int, tuple[str, str, str]] = {}
+        for start in range(0, len(row_list), 500):
+            chunk = row_list[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row, doc_id, document, metadata in self._db.execute(
+                f"SELECT row, doc_id, document, metadata FROM items WHERE row IN ({placeholders})",
+                chunk,
+            ):
+                records[row] = (doc_id, document, metadata)
+
+        fields: dict[str, list[Any]] = {"ids": [records[row][0] for row in row_list]}
+        if "documents" in include:
+            fields["documents"] = [records[row][1] for row in row_list]
+        if "metadatas" in include:
+            fields["metadatas"] = [json.loads(records[row][2]) for row in row_list]
+        if "embeddings" in include and self._matrix is not None:
+            fields["embeddings"] = np.asarray(self._matrix[rows], dtype=np.float32).tolist()
+
+        for key, values in fields.items():
+            if nested:
+                results[key].append(values)
+            else:
+                results[key].extend(values)
+
+    def _initialize_matrix(self, dim: int) -> None:
+        """Fix the embedding dimension and create the matrix file."""
+        self._dim = dim
+        self._db.executemany(
+            "INSERT OR REPLACE INTO settings VALUES (?, ?)",
+            [("dim", str(dim)), ("dtype", self._dtype.name)],
+        )
+        self._db.commit()
+        self._resize_file(self._capacity)
+        self._map()
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the matrix file (doubling) so it can hold ``rows`` rows."""
+        if rows <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < rows:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        self._resize_file(capacity)
+        self._capacity = capacity
+        self._alive = np.resize(self._alive, capacity)
+        self._alive[self._rows :] = False
+        for column in self._columns.values():
+            column.grow(capacity)
+        self._map()
+
+    def _resize_file(self, capacity: int) -> None:
+        with open(self._matrix_path, "ab") as handle:
+            handle.truncate(capacity * self._dim * self._dtype.itemsize)
+
+    def _file_rows(self) -> int:
+        size = self._matrix_path.stat().st_size if self._matrix_path.exists() else 0
+        return size // (self._dim * self._dtype.itemsize)
+
+    def _map(self) -> None:
+        if not self._matrix_path.exists() or self._file_rows() < self._capacity:
+            self._resize_file(self._capacity)
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=self._dtype, mode="r+", shape=(self._capacity, self._dim)
+        )
@@ -0,0 +1,177 @@
+"""
+Write-behind queue for memory updates.
+
+Storing an exchange embeds it, writes it to the vector store and, every few
+exchanges, runs reflection. None of that needs to finish before the user
+sees a response, so the Narrative Memory System hands writes to a single
+background worker through a bounded queue.
+
+Consistency guarantee: once ``submit`` returns, the write is acknowledged.
+Readers call ``wait_for`` with the same key before querying, so the next
+turn's retrieval always observes every acknowledged write for its session.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+WriteJob = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class WriteBehindStats:
+    """Counters describing write-behind throughput and backpressure."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    backpressure_waits: int = 0
+    backpressure_wait_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue drained by one background worker.
+
+    Jobs run strictly in submission order, so per-session ordering (and the
+    exchange counter that drives reflection) behaves exactly as it would if
+    the writes were awaited inline. When the queue is full, ``submit`` waits
+    for space; those waits are counted as backpressure.
+    """
+
+    def __init__(self, maxsize: int = 100) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of writes waiting to be applied
+        """
+        self._maxsize = maxsize
+        self._queue: asyncio.Queue[tuple[str, WriteJob]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._pending: dict[str, int] = {}
+        self._settled: asyncio.Condition | None = None
+        self._stats = WriteBehindStats()
+
+    def _ensure_worker(self) -> asyncio.Queue[tuple[str, WriteJob]]:
+        """Start the worker on first use, bound to the running event loop."""
+        if self._queue is None or self._settled is None:
+            self._queue = asyncio.Queue(maxsize=self._maxsize)
+            self._settled = asyncio.Condition()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(
+                self._run(self._queue, self._settled),
+                name="memory-write-behind",
+            )
+        return self._queue
+
+    async def submit(self, key: str, job: WriteJob) -> None:
+        """
+        Enqueue a write; returns once the write is acknowledged.
+
+        Args:
+            key: Consistency key (the session identifier) for ``wait_for``
+            job: Zero-argument coroutine function performing the write
+        """
+        queue = self._ensure_worker()
+
+        if queue.full():
+            self._stats.backpressure_waits += 1
+            start = time.perf_counter()
+            await queue.put((key, job))
+            self._stats.backpressure_wait_ms += (time.perf_counter() - start) * 1000
+            logger.warning(
+                "memory_write_backpressure",
+                queue_size=self._maxsize,
+                backpressure_waits=self._stats.backpressure_waits,
+            )
+        else:
+            queue.put_nowait((key, job))
+
+        # Counted only once enqueued, so a put cancelled under backpressure
+        # leaves nothing pending; the worker cannot take the job before this
+        # runs, as put returns without yielding after enqueueing
+        self._pending[key] = self._pending.get(key, 0) + 1
+        self._stats.submitted += 1
+        self._stats.max_queue_depth = max(self._stats.max_queue_depth, queue.qsize())
+
+    async def wait_for(self, key: str | None = None) -> None:
+        """
+        Wait until every acknowledged write for ``key`` has been applied.
+
+        Args:
+            key: Consistency key to wait on, or None to wait for all keys
+        """
+        if self._settled is None:
+            return
+
+        def settled() -> bool:
+            if key is None:
+                return not any(self._pending.values())
+            return self._pending.get(key, 0) == 0
+
+        if settled():
+            return
+        async with self._settled:
+            await self._settled.wait_for(settled)
+
+    async def flush(self) -> None:
+        """Wait until the queue is fully drained."""
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Drain outstanding writes and stop the worker."""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # A later submit (possibly on another event loop) starts afresh
+        self._queue = None
+        self._settled = None
+        logger.info("memory_write_behind_closed", **self.stats().to_dict())
+
+    def stats(self) -> WriteBehindStats:
+        """Get a snapshot of the queue statistics."""
+        snapshot = WriteBehindStats(**self._stats.to_dict())
+        snapshot.queue_depth = self._queue.qsize() if self._queue is not None else 0
+        return snapshot
+
+    async def _run(
+        self,
+        queue: asyncio.Queue[tuple[str, WriteJob]],
+        settled: asyncio.Condition,
+    ) -> None:
+        """Apply queued writes one at a time."""
+        while True:
+            key, job = await queue.get()
+            try:
+                await job()
+                self._stats.completed += 1
+            except Exception as exc:
+                # Memory is non-critical: a failed write must not stop the worker
+                self._stats.failed += 1
+                logger.error("memory_write_failed", key=key, error=str(exc), exc_info=True)
+            finally:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+                queue.task_done()
+                async with settled:
+                    settled.notify_all()
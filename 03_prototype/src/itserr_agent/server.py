@@ -0,0 +1,423 @@
+"""
+HTTP server mode for the ITSERR Agent.
+
+``itserr-agent serve`` runs one ``ITSERRAgent`` behind an aiohttp
+application so many researchers share a single embedding model, memory
+backend and LLM client instead of each running their own process. Sessions
+stay isolated by ``session_id``; turns within a session run in order while
+different sessions proceed concurrently.
+
+Endpoints (JSON unless noted):
+
+- ``POST /chat``: ``{"message", "session_id"?}`` -> tagged response
+- ``POST /chat/stream``: same body; Server-Sent Events carrying the agent's
+  token/sentence/complete stream events
+- ``GET /sessions/{session_id}/history``, ``DELETE /sessions/{session_id}``,
+  ``GET /sessions/{session_id}/summary``
+- ``GET /memory/search?q=...&session_id=...&top_k=...``
+- ``POST /memory/notes``, ``POST /memory/decisions``
+- ``GET /tools``, ``POST /tools/{name}``: ``{"arguments"?, "confirmed"?}``;
+  tools that require confirmation are refused (403) unless
+  ``server_allow_confirmed_tools`` lets clients confirm them
+- ``GET /stats``: stage latencies and agent metrics; ``GET /health``
+
+Chat turns are admitted by a ``TurnQueue``: at most ``server_workers`` run
+at once, up to ``server_max_queued`` wait, and the rest are rejected with
+503 so an overloaded server sheds load instead of building an unbounded
+backlog. On shutdown the server stops accepting connections, gives in-flight
+requests ``server_shutdown_timeout_seconds`` to finish, then closes the
+agent, which flushes queued memory writes and persists memory.
+"""
+
+import asyncio
+import functools
+import json
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+from aiohttp import web
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.timing import TIMINGS
+from itserr_agent.tools.base import ToolResult
+from itserr_agent.tools.registry import ToolRegistry
+
+logger = structlog.get_logger()
+
+_dumps = functools.partial(json.dumps, default=str)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a turn arrives while the wait queue is full."""
+
+
+@dataclass
+class TurnQueueStats:
+    """Admission metrics for the turn queue."""
+
+    active: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    admitted: int = 0
+    rejected: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging or display."""
+        return asdict(self)
+
+
+class TurnQueue:
+    """Bounded concurrency with a bounded wait queue, used as an async context manager."""
+
+    def __init__(self, max_concurrent: int, max_queued: int) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            max_concurrent: Turns processed at once
+            max_queued: Turns allowed to wait for a slot before new ones are rejected
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_queued = max_queued
+        self._stats = TurnQueueStats()
+
+    @property
+    def stats(self) -> TurnQueueStats:
+        """Current admission metrics."""
+        return self._stats
+
+    async def __aenter__(self) -> None:
+        if self._semaphore.locked():
+            if self._stats.queued >= self._max_queued:
+                self._stats.rejected += 1
+                raise QueueFullError("Server is at capacity; retry shortly")
+            self._stats.queued += 1
+            self._stats.peak_queued = max(self._stats.peak_queued, self._stats.queued)
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._stats.queued -= 1
+        else:
+            await self._semaphore.acquire()
+        self._stats.active += 1
+        self._stats.admitted += 1
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._stats.active -= 1
+        self._semaphore.release()
+
+
+AGENT_KEY = web.AppKey("agent", ITSERRAgent)
+TOOLS_KEY = web.AppKey("tools", ToolRegistry)
+QUEUE_KEY = web.AppKey("turn_queue", TurnQueue)
+
+
+def default_tools(config: AgentConfig) -> ToolRegistry:
+    """Tools available when the server is not given a registry (GNORM, if configured)."""
+    registry = ToolRegistry()
+    if config.gnorm_api_url:
+        from itserr_agent.integrations.gnorm import GNORMClient, GNORMTool
+
+        registry.register(GNORMTool(GNORMClient(config)))
+    return registry
+
+
+def create_app(
+    config: AgentConfig | None = None,
+    agent: ITSERRAgent | None = None,
+    tools: ToolRegistry | None = None,
+) -> web.Application:
+    """
+    Build the aiohttp application.
+
+    The agent is created (and warmed up) when the application starts and
+    closed when it shuts down; a caller-provided agent is closed as well.
+
+    Args:
+        config: Agent configuration. If None, loads from environment.
+        agent: Agent to serve instead of creating one from ``config``
+        tools: Tool registry to expose instead of ``default_tools``
+    """
+    config = agent.config if agent is not None else config or AgentConfig()
+    app = web.Application(middlewares=[_error_middleware])
+    app[TOOLS_KEY] = tools if tools is not None else default_tools(config)
+    app[QUEUE_KEY] = TurnQueue(config.server_workers, config.server_max_queued)
+
+    async def lifecycle(app: web.Application) -> AsyncIterator[None]:
+        app[AGENT_KEY] = agent if agent is not None else ITSERRAgent(config)
+        app[AGENT_KEY].warm_up()
+        logger.info("server_started", workers=config.server_workers)
+        yield
+        logger.info("server_stopping")
+        await app[AGENT_KEY].close()
+        await app[TOOLS_KEY].close()
+
+    app.cleanup_ctx.append(lifecycle)
+    app.add_routes(
+        [
+            web.get("/health", health),
+            web.post("/chat", chat),
+            web.post("/chat/stream", chat_stream),
+            web.get("/sessions/{session_id}/history", session_history),
+            web.delete("/sessions/{session_id}", clear_session),
+            web.get("/sessions/{session_id}/summary", session_summary),
+            web.get("/memory/search", memory_search),
+            web.post("/memory/notes", memory_note),
+            web.post("/memory/decisions", memory_decision),
+            web.get("/tools", list_tools),
+            web.post("/tools/{name}", execute_tool),
+            web.get("/stats", stats),
+        ]
+    )
+    return app
+
+
+def run(config: AgentConfig | None = None) -> None:
+    """Serve the agent until interrupted (SIGINT/SIGTERM shut down gracefully)."""
+    config = config or AgentConfig()
+    web.run_app(
+        create_app(config),
+        host=config.server_host,
+        port=config.server_port,
+        shutdown_timeout=config.server_shutdown_timeout_seconds,
+        access_log=None,
+        print=None,
+    )
+
+
+async def health(request: web.Request) -> web.Response:
+    """Liveness check."""
+    return web.json_response({"status": "ok"})
+
+
+async def chat(request: web.Request) -> web.Response:
+    """Answer one message."""
+    body = await _json_body(request)
+    message = _required_str(body, "message")
+    session_id = _session_id(body)
+    async with request.app[QUEUE_KEY]:
+        response = await request.app[AGENT_KEY].process(message, session_id=session_id)
+    return web.json_response(
+        {
+            "session_id": session_id,
+            "response": response.content,
+            "metadata": response.response_metadata,
+        },
+        dumps=_dumps,
+    )
+
+
+async def chat_stream(request: web.Request) -> web.StreamResponse:
+    """Answer one message as Server-Sent Events."""
+    body = await _json_body(request)
+    message = _required_str(body, "message")
+    session_id = _session_id(body)
+    async with request.app[QUEUE_KEY]:
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "X-Session-Id": session_id,
+            }
+        )
+        await response.prepare(request)
+        try:
+            async for event in request.app[AGENT_KEY].astream(message, session_id=session_id):
+                data = json.dumps({"text": event.text, "preview": event.preview})
+                await response.write(f"event: {event.type.value}\ndata: {data}\n\n".encode())
+        except Exception as exc:
+            # Headers are sent; report the failure in-band
+            logger.error("stream_failed", session_id=session_id, error=str(exc))
+            data = json.dumps({"error": f"{type(exc).__name__}: {exc}"})
+            await response.write(f"event: error\ndata: {data}\n\n".encode())
+        await response.write_eof()
+    return response
+
+
+async def session_history(request: web.Request) -> web.Response:
+    """Recent conversation history of a session."""
+    messages = request.app[AGENT_KEY].get_conversation_history(request.match_info["session_id"])
+    return web.json_response(
+        {"messages": [{"role": m.type, "content": m.content} for m in messages]}
+    )
+
+
+async def clear_session(request: web.Request) -> web.Response:
+    """Clear a session's conversation history (memory is preserved)."""
+    request.app[AGENT_KEY].clear_conversation(request.match_info["session_id"])
+    return web.json_response({"cleared": request.match_info["session_id"]})
+
+
+async def session_summary(request: web.Request) -> web.Response:
+    """Summary of a research session."""
+    session_id = request.match_info["session_id"]
+    summary = await request.app[AGENT_KEY].get_session_summary(session_id)
+    if summary is None:
+        raise _error(web.HTTPNotFound, f"Session '{session_id}' not found")
+    return web.json_response({"session_id": session_id, "summary": summary})
+
+
+async def memory_search(request: web.Request) -> web.Response:
+    """Search narrative memory."""
+    query = request.query.get("q", "").strip()
+    if not query:
+        raise _error(web.HTTPBadRequest, "Query parameter 'q' is required")
+    try:
+        top_k = int(request.query["top_k"]) if "top_k" in request.query else None
+    except ValueError:
+        raise _error(web.HTTPBadRequest, "'top_k' must be an integer") from None
+    items = await request.app[AGENT_KEY].search_memory(
+        query, session_id=request.query.get("session_id"), top_k=top_k
+    )
+    return web.json_response({"items": [asdict(item) for item in items]})
+
+
+async def memory_note(request: web.Request) -> web.Response:
+    """Store a research note."""
+    body = await _json_body(request)
+    await request.app[AGENT_KEY].store_research_note(
+        _required_str(body, "content"),
+        source=body.get("source"),
+        session_id=body.get("session_id"),
+    )
+    return web.json_response({"stored": True}, status=201)
+
+
+async def memory_decision(request: web.Request) -> web.Response:
+    """Store a research decision."""
+    body = await _json_body(request)
+    await request.app[AGENT_KEY].store_decision(
+        _required_str(body, "decision"),
+        alternatives=body.get("alternatives"),
+        rationale=body.get("rationale"),
+        session_id=body.get("session_id"),
+    )
+    return web.json_response({"stored": True}, status=201)
+
+
+async def list_tools(request: web.Request) -> web.Response:
+    """Registered tools and their confirmation requirements."""
+    return web.json_response({"tools": request.app[TOOLS_KEY].list_tools()})
+
+
+async def execute_tool(request: web.Request) -> web.Response:
+    """
+    Execute a tool.
+
+    A client-sent ``"confirmed": true`` is only honoured for sensitive tools
+    when the server allows it (``server_allow_confirmed_tools``); otherwise
+    they are refused, since HTTP has no researcher in the loop to confirm.
+    """
+    name = request.match_info["name"]
+    registry = request.app[TOOLS_KEY]
+    tool = registry.get(name)
+    if tool is None:
+        raise _error(web.HTTPNotFound, f"Tool '{name}' not found")
+    body = await _json_body(request)
+    arguments = body.get("arguments") or {}
+    if not isinstance(arguments, dict):
+        raise _error(web.HTTPBadRequest, "'arguments' must be an object")
+    invalid = sorted(key for key in arguments if not key.isidentifier())
+    if invalid:
+        raise _error(web.HTTPBadRequest, f"Invalid argument names: {', '.join(invalid)}")
+    allow_confirmed = request.app[AGENT_KEY].config.server_allow_confirmed_tools
+    if tool.requires_confirmation and not allow_confirmed:
+        raise _error(
+            web.HTTPForbidden,
+            f"Tool '{name}' requires confirmation, which this server does not accept over HTTP",
+        )
+    try:
+        result = await registry.execute(
+            name, confirmed=bool(body.get("confirmed")), arguments=arguments
+        )
+    except ValueError as exc:
+        # The registry refuses unconfirmed sensitive tools
+        raise _error(web.HTTPForbidden, str(exc)) from None
+    return web.json_response(_tool_result(result), dumps=_dumps)
+
+
+async def stats(request: web.Request) -> web.Response:
+    """Stage latency percentiles and agent metrics."""
+    agent = request.app[AGENT_KEY]
+    return web.json_response(
+        {
+            "timings": TIMINGS.summary(),
+            "turn_queue": request.app[QUEUE_KEY].stats.to_dict(),
+            "llm_requests": agent.llm_request_stats,
+            "llm_invocations": agent.llm_invocation_stats,
+            "prompt_cache": agent.prompt_cache_stats,
+            "response_cache": agent.response_cache_stats,
+            "memory_writes": agent.memory_write_stats,
+            "memory_compaction": agent.memory_compaction_stats,
+        }
+    )
+
+
+@web.middleware
+async def _error_middleware(request: web.Request, handler: Any) -> web.StreamResponse:
+    """Turn queue rejections and unexpected errors into JSON responses."""
+    try:
+        return await handler(request)
+    except web.HTTPException:
+        raise
+    except QueueFullError as exc:
+        raise _error(web.HTTPServiceUnavailable, str(exc), headers={"Retry-After": "1"}) from None
+    except Exception as exc:
+        logger.error("request_failed", path=request.path, error=str(exc), exc_info=True)
+        raise _error(web.HTTPInternalServerError, f"{type(exc).__name__}: {exc}") from None
+
+
+def _error(
+    status: type[web.HTTPException], message: str, headers: dict[str, str] | None = None
+) -> web.HTTPException:
+    """An HTTP error with a JSON ``{"error": ...}`` body."""
+    return status(
+        text=json.dumps({"error": message}), content_type="application/json", headers=headers
+    )
+
+
+async def _json_body(request: web.Request) -> dict[str, Any]:
+    """The request body as a JSON object."""
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise _error(web.HTTPBadRequest, "Request body must be JSON") from None
+    if not isinstance(body, dict):
+        raise _error(web.HTTPBadRequest, "Request body must be a JSON object")
+    return body
+
+
+def _required_str(body: dict[str, Any], key: str) -> str:
+    """A required non-empty string field."""
+    value = body.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise _error(web.HTTPBadRequest, f"'{key}' is required")
+    return value
+
+
+def _session_id(body: dict[str, Any]) -> str:
+    """The request's session, or a new one so anonymous requests do not share history."""
+    session_id = body.get("session_id")
+    if session_id is None:
+        return f"http-{uuid.uuid4().hex[:12]}"
+    if not isinstance(session_id, str) or not session_id:
+        raise _error(web.HTTPBadRequest, "'session_id' must be a non-empty string")
+    return session_id
+
+
+def _tool_result(result: ToolResult) -> dict[str, Any]:
+    """A tool result as JSON-ready data."""
+    return {
+        "success": result.success,
+        "data": result.data,
+        "tool_name": result.tool_name,
+        "category": result.category.value,
+        "execution_time_ms": result.execution_time_ms,
+        "error_message": result.error_message,
+        "metadata": result.metadata,
+    }
+
@@ -181,3 +181,10 @@ class BaseTool(ABC):
             return f"Tool {self.name} failed: {result.error_message}"
 
         return f"Tool {self.name} completed successfully."
+
+    async def close(self) -> None:
+        """
+        Release resources held by the tool (e.g. HTTP clients).
+
+        Override in subclasses that hold resources.
+        """
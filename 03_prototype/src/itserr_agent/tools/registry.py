@@ -9,6 +9,7 @@ from typing import Any
 
 import structlog
 
+from itserr_agent.core.timing import span
 from itserr_agent.tools.base import BaseTool, ToolCategory, ToolResult
 
 logger = structlog.get_logger()
@@ -89,6 +90,7 @@ class ToolRegistry:
         self,
         tool_name: str,
         confirmed: bool = False,
+        arguments: dict[str, Any] | None = None,
         **kwargs: Any,
     ) -> ToolResult:
         """
@@ -97,6 +99,8 @@ class ToolRegistry:
         Args:
             tool_name: Name of the tool to execute
             confirmed: Whether the user has confirmed the action
+            arguments: Tool-specific parameters as a mapping (e.g. from a
+                request body), so they cannot collide with this method's own
             **kwargs: Tool-specific parameters
 
         Returns:
@@ -129,7 +133,8 @@ class ToolRegistry:
         start_time = time.perf_counter()
 
         try:
-            result = await tool.execute(**kwargs)
+            with span(f"tool.{tool_name}"):
+                result = await tool.execute(**(arguments or {}), **kwargs)
             result.execution_time_ms = (time.perf_counter() - start_time) * 1000
 
             logger.info(
@@ -173,6 +178,11 @@ class ToolRegistry:
             for tool in self._tools.values()
         ]
 
+    async def close(self) -> None:
+        """Release resources held by every registered tool."""
+        for tool in self._tools.values():
+            await tool.close()
+
     @property
     def tool_count(self) -> int:
         """Get the number of registered tools."""
@@ -6,9 +6,11 @@ from pathlib import Path
 from typing import Any, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 from itserr_agent.core.config import AgentConfig, EmbeddingProvider, LLMProvider
+from itserr_agent.memory.models import EMBEDDING_MODELS
 
 
 @pytest.fixture
@@ -83,18 +85,42 @@ def mock_anthropic() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+def _fake_encode(sentences: str | list[str], **kwargs: Any) -> np.ndarray:
+    """Mimic SentenceTransformer.encode: one 384-dim row per input sentence."""
+    if isinstance(sentences, str):
+        return np.full(384, 0.1, dtype=np.float32)
+    return np.full((len(sentences), 384), 0.1, dtype=np.float32)
+
+
 @pytest.fixture
 def mock_sentence_transformer() -> Generator[MagicMock, None, None]:
     """Mock SentenceTransformer to avoid loading model in tests.
     
-    Note: We patch at the source library level because narrative.py uses
-    lazy imports inside the _create_embeddings() method.
+    Note: We patch at the source library level because memory/models.py uses
+    lazy imports inside load_embedding_model(). Shared models are dropped
+    before and after so no test sees another test's mock.
     """
     with patch("sentence_transformers.SentenceTransformer") as mock:
         mock_instance = MagicMock()
-        mock_instance.encode.return_value = [0.1] * 384
+        mock_instance.encode.side_effect = _fake_encode
         mock.return_value = mock_instance
+        EMBEDDING_MODELS.unload(force=True)
         yield mock
+        EMBEDDING_MODELS.unload(force=True)
+
+
+def _matches(metadata: dict[str, Any], where: dict[str, Any]) -> bool:
+    """Evaluate the subset of Chroma's where syntax the memory system uses."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if metadata.get(key) not in condition["$in"]:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
 
 
 class MockChromaCollection:
@@ -102,6 +128,7 @@ class MockChromaCollection:
 
     def __init__(self) -> None:
         self._documents: list[dict[str, Any]] = []
+        self.metadata: dict[str, Any] = {"hnsw:space": "cosine"}
 
     def add(
         self,
@@ -131,25 +158,62 @@ class MockChromaCollection:
         # Filter by where clause if provided
         filtered = self._documents
         if where:
-            filtered = [
-                d for d in filtered
-                if all(d["metadata"].get(k) == v for k, v in where.items())
-            ]
-
-        # Return up to n_results
-        results = filtered[:n_results]
-
-        return {
+            filtered = [d for d in filtered if _matches(d["metadata"], where)]
+
+        # Return the n_results nearest by cosine distance, as a cosine-space
+        # Chroma collection does (ties keep insertion order)
+        distances = [0.1] * len(filtered)
+        if query_embeddings and filtered:
+            query = np.asarray(query_embeddings[0], dtype=np.float64)
+            rows = np.asarray([d["embedding"] for d in filtered], dtype=np.float64)
+            norms = np.linalg.norm(rows, axis=1) * (np.linalg.norm(query) or 1.0)
+            distances = (1.0 - rows @ query / np.where(norms == 0, 1.0, norms)).tolist()
+        nearest = sorted(range(len(filtered)), key=distances.__getitem__)[:n_results]
+        results = [filtered[i] for i in nearest]
+
+        response: dict[str, Any] = {
             "ids": [[d["id"] for d in results]],
             "documents": [[d["document"] for d in results]],
             "metadatas": [[d["metadata"] for d in results]],
-            "distances": [[0.1] * len(results)],
+            "distances": [[distances[i] for i in nearest]],
+        }
+        if include and "embeddings" in include:
+            response["embeddings"] = [[d["embedding"] for d in results]]
+        return response
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: dict[str, Any] | None = None,
+        limit: int | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch documents by id and/or metadata filter."""
+        filtered = self._documents
+        if ids is not None:
+            wanted = set(ids)
+            filtered = [d for d in filtered if d["id"] in wanted]
+        if where:
+            filtered = [d for d in filtered if _matches(d["metadata"], where)]
+        if limit is not None:
+            filtered = filtered[:limit]
+
+        return {
+            "ids": [d["id"] for d in filtered],
+            "documents": [d["document"] for d in filtered],
+            "metadatas": [d["metadata"] for d in filtered],
+            "embeddings": [d["embedding"] for d in filtered],
         }
 
     def count(self) -> int:
         """Return document count."""
         return len(self._documents)
 
+    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None) -> None:
+        """Remove documents by id."""
+        wanted = set(ids or [])
+        self._documents = [d for d in self._documents if d["id"] not in wanted]
+
 
 @pytest.fixture
 def mock_chromadb() -> Generator[MagicMock, None, None]:
@@ -0,0 +1,174 @@
+"""Tests for batch processing and LLM request shaping."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from itserr_agent.cli import app
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.batch import BatchItem, RequestLimiter, TokenBucket
+from itserr_agent.core.config import AgentConfig
+
+
+class FakeTime:
+    """Clock and sleep that advance together without real waiting."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _slow_llm(delay: float = 0.02) -> tuple[Any, dict[str, int]]:
+    """An ainvoke replacement that records how many calls overlap."""
+    counters = {"active": 0, "peak": 0}
+
+    async def invoke(messages: list[Any]) -> MagicMock:
+        counters["active"] += 1
+        counters["peak"] = max(counters["peak"], counters["active"])
+        await asyncio.sleep(delay)
+        counters["active"] -= 1
+        question = str(messages[-1].content)
+        if question == "fail":
+            raise RuntimeError("provider error")
+        return MagicMock(content=f"[FACTUAL] Answer to {question}.")
+
+    return invoke, counters
+
+
+class TestRequestShaping:
+    """Tests for TokenBucket and RequestLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_requests(self) -> None:
+        """After the burst, each token waits 1/rate seconds."""
+        fake = FakeTime()
+        bucket = TokenBucket(rate=2.0, capacity=1, clock=fake.clock, sleep=fake.sleep)
+
+        waits = [await bucket.acquire() for _ in range(3)]
+
+        assert waits == [0.0, pytest.approx(0.5), pytest.approx(0.5)]
+        assert fake.now == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_limiter_caps_in_flight_requests(self) -> None:
+        """No more than max_concurrent requests run at once."""
+        limiter = RequestLimiter(max_concurrent=3)
+
+        async def request() -> None:
+            async with limiter:
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(10)))
+
+        assert limiter.stats.requests == 10
+        assert limiter.stats.peak_in_flight == 3
+        assert limiter.stats.in_flight == 0
+
+
+class TestProcessMany:
+    """Tests for ITSERRAgent.process_many."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_overlap(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Questions overlap, results keep input order and failures are isolated."""
+        invoke, counters = _slow_llm()
+        mock_anthropic.return_value.ainvoke = invoke
+        agent = ITSERRAgent(test_config)
+        questions = ["q0", "q1", "fail", "q3", "q4", "q5"]
+        seen: list[int] = []
+
+        results = await agent.process_many(
+            questions, concurrency=4, progress=lambda r: seen.append(r.index)
+        )
+
+        assert [r.input for r in results] == questions
+        assert [r.index for r in results] == list(range(6))
+        assert results[0].response == "[FACTUAL] Answer to q0."
+        assert results[2].error == "RuntimeError: provider error"
+        assert all(r.latency_seconds > 0 for r in results)
+        assert sorted(seen) == list(range(6))
+        assert counters["peak"] == 4
+        # Unpinned questions get independent sessions
+        assert len({r.session_id for r in results}) == 6
+        await agent.close()
+
+    @pytest.mark.asyncio
+    async def test_llm_limit_and_shared_sessions(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The LLM limit holds under batch concurrency; a shared session stays ordered."""
+        invoke, counters = _slow_llm()
+        mock_anthropic.return_value.ainvoke = invoke
+        config = test_config.model_copy(update={"llm_max_concurrent_requests": 2})
+        agent = ITSERRAgent(config)
+        items = [BatchItem(f"q{i}") for i in range(6)]
+        items += [BatchItem("first", "shared"), BatchItem("second", "shared")]
+
+        results = await agent.process_many(items, concurrency=8)
+
+        assert counters["peak"] == 2
+        assert agent.llm_request_stats["peak_in_flight"] == 2
+        history = [m.content for m in agent.get_conversation_history("shared")]
+        assert history[0] == "first" and history[2] == "second"
+        assert all(r.ok for r in results)
+        await agent.close()
+
+
+class TestAskBatchCommand:
+    """Tests for `itserr-agent ask --batch`."""
+
+    def test_batch_jsonl_round_trip(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Answers are written in input order with latency, keeping extra fields."""
+        monkeypatch.setenv("ITSERR_MEMORY_PERSIST_PATH", str(test_config.memory_persist_path))
+        invoke, _ = _slow_llm(delay=0)
+        mock_anthropic.return_value.ainvoke = invoke
+        questions = tmp_path / "questions.jsonl"
+        questions.write_text(
+            "\n".join(json.dumps({"id": i, "question": f"q{i}"}) for i in range(4))
+        )
+        answers = tmp_path / "answers.jsonl"
+
+        result = CliRunner().invoke(
+            app, ["ask", "--batch", str(questions), "--output", str(answers), "-c", "2"]
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in answers.read_text().splitlines()]
+        assert [r["id"] for r in records] == [0, 1, 2, 3]
+        assert records[1]["response"] == "[FACTUAL] Answer to q1."
+        assert all(r["error"] is None and r["latency_ms"] >= 0 for r in records)
+        assert "Answered 4 of 4 questions" in result.output
+
+    def test_question_and_batch_are_exclusive(self) -> None:
+        """Exactly one of a question or --batch is required."""
+        result = CliRunner().invoke(app, ["ask"])
+
+        assert result.exit_code == 2
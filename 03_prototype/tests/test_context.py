@@ -0,0 +1,323 @@
+"""Tests for token-budgeted context assembly."""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.context import (
+    CACHE_CONTROL,
+    TRUNCATION_MARKER,
+    ContextAssembler,
+    PromptCacheStats,
+    estimate_tokens,
+)
+from itserr_agent.memory.streams import RetrievedMemory
+
+
+SYSTEM_PROMPT = "You are a research assistant for religious studies."
+MEMORY_TEMPLATE = "RELEVANT CONTEXT:\n{memory_context}"
+
+
+def _memory(text: str, score: float) -> RetrievedMemory:
+    return RetrievedMemory(
+        document=text,
+        stream_type="research",
+        timestamp="2026-01-01T00:00:00+00:00",
+        relevance=score,
+        score=score,
+    )
+
+
+def _history(turns: int, words: int = 20) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i} " + "word " * words))
+        messages.append(AIMessage(content=f"answer {i} " + "word " * words))
+    return messages
+
+
+class TestEstimateTokens:
+    """Tests for the token estimator."""
+
+    def test_plausible_counts(self) -> None:
+        """Words count one token per four characters, punctuation separately."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("What does Gadamer say?") == 6
+        assert estimate_tokens("Religionswissenschaft") > 1
+
+    def test_counts_are_cached(self) -> None:
+        """Repeated texts are served from the cache."""
+        text = "A unique sentence for the estimator cache test."
+        estimate_tokens(text)
+        hits = estimate_tokens.cache_info().hits
+        estimate_tokens(text)
+        assert estimate_tokens.cache_info().hits == hits + 1
+
+
+class TestContextAssembler:
+    """Tests for ContextAssembler."""
+
+    def test_everything_fits_under_generous_budget(self) -> None:
+        """With ample budget, all history and memory is included in order."""
+        assembler = ContextAssembler(budget=10_000, memory_template=MEMORY_TEMPLATE)
+        history = _history(2)
+        items = [_memory("first item", 0.9), _memory("second item", 0.5)]
+
+        context = assembler.assemble(SYSTEM_PROMPT, history, items, "Now?")
+
+        assert isinstance(context.messages[0], SystemMessage)
+        assert context.messages[1:-1] == history
+        memory_block, user_block = context.messages[-1].content
+        assert user_block == {"type": "text", "text": "Now?"}
+        assert "first item" in memory_block["text"]
+        assert "first item" not in str(context.messages[0].content)
+        assert context.usage.memory_items == 2
+        assert context.usage.history_dropped == 0
+        assert context.usage.total <= 10_000
+
+    def test_history_capped_by_message_limit(self) -> None:
+        """Only the latest max_history_messages messages are considered."""
+        assembler = ContextAssembler(budget=10_000, max_history_messages=4)
+        history = _history(5)
+
+        context = assembler.assemble(SYSTEM_PROMPT, history, [], "Now?")
+
+        assert context.messages[1:-1] == history[-4:]
+        assert context.usage.history_dropped == 6
+
+    def test_tight_budget_keeps_newest_turns_and_drops_memory(self) -> None:
+        """System prompt and input always fit; newest history wins over memory."""
+        assembler = ContextAssembler(budget=120, min_truncated_tokens=1000)
+        history = _history(4, words=20)
+        items = [_memory("memory " * 50, 0.9)]
+
+        context = assembler.assemble(SYSTEM_PROMPT, history, items, "Now?")
+        included = context.messages[1:-1]
+
+        assert included == history[-len(included) :]
+        assert 0 < len(included) < len(history)
+        assert isinstance(included[0], HumanMessage)
+        assert context.usage.memory_items == 0
+        assert context.usage.memory_dropped == 1
+        assert context.memory_context is None
+        assert context.usage.total <= 120
+
+    def test_leading_ai_message_dropped(self) -> None:
+        """The included conversation never opens with an assistant turn."""
+        assembler = ContextAssembler(budget=10_000, max_history_messages=3)
+
+        context = assembler.assemble(SYSTEM_PROMPT, _history(2), [], "Now?")
+
+        assert isinstance(context.messages[1], HumanMessage)
+        assert context.usage.history_messages == 2
+
+    def test_memory_truncated_then_dropped_by_score(self) -> None:
+        """The best items fit, the next is truncated and the rest are dropped."""
+        items = [
+            _memory("best " * 20, 0.9),
+            _memory("middle " * 400, 0.6),
+            _memory("worst " * 20, 0.1),
+        ]
+        base = ContextAssembler(budget=10_000).assemble(SYSTEM_PROMPT, [], [], "Now?")
+        assembler = ContextAssembler(
+            budget=base.usage.total + 200,
+            min_truncated_tokens=16,
+            memory_template=MEMORY_TEMPLATE,
+        )
+
+        context = assembler.assemble(SYSTEM_PROMPT, [], items, "Now?")
+        memory = context.messages[-1].content[0]["text"]
+
+        assert "best" in memory
+        assert TRUNCATION_MARKER in memory
+        assert "worst" not in memory
+        assert context.usage.memory_items == 2
+        assert context.usage.memory_dropped == 1
+        assert context.usage.truncated == 1
+        assert context.usage.total <= assembler._budget
+
+    def test_assembly_is_sub_millisecond(self) -> None:
+        """Assembling a typical prompt adds well under a millisecond."""
+        if sys.gettrace() is not None:
+            pytest.skip("timings are not meaningful under a tracer (e.g. coverage)")
+        assembler = ContextAssembler(budget=2000)
+        history = _history(5, words=60)
+        items = [_memory(f"item {i} " + "text " * 80, 1.0 - i / 10) for i in range(5)]
+        assembler.assemble(SYSTEM_PROMPT, history, items, "Now?")
+
+        runs = 200
+        start = time.perf_counter()
+        for _ in range(runs):
+            assembler.assemble(SYSTEM_PROMPT, history, items, "Now?")
+        elapsed = (time.perf_counter() - start) / runs
+
+        assert elapsed < 0.001
+
+
+class TestPromptCaching:
+    """Tests for the cacheable system prompt prefix."""
+
+    def test_prefix_is_stable_across_turns(self) -> None:
+        """Memory follows the history, so each turn's prefix extends the last one's."""
+        assembler = ContextAssembler(
+            budget=10_000, memory_template=MEMORY_TEMPLATE, cache_breakpoint=True
+        )
+        history = _history(1)
+
+        first = assembler.assemble(SYSTEM_PROMPT, history, [_memory("one", 0.8)], "First?")
+        history += [HumanMessage(content="First?"), AIMessage(content="Answer.")]
+        second = assembler.assemble(SYSTEM_PROMPT, history, [_memory("two", 0.8)], "Second?")
+
+        system = {"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}
+        assert first.messages[0].content == second.messages[0].content == [system]
+        # The breakpoint moves to the end of the history
+        assert first.messages[-2].content[0]["cache_control"] == CACHE_CONTROL
+        assert second.messages[-2].content == [
+            {"type": "text", "text": "Answer.", "cache_control": CACHE_CONTROL}
+        ]
+        assert second.messages[1:3] == history[:2]
+        assert second.messages[3] == history[2]
+        # This turn's memory and input come last, unmarked
+        memory_block, user_block = second.messages[-1].content
+        assert memory_block["text"].startswith("RELEVANT CONTEXT:")
+        assert user_block == {"type": "text", "text": "Second?"}
+
+    def test_no_breakpoint_unless_enabled(self) -> None:
+        """Without cache_breakpoint the blocks carry no provider-specific keys."""
+        context = ContextAssembler(budget=10_000).assemble(SYSTEM_PROMPT, [], [], "Now?")
+
+        assert context.messages[0].content == [{"type": "text", "text": SYSTEM_PROMPT}]
+
+    def test_no_breakpoint_below_cacheable_length(self) -> None:
+        """Instructions shorter than the provider minimum are not marked."""
+        assembler = ContextAssembler(
+            budget=10_000,
+            cache_breakpoint=True,
+            cache_min_tokens=estimate_tokens(SYSTEM_PROMPT) + 1,
+        )
+        context = assembler.assemble(SYSTEM_PROMPT, [], [], "Now?")
+
+        assert context.messages[0].content == [{"type": "text", "text": SYSTEM_PROMPT}]
+
+    def test_cache_stats_from_usage_metadata(self) -> None:
+        """Cache reads and writes are summed from response usage metadata."""
+        stats = PromptCacheStats()
+        stats.record(
+            {
+                "input_tokens": 1200,
+                "output_tokens": 50,
+                "total_tokens": 1250,
+                "input_token_details": {"cache_creation": 1000},
+            }
+        )
+        stats.record(
+            {
+                "input_tokens": 1300,
+                "output_tokens": 40,
+                "total_tokens": 1340,
+                "input_token_details": {"cache_read": 1000},
+            }
+        )
+        stats.record(None)
+
+        assert stats.requests == 2
+        assert stats.cache_hits == 1
+        assert stats.cache_creation_tokens == 1000
+        assert stats.to_dict()["hit_rate"] == pytest.approx(1000 / 2500)
+
+
+class TestAgentContextUsage:
+    """Tests for context usage reporting in ITSERRAgent."""
+
+    @pytest.mark.asyncio
+    async def test_response_reports_context_usage(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Each response carries the token usage of its prompt."""
+        agent = ITSERRAgent(test_config)
+        await agent.process("First question", session_id="ctx")
+        response = await agent.process("Second question", session_id="ctx")
+
+        usage = response.response_metadata["context_usage"]
+        assert usage["budget"] == test_config.context_token_budget
+        assert usage["history_messages"] == 2
+        assert 0 < usage["total"] <= usage["budget"]
+        await agent.close()
+
+    @pytest.mark.asyncio
+    async def test_agent_marks_breakpoint_and_tracks_cache_hits(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Anthropic requests carry the breakpoint; reported cache reads are counted."""
+        sent: list = []
+
+        async def invoke(messages: list) -> AIMessage:
+            sent.append(messages)
+            return AIMessage(
+                content="[FACTUAL] Answer.",
+                usage_metadata={
+                    "input_tokens": 900,
+                    "output_tokens": 10,
+                    "total_tokens": 910,
+                    "input_token_details": {"cache_read": 600},
+                },
+            )
+
+        mock_anthropic.return_value.ainvoke = invoke
+        test_config.llm_prompt_cache_min_tokens = 0
+        agent = ITSERRAgent(test_config)
+        await agent.process("Question", session_id="cache")
+
+        assert sent[0][0].content[0]["cache_control"] == CACHE_CONTROL
+        stats = agent.prompt_cache_stats
+        assert stats["cache_read_tokens"] == 600
+        assert stats["cache_hits"] == 1
+        await agent.close()
+
+    @pytest.mark.asyncio
+    async def test_multi_turn_session_marks_history_at_defaults(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Once the history makes the prefix cacheable, its end carries the breakpoint."""
+        sent: list = []
+        answer = "[INTERPRETIVE] " + "Gadamer's fusion of horizons, read closely. " * 60
+
+        async def invoke(messages: list) -> AIMessage:
+            sent.append(messages)
+            return AIMessage(content=answer)
+
+        mock_anthropic.return_value.ainvoke = invoke
+        agent = ITSERRAgent(test_config)
+        for turn in range(4):
+            await agent.process(f"Question {turn}?", session_id="cache")
+
+        def marked(messages: list) -> bool:
+            return any(
+                isinstance(block, dict) and "cache_control" in block
+                for message in messages
+                for block in message.content
+            )
+
+        assert test_config.llm_prompt_cache_min_tokens == 1024
+        assert not marked(sent[0])
+        last = sent[-1]
+        assert last[-2].content[0]["cache_control"] == CACHE_CONTROL
+        assert not marked([last[-1]])
+        await agent.close()
@@ -0,0 +1,182 @@
+"""Tests for the non-blocking, micro-batched embedding service."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from itserr_agent.core.config import AgentConfig, EmbeddingProvider
+from itserr_agent.memory.embedding import EmbeddingService
+from itserr_agent.memory.models import EMBEDDING_MODELS
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+
+def _local_model() -> MagicMock:
+    """A fake SentenceTransformer whose rows encode each text's length."""
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, **kw: np.array(
+        [[float(len(t)), 1.0] for t in texts], dtype=np.float32
+    )
+    return model
+
+
+class TestEmbeddingService:
+    """Tests for EmbeddingService batching behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_coalesced(self, test_config: AgentConfig) -> None:
+        """Requests arriving within the window share one encode call."""
+        test_config.embedding_batch_window_ms = 20
+        model = _local_model()
+        service = EmbeddingService(model, test_config)
+
+        texts = ["a", "bb", "ccc", "dddd"]
+        vectors = await asyncio.gather(*(service.embed(t) for t in texts))
+
+        assert model.encode.call_count == 1
+        assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0]
+        assert service.stats.batches == 1
+        assert service.stats.largest_batch == 4
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_encoded_once(self, test_config: AgentConfig) -> None:
+        """Identical texts within a batch are encoded a single time."""
+        model = _local_model()
+        service = EmbeddingService(model, test_config)
+
+        await asyncio.gather(*(service.embed("session overview") for _ in range(5)))
+
+        assert model.encode.call_args[0][0] == ["session overview"]
+        assert service.stats.requests == 5
+        assert service.stats.texts_encoded == 1
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_flushes_early(self, test_config: AgentConfig) -> None:
+        """A full batch is dispatched without waiting for the window."""
+        test_config.embedding_batch_window_ms = 10_000
+        test_config.embedding_max_batch_size = 2
+        model = _local_model()
+        service = EmbeddingService(model, test_config)
+
+        vectors = await asyncio.wait_for(
+            asyncio.gather(service.embed("x"), service.embed("yy")),
+            timeout=5,
+        )
+
+        assert len(vectors) == 2
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_openai_uses_embed_documents(self, test_config: AgentConfig) -> None:
+        """The OpenAI provider is batched through embed_documents."""
+        test_config.embedding_provider = EmbeddingProvider.OPENAI
+        client = MagicMock()
+        client.embed_documents.side_effect = lambda texts: [[0.5, 0.5] for _ in texts]
+        service = EmbeddingService(client, test_config)
+
+        vectors = await asyncio.gather(service.embed("q1"), service.embed("q2"))
+
+        client.embed_documents.assert_called_once_with(["q1", "q2"])
+        assert vectors == [[0.5, 0.5], [0.5, 0.5]]
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_embed_many_preserves_order(self, test_config: AgentConfig) -> None:
+        """embed_many returns one vector per input, in order."""
+        service = EmbeddingService(_local_model(), test_config)
+
+        vectors = await service.embed_many(["aaa", "b", "cc"])
+
+        assert [v[0] for v in vectors] == [3.0, 1.0, 2.0]
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_encode_error_propagates_to_all_waiters(
+        self, test_config: AgentConfig
+    ) -> None:
+        """A failing batch raises in every request that was part of it."""
+        model = MagicMock()
+        model.encode.side_effect = RuntimeError("model unavailable")
+        service = EmbeddingService(model, test_config)
+
+        results = await asyncio.gather(
+            service.embed("a"), service.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        service.close()
+
+
+class TestEmbeddingModelRegistry:
+    """Tests for the process-wide embedding model registry."""
+
+    @pytest.mark.asyncio
+    async def test_memory_systems_share_one_model(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Several memory systems load the model once; idle models unload explicitly."""
+        memories = [NarrativeMemorySystem(test_config) for _ in range(3)]
+        for memory in memories:
+            memory.warm_up()
+
+        assert mock_sentence_transformer.call_count == 1
+        assert EMBEDDING_MODELS.references(test_config) == 3
+
+        for memory in memories:
+            await memory.close()
+        assert EMBEDDING_MODELS.references(test_config) == 0
+        assert test_config in EMBEDDING_MODELS  # kept loaded for the next agent
+        assert EMBEDDING_MODELS.unload() == 1
+        assert test_config not in EMBEDDING_MODELS
+
+    @pytest.mark.asyncio
+    async def test_close_during_warm_up_releases_model(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A model still loading when the memory system closes is not leaked."""
+        loading = threading.Event()
+        loaded = threading.Event()
+
+        def slow_load(name: str) -> MagicMock:
+            loading.set()
+            loaded.wait(5)
+            return MagicMock()
+
+        mock_sentence_transformer.side_effect = slow_load
+        memory = NarrativeMemorySystem(test_config)
+        warm_up = threading.Thread(target=memory.warm_up)
+        warm_up.start()
+        assert loading.wait(5)
+
+        await memory.close()
+        loaded.set()
+        warm_up.join(5)
+
+        assert EMBEDDING_MODELS.references(test_config) == 0
+
+    def test_concurrent_acquire_loads_once(
+        self, test_config: AgentConfig, mock_sentence_transformer: MagicMock
+    ) -> None:
+        """Threads asking for the same model wait for a single load."""
+        mock_sentence_transformer.side_effect = lambda name: time.sleep(0.05) or MagicMock()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            models = list(pool.map(lambda _: EMBEDDING_MODELS.acquire(test_config), range(4)))
+
+        assert mock_sentence_transformer.call_count == 1
+        assert all(model is models[0] for model in models)
+        for _ in models:
+            EMBEDDING_MODELS.release(test_config, unload=True)
+        assert test_config not in EMBEDDING_MODELS
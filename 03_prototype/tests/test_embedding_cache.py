@@ -0,0 +1,121 @@
+"""Tests for the persistent, content-addressed embedding cache."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.cache import EmbeddingCache
+from itserr_agent.memory.embedding import EmbeddingService
+
+
+class TestEmbeddingCache:
+    """Tests for the two-tier EmbeddingCache."""
+
+    def test_miss_then_memory_hit(self, tmp_path: Path) -> None:
+        """A stored vector is served from memory on the next lookup."""
+        cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2")
+
+        assert cache.get_many(["session overview"]) == {}
+        cache.put_many({"session overview": [0.25, 0.5]})
+
+        assert cache.peek("session overview") == [0.25, 0.5]
+        stats = cache.stats
+        assert stats.misses == 1
+        assert stats.memory_hits == 1
+        assert stats.entries == 1
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        """Vectors written by one instance are read from disk by the next."""
+        cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2")
+        cache.put_many({"Gadamer": [1.0, 2.0, 3.0]})
+        cache.close()
+
+        reopened = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2")
+        assert reopened.peek("Gadamer") is None
+        assert reopened.get_many(["Gadamer"]) == {"Gadamer": [1.0, 2.0, 3.0]}
+        assert reopened.stats.disk_hits == 1
+        assert reopened.stats.entries == 1
+        reopened.close()
+
+    def test_keyed_by_provider_and_model(self, tmp_path: Path) -> None:
+        """A vector from one model is never served for another."""
+        cache = EmbeddingCache(tmp_path, "local", "all-MiniLM-L6-v2")
+        cache.put_many({"text": [1.0]})
+        cache.close()
+
+        other = EmbeddingCache(tmp_path, "openai", "text-embedding-3-small")
+        assert other.get_many(["text"]) == {}
+        assert other.stats.entries == 0
+        other.close()
+
+    def test_memory_tier_is_lru_bounded(self, tmp_path: Path) -> None:
+        """The in-memory front keeps only the most recently used entries."""
+        cache = EmbeddingCache(tmp_path, "local", "m", memory_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        cache.peek("a")
+        cache.put_many({"c": [3.0]})
+
+        assert cache.peek("b") is None
+        assert cache.peek("a") == [1.0]
+        assert cache.peek("c") == [3.0]
+        cache.close()
+
+    def test_disk_tier_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """The disk tier stays within its bound, dropping the oldest entries."""
+        cache = EmbeddingCache(tmp_path, "local", "m", max_entries=10, memory_entries=1)
+        for i in range(25):
+            cache.put_many({f"text-{i}": [float(i)]})
+
+        stats = cache.stats
+        assert stats.entries <= 10
+        assert stats.evictions >= 15
+        assert cache.get_many(["text-24"]) == {"text-24": [24.0]}
+        assert cache.get_many(["text-0"]) == {}
+        cache.close()
+
+
+class TestEmbeddingServiceCaching:
+    """Tests for the cache in front of EmbeddingService."""
+
+    @pytest.mark.asyncio
+    async def test_cached_text_not_re_encoded(
+        self, test_config: AgentConfig, tmp_path: Path
+    ) -> None:
+        """Repeated texts are served from the cache without calling the model."""
+        model = MagicMock()
+        model.encode.side_effect = lambda texts, **kw: np.ones((len(texts), 3))
+        cache = EmbeddingCache(tmp_path, "local", test_config.embedding_model)
+        service = EmbeddingService(model, test_config, cache=cache)
+
+        first = await service.embed("recent conversation exchange")
+        second = await service.embed("recent conversation exchange")
+        await asyncio.gather(*(service.embed("recent conversation exchange") for _ in range(3)))
+
+        assert first == second == [1.0, 1.0, 1.0]
+        assert model.encode.call_count == 1
+        assert cache.stats.hit_rate > 0.5
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_embed_many_encodes_only_misses(
+        self, test_config: AgentConfig, tmp_path: Path
+    ) -> None:
+        """Bulk embedding only sends uncached texts to the model."""
+        model = MagicMock()
+        model.encode.side_effect = lambda texts, **kw: np.array(
+            [[float(len(t))] for t in texts]
+        )
+        cache = EmbeddingCache(tmp_path, "local", test_config.embedding_model)
+        cache.put_many({"known": [99.0]})
+        service = EmbeddingService(model, test_config, cache=cache)
+
+        vectors = await service.embed_many(["known", "new-text"])
+
+        assert vectors == [[99.0], [8.0]]
+        model.encode.assert_called_once_with(["new-text"])
+        service.close()
@@ -116,3 +116,68 @@ class TestEpistemicClassifier:
             confidence_score=0.45,
         )
         assert indicator == IndicatorType.INTERPRETIVE
+
+
+class TestIncrementalTagger:
+    """Tests for sentence-by-sentence tagging of streamed text."""
+
+    @pytest.fixture
+    def classifier(self) -> EpistemicClassifier:
+        """Create a classifier with default config."""
+        return EpistemicClassifier(AgentConfig())
+
+    def test_sentence_emitted_once_complete(self, classifier: EpistemicClassifier) -> None:
+        """A sentence is only tagged after text following its boundary arrives."""
+        tagger = classifier.incremental_tagger()
+
+        assert tagger.feed("Gadamer published Truth and Method in 1960.") == []
+        assert tagger.feed(" ") == []
+        completed = tagger.feed("This")
+
+        assert completed == ["[FACTUAL] Gadamer published Truth and Method in 1960."]
+        assert tagger.pending == "This"
+
+    def test_matches_batch_classification(self, classifier: EpistemicClassifier) -> None:
+        """Streaming token by token should produce the same text as classify_and_tag."""
+        content = (
+            "Gadamer published Truth and Method in 1960. "
+            "This pattern suggests a connection between the two texts. "
+            "This is the correct interpretation of God's will."
+        )
+        tagger = classifier.incremental_tagger()
+        for i in range(0, len(content), 7):
+            tagger.feed(content[i : i + 7])
+        tagger.flush()
+
+        assert tagger.text == classifier.classify_and_tag(content)
+
+    def test_llm_tags_passed_through(self, classifier: EpistemicClassifier) -> None:
+        """Once the LLM tags its own output, the text is preserved verbatim."""
+        content = "[FACTUAL] Already tagged.\n\n[INTERPRETIVE] So is this."
+        tagger = classifier.incremental_tagger()
+        for token in content.split(" "):
+            tagger.feed(token + " ")
+        tagger.flush()
+
+        assert tagger.text.rstrip() == content
+
+    def test_llm_tags_mid_text_keep_earlier_heuristic_tags(
+        self, classifier: EpistemicClassifier
+    ) -> None:
+        """Sentences streamed before the LLM's first tag keep their heuristic tags."""
+        content = "Gadamer published Truth and Method in 1960. [INTERPRETIVE] A reading."
+        tagger = classifier.incremental_tagger()
+        for token in content.split(" "):
+            tagger.feed(token + " ")
+        tagger.flush()
+
+        assert classifier.classify_and_tag(content) == content
+        assert tagger.text.rstrip() == (
+            "[FACTUAL] Gadamer published Truth and Method in 1960. [INTERPRETIVE] A reading."
+        )
+
+    def test_flush_empty_stream(self, classifier: EpistemicClassifier) -> None:
+        """Flushing without any input produces nothing."""
+        tagger = classifier.incremental_tagger()
+        assert tagger.flush() == []
+        assert tagger.text == ""
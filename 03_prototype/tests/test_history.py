@@ -0,0 +1,158 @@
+"""Tests for per-session conversation history and session locking."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.history import SessionHistoryStore
+
+
+class TestSessionHistoryStore:
+    """Tests for SessionHistoryStore."""
+
+    def test_ring_buffer_keeps_latest_messages(self) -> None:
+        """Each session keeps at most max_messages, dropping the oldest."""
+        store = SessionHistoryStore(max_messages=4, max_sessions=10)
+        for i in range(5):
+            store.append("s1", HumanMessage(content=f"q{i}"), AIMessage(content=f"a{i}"))
+
+        assert [m.content for m in store.get("s1")] == ["q3", "a3", "q4", "a4"]
+        assert store.get("s2") == []
+
+    def test_idle_sessions_evicted_lru(self) -> None:
+        """The least recently used session is evicted first."""
+        store = SessionHistoryStore(max_messages=4, max_sessions=2)
+        store.append("a", HumanMessage(content="a"))
+        store.append("b", HumanMessage(content="b"))
+        store.get("a")  # touch: "b" is now least recently used
+        store.append("c", HumanMessage(content="c"))
+
+        assert store.session_count == 2
+        assert store.get("a")[0].content == "a"
+        assert store.get("b") == []
+
+    @pytest.mark.asyncio
+    async def test_session_mid_turn_not_evicted(self) -> None:
+        """A session holding its lock survives eviction pressure."""
+        store = SessionHistoryStore(max_messages=4, max_sessions=1)
+        store.append("busy", HumanMessage(content="keep me"))
+
+        async with store.lock("busy"):
+            store.append("other", HumanMessage(content="x"))
+            assert store.get("busy")[0].content == "keep me"
+
+    @pytest.mark.asyncio
+    async def test_locks_dropped_once_idle(self) -> None:
+        """Locks exist only while in use; a waiting turn keeps its session's lock."""
+        store = SessionHistoryStore(max_messages=4, max_sessions=1)
+        active = peak = 0
+
+        async def turn(session_id: str) -> None:
+            nonlocal active, peak
+            async with store.lock(session_id):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                store.append(session_id, HumanMessage(content="q"))
+                active -= 1
+
+        await asyncio.gather(*(turn("s1") for _ in range(3)))
+        assert peak == 1
+        assert store._locks == {} and store._lock_users == {}
+
+        await asyncio.gather(*(turn(f"other-{i}") for i in range(3)))
+        assert store._locks == {} and store.session_count == 1
+
+    def test_persisted_history_resumes(self, tmp_path: Path) -> None:
+        """With persistence, history survives eviction and restart, trimmed to the limit."""
+        store = SessionHistoryStore(max_messages=3, max_sessions=1, persist_path=tmp_path)
+        for i in range(4):
+            store.append("s1", HumanMessage(content=f"q{i}"))
+        store.append("s2", AIMessage(content="evicts s1"))
+        assert [m.content for m in store.get("s1")] == ["q1", "q2", "q3"]
+        store.close()
+
+        reopened = SessionHistoryStore(max_messages=3, max_sessions=10, persist_path=tmp_path)
+        resumed = reopened.get("s2")
+        assert isinstance(resumed[0], AIMessage) and resumed[0].content == "evicts s1"
+
+        reopened.clear("s1")
+        assert reopened.get("s1") == []
+        reopened.close()
+
+
+class TestAgentSessions:
+    """Tests for session isolation and concurrency in ITSERRAgent."""
+
+    @pytest.mark.asyncio
+    async def test_histories_do_not_interleave(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The prompt for one session never contains another session's turns."""
+        agent = ITSERRAgent(test_config)
+        await agent.process("Question from Alice", session_id="alice")
+        await agent.process("Question from Bob", session_id="bob")
+
+        messages = agent._build_messages("Next", None, session_id="alice")
+        contents = [str(m.content) for m in messages]
+
+        assert "Question from Alice" in contents
+        assert "Question from Bob" not in contents
+        assert len(agent.get_conversation_history("bob")) == 2
+
+        agent.clear_conversation("alice")
+        assert agent.get_conversation_history("alice") == []
+        assert len(agent.get_conversation_history("bob")) == 2
+        await agent.close()
+
+    @pytest.mark.asyncio
+    async def test_sessions_run_in_parallel_but_turns_stay_ordered(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Different sessions overlap; the same session is serialized."""
+        active: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        overall_peak = 0
+
+        async def slow_invoke(messages: list[Any]) -> MagicMock:
+            nonlocal overall_peak
+            content = messages[-1].content
+            question = content if isinstance(content, str) else content[-1]["text"]
+            session = question.split(":")[0]
+            active[session] = active.get(session, 0) + 1
+            peak[session] = max(peak.get(session, 0), active[session])
+            overall_peak = max(overall_peak, sum(active.values()))
+            await asyncio.sleep(0.05)
+            active[session] -= 1
+            return MagicMock(content="[FACTUAL] Answer.")
+
+        mock_anthropic.return_value.ainvoke = slow_invoke
+        agent = ITSERRAgent(test_config)
+
+        await asyncio.gather(
+            *(
+                agent.process(f"{session}: turn {turn}", session_id=session)
+                for session in ("s1", "s2", "s3")
+                for turn in range(2)
+            )
+        )
+
+        assert overall_peak == 3
+        assert all(value == 1 for value in peak.values())
+        history = [m.content for m in agent.get_conversation_history("s1")]
+        assert history[0] == "s1: turn 0" and history[2] == "s1: turn 1"
+        await agent.close()
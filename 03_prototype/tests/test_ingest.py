@@ -0,0 +1,156 @@
+"""Tests for bulk ingestion of research notes and decisions."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from itserr_agent.cli import app
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.ingest import (
+    BulkImportStats,
+    chunked,
+    parse_alternatives,
+    read_records,
+)
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+
+class TestReaders:
+    """Tests for JSONL/CSV record streaming."""
+
+    def test_read_jsonl(self, tmp_path: Path) -> None:
+        """JSONL lines become records; blank lines are ignored."""
+        path = tmp_path / "notes.jsonl"
+        path.write_text('{"content": "A"}\n\n{"content": "B", "source": "Gadamer"}\n')
+
+        assert list(read_records(path)) == [
+            {"content": "A"},
+            {"content": "B", "source": "Gadamer"},
+        ]
+
+    def test_read_csv_drops_empty_cells(self, tmp_path: Path) -> None:
+        """CSV rows become records without empty optional fields."""
+        path = tmp_path / "decisions.csv"
+        path.write_text("decision,rationale,alternatives\nUse OCR,,manual;skip\n")
+
+        assert list(read_records(path)) == [
+            {"decision": "Use OCR", "alternatives": "manual;skip"}
+        ]
+
+    def test_unsupported_format(self, tmp_path: Path) -> None:
+        """Unknown extensions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported import format"):
+            list(read_records(tmp_path / "notes.txt"))
+
+    def test_chunked_and_alternatives(self) -> None:
+        """Chunking is lazy and exact; alternatives accept lists or strings."""
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert parse_alternatives("a; b;") == ["a", "b"]
+        assert parse_alternatives(["a"]) == ["a"]
+        assert parse_alternatives(None) is None
+
+
+class TestBulkStore:
+    """Tests for NarrativeMemorySystem bulk APIs."""
+
+    @pytest.mark.asyncio
+    async def test_research_notes_batched_per_chunk(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Each chunk is embedded and added with a single call."""
+        memory = NarrativeMemorySystem(test_config)
+        memory._collection.add = MagicMock(wraps=memory._collection.add)
+        encoder = mock_sentence_transformer.return_value.encode
+        encoder.reset_mock()
+        updates: list[int] = []
+
+        notes = ({"content": f"Note {i}", "source": "bib"} for i in range(25))
+        stats = await memory.store_research_notes_bulk(
+            notes,
+            session_id="bulk",
+            chunk_size=10,
+            progress=lambda s: updates.append(s.stored),
+        )
+
+        assert stats.stored == 25
+        assert stats.chunks == 3
+        assert memory._collection.add.call_count == 3
+        assert encoder.call_count == 3
+        assert updates == [10, 20, 25]
+        assert stats.items_per_second > 0
+
+        summary = await memory.get_session_summary("bulk")
+        assert summary is not None and "Research notes: 25" in summary
+
+    @pytest.mark.asyncio
+    async def test_decisions_formatted_and_invalid_skipped(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Decision records use the single-item format; empty ones are skipped."""
+        memory = NarrativeMemorySystem(test_config)
+
+        stats = await memory.store_decisions_bulk(
+            [
+                {"decision": "Focus on Gadamer", "rationale": "Core", "alternatives": "Ricoeur"},
+                {"rationale": "No decision text"},
+            ],
+            session_id="bulk-decisions",
+        )
+
+        assert (stats.stored, stats.skipped) == (1, 1)
+        stored = memory._collection.collection._documents[0]
+        assert stored["document"] == (
+            "Decision: Focus on Gadamer\nRationale: Core\nAlternatives considered: Ricoeur"
+        )
+        assert stored["metadata"]["stream_type"] == "decision"
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_abort_import(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A chunk that fails to store is counted and later chunks continue."""
+        memory = NarrativeMemorySystem(test_config)
+        memory._collection.add = MagicMock(side_effect=[RuntimeError("disk full"), None])
+
+        stats = await memory.store_research_notes_bulk(
+            [{"content": f"Note {i}"} for i in range(4)], chunk_size=2
+        )
+
+        assert isinstance(stats, BulkImportStats)
+        assert (stats.stored, stats.failed) == (2, 2)
+
+
+class TestImportCommand:
+    """Tests for the `itserr-agent memory import` command."""
+
+    def test_import_jsonl(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """The command imports every record and reports throughput."""
+        monkeypatch.setenv("ITSERR_MEMORY_PERSIST_PATH", str(test_config.memory_persist_path))
+        path = tmp_path / "notes.jsonl"
+        path.write_text("\n".join(json.dumps({"content": f"Note {i}"}) for i in range(5)))
+
+        result = CliRunner().invoke(app, ["memory", "import", str(path), "--chunk-size", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert "Imported 5 research items" in result.output
+        collection = mock_chromadb.return_value.get_or_create_collection.return_value
+        assert len(collection._documents) == 5
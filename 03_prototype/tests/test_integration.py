@@ -7,6 +7,7 @@ These tests verify that all components work together correctly:
 - Reflection summarization
 """
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
@@ -14,9 +15,11 @@ import pytest
 
 from itserr_agent.core.agent import ITSERRAgent
 from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.streaming import StreamEventType
 from itserr_agent.epistemic.classifier import EpistemicClassifier
 from itserr_agent.epistemic.indicators import IndicatorType
 from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.writer import WriteBehindQueue
 
 
 class TestAgentIntegration:
@@ -140,6 +143,75 @@ class TestAgentIntegration:
         assert mock_anthropic.return_value.ainvoke.call_count == 2
 
 
+class TestStreamingIntegration:
+    """Integration tests for the streaming response mode."""
+
+    @staticmethod
+    def _fake_stream(tokens: list[str]) -> Any:
+        """Build an ``astream`` replacement yielding the given tokens."""
+
+        async def astream(messages: Any) -> Any:
+            for token in tokens:
+                yield MagicMock(content=token)
+
+        return astream
+
+    @pytest.mark.asyncio
+    async def test_astream_yields_tokens_then_sentences(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Tokens arrive first; tagged sentences follow as they complete."""
+        tokens = ["Gadamer published ", "Truth and Method in 1960. ", "This suggests ", "a link."]
+        mock_anthropic.return_value.astream = self._fake_stream(tokens)
+
+        agent = ITSERRAgent(test_config)
+        events = [
+            event
+            async for event in agent.astream(
+                "When did Gadamer publish Truth and Method?",
+                session_id="stream-session",
+            )
+        ]
+
+        assert events[0].type == StreamEventType.TOKEN
+        assert [e.text for e in events if e.type == StreamEventType.TOKEN] == tokens
+        sentences = [e.text for e in events if e.type == StreamEventType.SENTENCE]
+        assert len(sentences) == 2
+        assert sentences[0].startswith("[FACTUAL]")
+        assert events[-1].type == StreamEventType.COMPLETE
+        assert events[-1].text == " ".join(sentences)
+
+    @pytest.mark.asyncio
+    async def test_astream_stores_full_exchange(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The tagged response is stored in memory and history after streaming."""
+        mock_anthropic.return_value.astream = self._fake_stream(
+            ["[FACTUAL] Gadamer was born in 1900. ", "[INTERPRETIVE] He read Heidegger."]
+        )
+
+        agent = ITSERRAgent(test_config)
+        final = None
+        async for event in agent.astream("Tell me about Gadamer", session_id="stream-store"):
+            if event.type == StreamEventType.COMPLETE:
+                final = event.text
+
+        assert final == "[FACTUAL] Gadamer was born in 1900. [INTERPRETIVE] He read Heidegger."
+        assert len(agent.conversation_history) == 2
+        assert agent.conversation_history[-1].content == final
+        await agent.persist()
+        stored = agent._memory._collection.collection._documents
+        assert stored and final in stored[-1]["document"]
+
+
 class TestMemoryIntegration:
     """Integration tests for the NarrativeMemorySystem."""
 
@@ -220,6 +292,118 @@ class TestMemoryIntegration:
         assert context is not None
 
 
+class TestWriteBehindIntegration:
+    """Integration tests for the background memory writer."""
+
+    @pytest.mark.asyncio
+    async def test_process_returns_before_exchange_written(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The response is returned while the exchange is still queued."""
+        agent = ITSERRAgent(test_config)
+        collection = agent._memory._collection
+
+        await agent.process("What is hermeneutics?", session_id="wb-session")
+        assert agent.memory_write_stats["submitted"] == 1
+        assert collection.count() == 0
+
+        await agent.close()
+        assert collection.count() == 1
+        assert agent.memory_write_stats["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_next_turn_sees_acknowledged_exchange(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Retrieval waits for acknowledged writes in the same session."""
+        memory = NarrativeMemorySystem(test_config)
+
+        await memory.submit_exchange(
+            user_input="What is hermeneutics?",
+            agent_response="Hermeneutics is the theory of interpretation.",
+            session_id="wb-read",
+        )
+        context = await memory.retrieve_context("interpretation", session_id="wb-read")
+
+        assert context is not None
+        assert "hermeneutics" in context.lower()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Submitting into a full queue waits and is counted as backpressure."""
+        test_config.memory_write_queue_size = 1
+        memory = NarrativeMemorySystem(test_config)
+
+        for i in range(4):
+            await memory.submit_exchange(f"Q{i}", f"A{i}", session_id="wb-pressure")
+        await memory.flush()
+
+        stats = memory.write_stats
+        assert stats.completed == 4
+        assert stats.backpressure_waits >= 1
+        assert stats.queue_depth == 0
+        stored = memory._collection.collection._documents
+        assert sum(d["metadata"]["stream_type"] == "conversation" for d in stored) == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_submit_leaves_nothing_pending(self) -> None:
+        """A submit cancelled while waiting on a full queue does not block wait_for."""
+        writer = WriteBehindQueue(maxsize=1)
+        release = asyncio.Event()
+        writes: list[str] = []
+
+        def job(name: str) -> Any:
+            async def write() -> None:
+                await release.wait()
+                writes.append(name)
+
+            return write
+
+        await writer.submit("k", job("first"))  # Taken by the worker, which blocks
+        await asyncio.sleep(0)
+        await writer.submit("k", job("second"))  # Fills the queue
+        blocked = asyncio.ensure_future(writer.submit("k", job("third")))
+        await asyncio.sleep(0)
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+
+        release.set()
+        await asyncio.wait_for(writer.wait_for("k"), timeout=5)
+        await asyncio.wait_for(writer.wait_for(), timeout=5)
+        assert writes == ["first", "second"]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_write_behind_disabled_stores_inline(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """With write-behind disabled, submit_exchange writes before returning."""
+        test_config.memory_write_behind = False
+        memory = NarrativeMemorySystem(test_config)
+
+        await memory.submit_exchange("Q", "A", session_id="wb-inline")
+
+        assert memory._collection.count() == 1
+        assert memory.write_stats.submitted == 0
+
+
 class TestReflectionIntegration:
     """Integration tests for the reflection summarization system."""
 
@@ -244,7 +428,7 @@ class TestReflectionIntegration:
             )
 
         # Exchange count should be reset after reflection
-        assert memory._exchange_count == 0
+        assert "reflection-test" not in memory._exchange_counts
 
     @pytest.mark.asyncio
     async def test_session_summary_includes_statistics(
@@ -491,7 +675,7 @@ class TestErrorHandling:
         memory._collection.add = MagicMock(side_effect=Exception("Storage error"))
 
         # Store initial exchange count
-        initial_count = memory._exchange_count
+        initial_count = memory._exchange_counts.get("error-test", 0)
 
         # Should not raise, just log error
         await memory.store_exchange(
@@ -501,4 +685,4 @@ class TestErrorHandling:
         )
 
         # Exchange count should not increment on failure
-        assert memory._exchange_count == initial_count
+        assert memory._exchange_counts.get("error-test", 0) == initial_count
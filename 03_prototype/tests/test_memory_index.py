@@ -0,0 +1,258 @@
+"""Tests for the time-ordered memory index."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.index import MemoryIndex
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+
+class TestMemoryIndex:
+    """Tests for the MemoryIndex sidecar."""
+
+    def test_recent_newest_first_with_limit(self, tmp_path: Path) -> None:
+        """The last N items of a stream are returned newest first."""
+        index = MemoryIndex(tmp_path)
+        for i in range(10):
+            index.record(f"conv_{i}", "s1", "conversation", 1000.0 + i)
+
+        assert index.recent("conversation", session_id="s1", limit=3) == [
+            "conv_9",
+            "conv_8",
+            "conv_7",
+        ]
+        index.close()
+
+    def test_filters_by_session_and_stream(self, tmp_path: Path) -> None:
+        """Other sessions and streams are excluded; None spans all sessions."""
+        index = MemoryIndex(tmp_path)
+        index.record("a", "s1", "conversation", 1.0)
+        index.record("b", "s2", "conversation", 2.0)
+        index.record("c", "s1", "research", 3.0)
+
+        assert index.recent("conversation", session_id="s1") == ["a"]
+        assert index.recent("conversation") == ["b", "a"]
+        assert index.recent("research", session_id="s2") == []
+        index.close()
+
+    def test_rebuild_from_metadata(self, tmp_path: Path) -> None:
+        """The index can be rebuilt from collection metadata, including ISO timestamps."""
+        index = MemoryIndex(tmp_path)
+        index.record("stale", "s1", "conversation", 1.0)
+
+        count = index.rebuild(
+            ["old", "new"],
+            [
+                {"session_id": "s1", "stream_type": "conversation",
+                 "timestamp": "2025-01-01T00:00:00+00:00"},
+                {"session_id": "s1", "stream_type": "conversation",
+                 "timestamp_epoch": 1_800_000_000.0},
+            ],
+        )
+
+        assert count == 2
+        assert index.recent("conversation", session_id="s1") == ["new", "old"]
+        index.close()
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        """Recorded items survive reopening the index."""
+        index = MemoryIndex(tmp_path)
+        index.record("x", "s1", "decision", 5.0)
+        index.close()
+
+        reopened = MemoryIndex(tmp_path)
+        assert reopened.count == 1
+        assert reopened.recent("decision", session_id="s1") == ["x"]
+        reopened.close()
+
+
+class TestSessionStats:
+    """Tests for incrementally maintained session statistics."""
+
+    def test_counts_and_span_per_stream(self, tmp_path: Path) -> None:
+        """Counters and first/last times are tracked per session and stream."""
+        index = MemoryIndex(tmp_path)
+        for i in range(3):
+            index.record(f"c{i}", "s1", "conversation", 10.0 + i)
+        index.record("r0", "s1", "research", 5.0)
+        index.record("other", "s2", "conversation", 1.0)
+
+        stats = index.session_stats("s1")
+
+        assert stats["conversation"].count == 3
+        assert stats["conversation"].first_epoch == 10.0
+        assert stats["conversation"].last_epoch == 12.0
+        assert stats["research"].count == 1
+        assert index.session_stats("missing") == {}
+        index.close()
+
+    def test_duplicate_record_not_double_counted(self, tmp_path: Path) -> None:
+        """Recording the same id twice counts it once."""
+        index = MemoryIndex(tmp_path)
+        index.record("dup", "s1", "decision", 1.0)
+        index.record("dup", "s1", "decision", 1.0)
+
+        assert index.session_stats("s1")["decision"].count == 1
+        index.close()
+
+    def test_rebuild_recomputes_stats(self, tmp_path: Path) -> None:
+        """Rebuilding from metadata replaces the counters."""
+        index = MemoryIndex(tmp_path)
+        index.record("stale", "s1", "conversation", 1.0)
+
+        index.rebuild(
+            ["a", "b"],
+            [
+                {"session_id": "s2", "stream_type": "research", "timestamp_epoch": 2.0},
+                {"session_id": "s2", "stream_type": "research", "timestamp_epoch": 3.0},
+            ],
+        )
+
+        assert index.session_stats("s1") == {}
+        assert index.session_stats("s2")["research"].to_dict() == {
+            "count": 2,
+            "first_epoch": 2.0,
+            "last_epoch": 3.0,
+        }
+        index.close()
+
+
+class TestEviction:
+    """Tests for retention support in the index."""
+
+    def test_eviction_counts_and_remove(self, tmp_path: Path) -> None:
+        """Counts combine age and per-session caps; removal updates statistics."""
+        index = MemoryIndex(tmp_path)
+        for i in range(5):
+            index.record(f"s1_{i}", "s1", "conversation", 100.0 + i)
+        index.record("s2_0", "s2", "conversation", 1.0)
+
+        assert index.eviction_counts("conversation", keep_per_session=3) == {"s1": 2}
+        assert index.eviction_counts("conversation", before_epoch=103.0, keep_per_session=3) == {
+            "s1": 3,
+            "s2": 1,
+        }
+        assert index.oldest("conversation", "s1", limit=2) == ["s1_0", "s1_1"]
+
+        assert index.remove_many(["s1_0", "s1_1", "missing"]) == 2
+        stats = index.session_stats("s1")["conversation"]
+        assert (stats.count, stats.first_epoch) == (3, 102.0)
+        index.remove_many(["s2_0"])
+        assert index.session_stats("s2") == {}
+        index.close()
+
+
+class TestReflectionTree:
+    """Tests for the reflection tree table."""
+
+    def test_roots_children_and_rebuild(self, tmp_path: Path) -> None:
+        """Nodes link to the reflection naming them; the tree rebuilds from metadata."""
+        ids = ["c1", "c2", "r1", "x"]
+        metadatas = [
+            {"stream_type": "conversation", "session_id": "s1", "timestamp_epoch": 1.0},
+            {"stream_type": "conversation", "session_id": "s1", "timestamp_epoch": 2.0},
+            {"stream_type": "reflection", "session_id": "s1", "timestamp_epoch": 3.0,
+             "reflection_level": 1, "child_ids": "c1"},
+            {"stream_type": "reflection", "session_id": "__researcher__",
+             "timestamp_epoch": 4.0, "reflection_level": 2, "child_ids": "r1"},
+        ]
+        index = MemoryIndex(tmp_path)
+        index.rebuild(ids, metadatas)
+
+        assert index.tree_roots() == ["x", "c2"]
+        # A session's nodes under a cross-session reflection are its roots
+        assert index.tree_roots("s1") == ["r1", "c2"]
+        assert index.tree_children(["r1"]) == ["c1"]
+        assert index.unsummarized(0, "s1", limit=5) == ["c2"]
+
+        index.remove_many(["r1"])
+        assert sorted(index.tree_roots("s1")) == ["c1", "c2"]
+        index.close()
+
+
+class TestExchangeRetrieval:
+    """Tests for index-backed exchange retrieval."""
+
+    @pytest.mark.asyncio
+    async def test_returns_oldest_unsummarized_exchanges_in_order(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A session's oldest unsummarized exchanges are returned in order, without a query."""
+        test_config.reflection_trigger_count = 100
+        memory = NarrativeMemorySystem(test_config)
+        for i in range(6):
+            await memory.store_exchange(f"Question {i}?", f"Answer {i}.", "recent")
+        await memory.store_exchange("Elsewhere?", "Other.", "other-session")
+
+        memory._collection.query = MagicMock(side_effect=AssertionError("no query"))
+        exchanges = await memory._retrieve_unsummarized_exchanges(session_id="recent", limit=3)
+
+        assert [e["content"].split("\n")[0] for e in exchanges] == [
+            "User: Question 0?",
+            "User: Question 1?",
+            "User: Question 2?",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_for_existing_collection(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A collection without an index file gets one on startup."""
+        memory = NarrativeMemorySystem(test_config)
+        await memory.store_exchange("Q?", "A.", "legacy")
+        collection = memory._collection.collection
+        await memory.close()
+        (test_config.memory_persist_path / "memory_index.sqlite3").unlink()
+
+        mock_chromadb.return_value.get_or_create_collection.return_value = collection
+        reopened = NarrativeMemorySystem(test_config)
+
+        exchanges = await reopened._retrieve_unsummarized_exchanges(session_id="legacy", limit=10)
+        assert len(exchanges) == 1
+
+    @pytest.mark.asyncio
+    async def test_session_summary_uses_latest_reflection(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The most recent reflection, not the most similar, is summarized."""
+        memory = NarrativeMemorySystem(test_config)
+        await memory._store_reflection("## Reflection\n\nFirst.", session_id="refl")
+        await memory._store_reflection("## Reflection\n\nSecond.", session_id="refl")
+
+        summary = await memory.get_session_summary("refl")
+
+        assert summary is not None
+        assert "Second." in summary
+        assert "First." not in summary
+
+    @pytest.mark.asyncio
+    async def test_session_summary_counts_beyond_fifty_items(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Statistics are exact for large sessions and need no vector query."""
+        memory = NarrativeMemorySystem(test_config)
+        for i in range(60):
+            await memory.store_research_note(f"Note {i}", session_id="large")
+
+        memory._collection.query = MagicMock(side_effect=AssertionError("no query"))
+        summary = await memory.get_session_summary("large")
+
+        assert summary is not None
+        assert "Research notes: 60" in summary
+        assert "**Total items:** 60" in summary
+        assert "First activity:" in summary
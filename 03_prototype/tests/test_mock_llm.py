@@ -0,0 +1,87 @@
+"""Tests for the offline mock LLM provider."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig, LLMProvider
+from itserr_agent.core.mock_llm import MockChatModel, MockOverloadedError
+from itserr_agent.core.resilience import is_retryable
+from itserr_agent.core.streaming import StreamEventType
+
+MESSAGES = [SystemMessage(content="You are a research assistant."), HumanMessage(content="Why?")]
+
+
+class TestMockChatModel:
+    """Tests for MockChatModel."""
+
+    @pytest.mark.asyncio
+    async def test_streams_configured_tokens_with_usage(self) -> None:
+        """Streaming yields one chunk per output token; usage arrives on the last."""
+        model = MockChatModel(latency_seconds=0, tokens_per_second=0, output_tokens=20)
+
+        # LangChain may close the stream with an empty chunk
+        chunks = [chunk async for chunk in model.astream(MESSAGES) if chunk.content]
+        response = await model.ainvoke(MESSAGES)
+
+        assert len(chunks) == 20
+        assert "".join(str(c.content) for c in chunks) == response.content
+        assert str(response.content).startswith("[INTERPRETIVE] Mock answer to: Why?")
+        assert chunks[-1].usage_metadata["output_tokens"] == 20
+        assert response.usage_metadata["input_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_latency_follows_configuration(self) -> None:
+        """A request takes the time to first token plus the generation time."""
+        model = MockChatModel(
+            latency_seconds=0.02, latency_sigma=0, tokens_per_second=1000, output_tokens=30
+        )
+
+        start = time.perf_counter()
+        await model.ainvoke(MESSAGES)
+
+        assert time.perf_counter() - start >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_error_rate_raises_retryable_overload(self) -> None:
+        """Simulated failures look like a provider 529."""
+        model = MockChatModel(latency_seconds=0, tokens_per_second=0, error_rate=1.0)
+
+        with pytest.raises(MockOverloadedError) as excinfo:
+            await model.ainvoke(MESSAGES)
+        assert is_retryable(excinfo.value)
+
+
+class TestMockProvider:
+    """Tests for ITSERRAgent with LLMProvider.MOCK."""
+
+    @pytest.mark.asyncio
+    async def test_full_turn_without_api_key(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The mock provider needs no key and runs the whole process/astream path."""
+        config = test_config.model_copy(
+            update={
+                "llm_provider": LLMProvider.MOCK,
+                "anthropic_api_key": None,
+                "mock_llm_latency_seconds": 0.0,
+                "mock_llm_tokens_per_second": 0.0,
+                "mock_llm_output_tokens": 12,
+            }
+        )
+        agent = ITSERRAgent(config)
+
+        response = await agent.process("What is hermeneutics?", session_id="mock")
+        events = [event async for event in agent.astream("Tell me more.", session_id="mock")]
+
+        assert "Mock answer to: What is hermeneutics?" in str(response.content)
+        assert sum(e.type is StreamEventType.TOKEN for e in events) == 12
+        assert events[-1].type is StreamEventType.COMPLETE
+        assert agent.prompt_cache_stats["requests"] == 2
+        await agent.close()
@@ -0,0 +1,285 @@
+"""Tests for recency-weighted hybrid re-ranking of memory candidates."""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.backend import ChromaBackend
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.ranking import (
+    STREAM_WEIGHTS,
+    hybrid_scores,
+    metadata_epoch,
+    mmr_indices,
+    rerank,
+    top_k_indices,
+)
+
+NOW = 1_750_000_000.0
+HOUR = 3600.0
+
+
+class TestHybridScores:
+    """Tests for the vectorized scoring function."""
+
+    def test_recent_conversation_beats_stale_one(self) -> None:
+        """With equal similarity, the newer conversation item ranks higher."""
+        scores = hybrid_scores(
+            similarities=np.array([0.8, 0.8]),
+            epochs=np.array([NOW - 72 * HOUR, NOW - HOUR]),
+            stream_types=["conversation", "conversation"],
+            now=NOW,
+        )
+        assert scores[1] > scores[0]
+
+    def test_research_relevance_outlasts_conversation_recency(self) -> None:
+        """An old but highly relevant research note beats a fresh weak exchange."""
+        scores = hybrid_scores(
+            similarities=np.array([0.9, 0.3]),
+            epochs=np.array([NOW - 14 * 24 * HOUR, NOW]),
+            stream_types=["research", "conversation"],
+            now=NOW,
+        )
+        assert scores[0] > scores[1]
+
+    def test_decisions_decay_slowly(self) -> None:
+        """A month-old decision keeps nearly all of its recency score."""
+        old = hybrid_scores(
+            np.array([0.5]), np.array([NOW - 30 * 24 * HOUR]), ["decision"], NOW
+        )
+        fresh = hybrid_scores(np.array([0.5]), np.array([NOW]), ["decision"], NOW)
+        weights = STREAM_WEIGHTS["decision"]
+        assert fresh[0] - old[0] < 0.1 * weights.recency
+
+    def test_unknown_stream_uses_default_weights(self) -> None:
+        """Unrecognized stream types are still scored."""
+        scores = hybrid_scores(np.array([0.5]), np.array([NOW]), ["custom"], NOW)
+        assert 0.0 < scores[0] <= 1.0
+
+
+class TestRerank:
+    """Tests for candidate re-ranking."""
+
+    def test_returns_top_k_best_first(self) -> None:
+        """Re-ranking keeps k candidates ordered by combined score."""
+        metadatas = [
+            {"stream_type": "conversation", "timestamp_epoch": NOW - 500 * HOUR},
+            {"stream_type": "conversation", "timestamp_epoch": NOW},
+            {"stream_type": "research", "timestamp_epoch": NOW - HOUR},
+        ]
+        order, scores = rerank([0.8, 0.8, 0.1], metadatas, k=2, now=NOW)
+
+        # The relevant research note wins; the fresh exchange beats the stale one
+        assert order.tolist() == [2, 1]
+        assert scores[0] >= scores[1]
+
+    def test_legacy_iso_timestamps_supported(self) -> None:
+        """Items without timestamp_epoch fall back to their ISO timestamp."""
+        assert metadata_epoch({"timestamp": "2025-01-15T10:30:00+00:00"}) == pytest.approx(
+            1736937000.0
+        )
+        assert metadata_epoch({"timestamp": "2025-01-15T10:30:00"}) == pytest.approx(
+            1736937000.0
+        )
+        assert metadata_epoch({}) == 0.0
+
+    def test_empty_candidates(self) -> None:
+        """No candidates yields no selection."""
+        order, scores = rerank([], [], k=5, now=NOW)
+        assert len(order) == 0 and len(scores) == 0
+
+    def test_top_k_indices_matches_full_sort(self) -> None:
+        """Partial selection agrees with a full descending sort."""
+        scores = np.random.default_rng(0).random(200)
+        assert top_k_indices(scores, 5).tolist() == np.argsort(-scores)[:5].tolist()
+
+    def test_scoring_few_hundred_candidates_is_sub_millisecond(self) -> None:
+        """Re-ranking 300 candidates adds well under a millisecond."""
+        if sys.gettrace() is not None:
+            pytest.skip("timings are not meaningful under a tracer (e.g. coverage)")
+        rng = np.random.default_rng(1)
+        streams = ["conversation", "research", "decision", "reflection"]
+        metadatas = [
+            {"stream_type": streams[i % 4], "timestamp_epoch": NOW - float(i) * HOUR}
+            for i in range(300)
+        ]
+        distances = rng.random(300).tolist()
+
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            rerank(distances, metadatas, k=5, now=NOW)
+            timings.append(time.perf_counter() - start)
+
+        assert min(timings) < 0.001
+
+
+def _unit_vectors_at(cosines: list[float], dim: int = 16) -> tuple[list[float], np.ndarray]:
+    """A unit query and unit rows whose cosine with it is exactly ``cosines``."""
+    basis = np.linalg.qr(np.random.default_rng(4).normal(size=(dim, dim)))[0]
+    query, other = basis[0], basis[1]
+    cos = np.asarray(cosines)[:, None]
+    rows = cos * query + np.sqrt(1.0 - cos**2) * other
+    return query.tolist(), rows
+
+
+class TestRerankWithChromaDistances:
+    """Tests feeding distances from a real ChromaDB collection into rerank."""
+
+    @pytest.fixture(autouse=True)
+    def _require_chromadb(self) -> None:
+        pytest.importorskip("chromadb")
+
+    def _add(self, backend: ChromaBackend, rows: np.ndarray) -> None:
+        backend.add(
+            ids=[f"doc_{i}" for i in range(len(rows))],
+            embeddings=rows.tolist(),
+            documents=[f"Document {i}" for i in range(len(rows))],
+            metadatas=[
+                # The less similar item is the more recent one
+                {"stream_type": "research", "timestamp_epoch": NOW - (len(rows) - i) * HOUR}
+                for i in range(len(rows))
+            ],
+        )
+
+    def _check(self, backend: ChromaBackend, query: list[float], cosines: list[float]) -> None:
+        results = backend.query(query_embeddings=[query], n_results=len(cosines))
+        by_id = dict(zip(results["ids"][0], results["distances"][0]))
+        expected = {f"doc_{i}": 1.0 - cos for i, cos in enumerate(cosines)}
+        assert by_id == pytest.approx(expected, abs=1e-4)
+
+        order, scores = rerank(results["distances"][0], results["metadatas"][0], k=2, now=NOW)
+        ranked = [results["ids"][0][index] for index in order.tolist()]
+        assert ranked == ["doc_0", "doc_1"]
+        assert scores[0] > scores[1]
+
+    def test_distances_are_cosine(self, tmp_path: Path) -> None:
+        """Similarity below 0.5 still separates candidates after re-ranking."""
+        cosines = [0.45, 0.15]
+        query, rows = _unit_vectors_at(cosines)
+        backend = ChromaBackend(tmp_path, "ranking_test")
+        self._add(backend, rows)
+        self._check(backend, query, cosines)
+
+    def test_legacy_l2_collection_rescored(self, tmp_path: Path) -> None:
+        """Collections created with Chroma's default L2 space report cosine distances."""
+        import chromadb
+        from chromadb.config import Settings
+
+        client = chromadb.PersistentClient(
+            path=str(tmp_path), settings=Settings(anonymized_telemetry=False)
+        )
+        client.get_or_create_collection(name="legacy_memory", metadata={"description": "old"})
+        cosines = [0.45, 0.15]
+        query, rows = _unit_vectors_at(cosines)
+        backend = ChromaBackend(tmp_path, "legacy_memory")
+        self._add(backend, rows * 3.0)  # Unnormalized rows: L2 cannot be mapped back
+        self._check(backend, query, cosines)
+        results = backend.query(query_embeddings=[query], include=["distances"])
+        assert set(results) >= {"ids", "distances"} and "embeddings" not in results
+
+
+class TestMaximalMarginalRelevance:
+    """Tests for diversified selection of the final k candidates."""
+
+    def test_near_duplicates_give_way_to_other_topics(self) -> None:
+        """A duplicate of the best item is skipped in favour of a new topic."""
+        scores = np.array([0.9, 0.89, 0.5])
+        embeddings = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+
+        assert mmr_indices(scores, embeddings, k=2, diversity_lambda=0.7).tolist() == [0, 2]
+        assert mmr_indices(scores, embeddings, k=2, diversity_lambda=1.0).tolist() == [0, 1]
+
+    def test_lambda_one_matches_plain_top_k(self) -> None:
+        """Without a diversity weight, rerank keeps the plain top-k order."""
+        rng = np.random.default_rng(2)
+        metadatas = [{"stream_type": "research", "timestamp_epoch": NOW}] * 50
+        distances = rng.random(50).tolist()
+        embeddings = rng.random((50, 8))
+
+        plain, _ = rerank(distances, metadatas, k=10, now=NOW)
+        same, _ = rerank(
+            distances, metadatas, k=10, now=NOW, embeddings=embeddings, diversity_lambda=1.0
+        )
+        assert same.tolist() == plain.tolist()
+
+    def test_selecting_twenty_of_eighty_is_fast(self) -> None:
+        """MMR over an over-fetched candidate set stays within a few milliseconds."""
+        if sys.gettrace() is not None:
+            pytest.skip("timings are not meaningful under a tracer (e.g. coverage)")
+        rng = np.random.default_rng(3)
+        scores = rng.random(80)
+        embeddings = rng.random((80, 384)).astype(np.float32)
+
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            order = mmr_indices(scores, embeddings, k=20, diversity_lambda=0.7)
+            timings.append(time.perf_counter() - start)
+
+        assert len(set(order.tolist())) == 20
+        assert min(timings) < 0.003
+
+
+class TestRetrieveContextReranking:
+    """Tests for re-ranking inside NarrativeMemorySystem.retrieve_context."""
+
+    @pytest.mark.asyncio
+    async def test_overfetches_candidates(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The vector store is asked for overfetch_factor x top_k candidates."""
+        test_config.memory_overfetch_factor = 4
+        memory = NarrativeMemorySystem(test_config)
+        memory._collection.query = MagicMock(wraps=memory._collection.query)
+
+        await memory.store_research_note("Note on Gadamer", session_id="rr")
+        await memory.retrieve_context("Gadamer", session_id="rr", top_k=2)
+
+        assert memory._collection.query.call_args.kwargs["n_results"] == 8
+
+    @pytest.mark.asyncio
+    async def test_stored_items_carry_epoch_timestamp(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Every stored item records a numeric creation time for ranking."""
+        memory = NarrativeMemorySystem(test_config)
+
+        await memory.store_exchange("Q?", "A.", session_id="epoch")
+        await memory.store_research_note("Note", session_id="epoch")
+        await memory.store_decision("Decision", session_id="epoch")
+
+        for stored in memory._collection.collection._documents:
+            assert isinstance(stored["metadata"]["timestamp_epoch"], float)
+
+    @pytest.mark.asyncio
+    async def test_embeddings_fetched_only_when_diversifying(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Candidate embeddings are requested only while MMR is enabled."""
+        memory = NarrativeMemorySystem(test_config)
+        memory._collection.query = MagicMock(wraps=memory._collection.query)
+        await memory.store_research_note("Note on Gadamer", session_id="mmr")
+        await memory.store_research_note("Another note on Gadamer", session_id="mmr")
+
+        items = await memory.retrieve_items("Gadamer", session_id="mmr", top_k=2)
+        assert len(items) == 2
+        assert "embeddings" in memory._collection.query.call_args.kwargs["include"]
+
+        test_config.memory_mmr_lambda = 1.0
+        await memory.retrieve_items("Gadamer", session_id="mmr", top_k=2)
+        assert "embeddings" not in memory._collection.query.call_args.kwargs["include"]
@@ -7,6 +7,7 @@ while preserving the essential narrative of the research journey.
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 from itserr_agent.core.config import AgentConfig
@@ -17,13 +18,14 @@ class TestReflectionSummarization:
     """Tests for the reflection summarization mechanism."""
 
     @pytest.mark.asyncio
-    async def test_retrieve_recent_exchanges(
+    async def test_retrieve_unsummarized_exchanges(
         self,
         test_config: AgentConfig,
         mock_chromadb: MagicMock,
         mock_sentence_transformer: MagicMock,
     ) -> None:
-        """Test retrieval of recent exchanges for reflection."""
+        """Test retrieval of the oldest unsummarized exchanges for reflection."""
+        test_config.reflection_trigger_count = 100
         memory = NarrativeMemorySystem(test_config)
 
         # Store some exchanges
@@ -34,14 +36,16 @@ class TestReflectionSummarization:
                 session_id="test-session",
             )
 
-        # Retrieve recent exchanges
-        exchanges = await memory._retrieve_recent_exchanges(
+        exchanges = await memory._retrieve_unsummarized_exchanges(
             session_id="test-session",
             limit=3,
         )
 
-        # Should retrieve exchanges (mocked data)
-        assert isinstance(exchanges, list)
+        assert [e["content"].split("\n")[0] for e in exchanges] == [
+            "User: Question 0?",
+            "User: Question 1?",
+            "User: Question 2?",
+        ]
 
     @pytest.mark.asyncio
     async def test_generate_reflection_summary_with_questions(
@@ -108,7 +112,7 @@ class TestReflectionSummarization:
 
         # Verify document was added to collection
         # Access the collection directly from the memory system
-        collection = memory._collection
+        collection = memory._collection.collection
         assert hasattr(collection, "_documents") and len(collection._documents) > 0
 
         # Verify metadata includes reflection flag
@@ -129,13 +133,13 @@ class TestReflectionSummarization:
         memory = NarrativeMemorySystem(test_config)
 
         # Manually set exchange count
-        memory._exchange_count = 5
+        memory._exchange_counts["test"] = 5
 
         # Trigger reflection
         await memory._trigger_reflection(session_id="test")
 
         # Counter should be reset
-        assert memory._exchange_count == 0
+        assert "test" not in memory._exchange_counts
 
     @pytest.mark.asyncio
     async def test_reflection_triggered_automatically(
@@ -150,11 +154,11 @@ class TestReflectionSummarization:
 
         # Store exchanges to reach threshold
         await memory.store_exchange("Q1?", "A1.", "test")
-        assert memory._exchange_count == 1
+        assert memory._exchange_counts["test"] == 1
 
         await memory.store_exchange("Q2?", "A2.", "test")
         # After reaching threshold, reflection should trigger and reset counter
-        assert memory._exchange_count == 0
+        assert "test" not in memory._exchange_counts
 
 
 class TestSessionSummary:
@@ -323,8 +327,11 @@ class TestReflectionIntegrationWithAgent:
         await agent.process("First question?", session_id="agent-reflection")
         await agent.process("Second question?", session_id="agent-reflection")
 
+        # Exchanges are written behind the response; flush before inspecting
+        await agent.persist()
+
         # Reflection should have been triggered (counter reset)
-        assert agent._memory._exchange_count == 0
+        assert "agent-reflection" not in agent._memory._exchange_counts
 
     @pytest.mark.asyncio
     async def test_reflection_content_retrievable(
@@ -352,3 +359,120 @@ class TestReflectionIntegrationWithAgent:
         # Context retrieval should work - verify it returns expected type
         # With mocked ChromaDB, context may be None or a string
         assert retrieved_context is None or isinstance(retrieved_context, str)
+
+
+def _topic_encode(sentences: str | list[str], **kwargs: object) -> np.ndarray:
+    """Embed texts by topic: Gadamer, Ricoeur or neither (checked in that order)."""
+
+    def one(text: str) -> np.ndarray:
+        vector = np.zeros(3, dtype=np.float32)
+        vector[0 if "Gadamer" in text else 1 if "Ricoeur" in text else 2] = 1.0
+        return vector
+
+    if isinstance(sentences, str):
+        return one(sentences)
+    return np.stack([one(text) for text in sentences])
+
+
+class TestReflectionTree:
+    """Tests for hierarchical reflections and tree-descending retrieval."""
+
+    @pytest.mark.asyncio
+    async def test_rolls_up_and_descends_best_branch(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Reflections roll up to one root; retrieval expands only the matching branch."""
+        mock_sentence_transformer.return_value.encode.side_effect = _topic_encode
+        config = test_config.model_copy(
+            update={
+                "memory_write_behind": False,
+                "reflection_trigger_count": 2,
+                "reflection_tree_fanout": 2,
+                "reflection_tree_beam": 1,
+                "embedding_cache_enabled": False,
+            }
+        )
+        memory = NarrativeMemorySystem(config)
+        for thinker in ("Gadamer", "Gadamer", "Ricoeur", "Ricoeur"):
+            for aspect in ("horizon", "tradition"):
+                await memory.store_exchange(
+                    f"What did {thinker} say about {aspect}?", f"{thinker} on {aspect}.", "s1"
+                )
+
+        assert memory._index is not None
+        roots = memory._index.tree_roots("s1")
+        assert len(roots) == 1
+        (root_doc, root_meta), = memory._get_by_ids(roots)
+        assert root_meta["reflection_level"] == 3
+        assert root_doc.startswith("## Reflection Summary (level 3)")
+
+        documents, _, _, _ = memory._descend_tree(
+            _topic_encode("Ricoeur").tolist(), roots, "s1"
+        )
+        # Root, its two children, the Ricoeur pair of reflections, one of their exchange pairs
+        assert len(documents) == 7
+        assert not any(doc.startswith("User: What did Gadamer") for doc in documents)
+
+        items = await memory.retrieve_items("Ricoeur", session_id="s1")
+        assert items and all("Ricoeur" in item.document for item in items)
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_interleaved_sessions_summarize_each_exchange_once(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Each session reflects over its own unsummarized exchanges, once each."""
+        config = test_config.model_copy(
+            update={"memory_write_behind": False, "reflection_trigger_count": 4}
+        )
+        memory = NarrativeMemorySystem(config)
+        for i in range(6):
+            for session in ("A", "B"):
+                await memory.store_exchange(f"Q{i} in {session}?", f"A{i}.", session)
+
+        assert memory._index is not None
+        for session in ("A", "B"):
+            # Four of six exchanges are summarized; two wait for the next trigger
+            assert len(memory._index.unsummarized(0, session, 100)) == 2
+            assert memory._exchange_counts[session] == 2
+            (reflection,) = memory._index.unsummarized(1, session, 100)
+            children = memory._index.tree_children([reflection], session)
+            assert len(children) == 4
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_flat_hits_and_tree_nodes_share_a_scale(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Research notes compete with tree nodes on the same cosine distance."""
+        mock_sentence_transformer.return_value.encode.side_effect = _topic_encode
+        config = test_config.model_copy(
+            update={
+                "memory_write_behind": False,
+                "reflection_trigger_count": 2,
+                "embedding_cache_enabled": False,
+                "memory_mmr_lambda": 1.0,
+            }
+        )
+        memory = NarrativeMemorySystem(config)
+        await memory.store_exchange("What did Ricoeur say?", "Ricoeur on memory.", "s1")
+        await memory.store_exchange("And Gadamer?", "Gadamer on play.", "s1")
+        await memory.store_research_note("Ricoeur, Time and Narrative", session_id="s1")
+        await memory.store_research_note("Unrelated archive note", session_id="s1")
+
+        items = await memory.retrieve_items("Ricoeur", session_id="s1", top_k=10)
+        relevance = {item.document: item.relevance for item in items}
+        assert relevance["Ricoeur, Time and Narrative"] == pytest.approx(1.0)
+        assert relevance["Unrelated archive note"] == pytest.approx(0.0)
+        exchange = next(doc for doc in relevance if doc.startswith("User: What did Ricoeur"))
+        assert relevance[exchange] == pytest.approx(1.0)
+        await memory.close()
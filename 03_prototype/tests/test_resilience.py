@@ -0,0 +1,271 @@
+"""Tests for resilient LLM invocation."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.resilience import (
+    HEDGE_MIN_SAMPLES,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ResilientInvoker,
+    is_retryable,
+)
+
+
+class APIStatusError(Exception):
+    """Stand-in for a provider SDK error carrying an HTTP status."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class RateLimitError(Exception):
+    """Stand-in for an SDK error recognised by name."""
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _invoker(**overrides: Any) -> ResilientInvoker:
+    options: dict[str, Any] = {
+        "timeout_seconds": 1.0,
+        "max_retries": 3,
+        "backoff_initial_seconds": 0.0,
+        "backoff_max_seconds": 0.0,
+        "breaker": CircuitBreaker(failure_threshold=10, reset_seconds=30),
+    }
+    options.update(overrides)
+    return ResilientInvoker(**options)
+
+
+def _flaky(*outcomes: Any) -> tuple[Any, list[int]]:
+    """A call factory returning or raising the given outcomes in turn."""
+    calls: list[int] = []
+
+    async def call() -> Any:
+        calls.append(len(calls))
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return call, calls
+
+
+class TestRetryPolicy:
+    """Tests for retry classification, backoff and timeouts."""
+
+    def test_retryable_errors(self) -> None:
+        """Transient errors are retried; client errors are not."""
+        assert is_retryable(APIStatusError(529))
+        assert is_retryable(APIStatusError(503))
+        assert is_retryable(APIStatusError(429))
+        assert is_retryable(TimeoutError())
+        assert is_retryable(RateLimitError())
+        assert not is_retryable(APIStatusError(400))
+        assert not is_retryable(ValueError("bad input"))
+        assert not is_retryable(CircuitOpenError())
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self) -> None:
+        """Overloaded responses are retried and the eventual result returned."""
+        invoker = _invoker()
+        call, calls = _flaky(APIStatusError(529), APIStatusError(529), "ok")
+
+        assert await invoker.invoke(call) == "ok"
+        assert len(calls) == 3
+        assert invoker.stats.retries == 2
+        assert invoker.stats.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raised_immediately(self) -> None:
+        """A bad request is not retried."""
+        invoker = _invoker()
+        call, calls = _flaky(APIStatusError(400))
+
+        with pytest.raises(APIStatusError):
+            await invoker.invoke(call)
+        assert len(calls) == 1
+        assert invoker.stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_attempts_time_out(self) -> None:
+        """A hanging attempt is abandoned after the timeout and retried."""
+        invoker = _invoker(timeout_seconds=0.01, max_retries=1)
+
+        async def hang() -> str:
+            await asyncio.sleep(1)
+            return "late"
+
+        with pytest.raises(TimeoutError):
+            await invoker.invoke(hang)
+        assert invoker.stats.timeouts == 2
+        assert invoker.stats.attempts == 2
+
+
+class TestHedging:
+    """Tests for hedged requests."""
+
+    @pytest.mark.asyncio
+    async def test_no_hedging_until_enough_samples(self) -> None:
+        """The p95 is only trusted once enough latencies were observed."""
+        invoker = _invoker(hedging=True, hedge_min_delay_seconds=0.0)
+        for _ in range(HEDGE_MIN_SAMPLES - 1):
+            await invoker.invoke(AsyncMock(return_value="ok"))
+        assert invoker.hedge_delay is None
+
+        await invoker.invoke(AsyncMock(return_value="ok"))
+        assert invoker.hedge_delay is not None
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_primary(self) -> None:
+        """A duplicate sent past the p95 answers while the primary hangs."""
+        invoker = _invoker(hedging=True, hedge_min_delay_seconds=0.01)
+        for _ in range(HEDGE_MIN_SAMPLES):
+            await invoker.invoke(AsyncMock(return_value="warm"))
+        started: list[str] = []
+
+        async def call() -> str:
+            started.append("request")
+            if len(started) == 1:
+                await asyncio.sleep(5)
+                return "slow"
+            return "fast"
+
+        assert await asyncio.wait_for(invoker.invoke(call), timeout=1) == "fast"
+        assert invoker.stats.hedges == 1
+        assert invoker.stats.hedge_wins == 1
+
+
+class TestCircuitBreaker:
+    """Tests for the circuit breaker."""
+
+    def test_opens_then_admits_single_trial(self) -> None:
+        """Consecutive failures open the circuit; after the reset one trial is admitted."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+        assert breaker.record_failure() is False
+        assert breaker.record_failure() is True
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        clock.now = 31
+        breaker.check()  # the trial
+        assert breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.check()
+
+    def test_failed_trial_reopens(self) -> None:
+        """A failing trial keeps the circuit open for another reset period."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30, clock=clock)
+        breaker.record_failure()
+        clock.now = 30
+        breaker.check()
+
+        assert breaker.record_failure() is True
+        clock.now = 59
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    @pytest.mark.asyncio
+    async def test_invoker_fails_fast_when_open(self) -> None:
+        """Once the circuit opens, remaining retries are skipped."""
+        invoker = _invoker(
+            max_retries=5, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=30)
+        )
+        call, calls = _flaky(APIStatusError(503))
+
+        with pytest.raises(CircuitOpenError):
+            await invoker.invoke(call)
+        assert len(calls) == 2
+        assert invoker.stats.circuit_opens == 1
+        assert invoker.stats.circuit_rejections == 1
+
+        with pytest.raises(CircuitOpenError):
+            await invoker.invoke(call)
+        assert len(calls) == 2
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("guarded", [False, True])
+    async def test_cancelled_trial_frees_the_slot(self, guarded: bool) -> None:
+        """A trial cancelled mid-flight lets the next request try again."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30, clock=clock)
+        invoker = _invoker(max_retries=0, breaker=breaker)
+        breaker.record_failure()
+        clock.now = 31
+
+        started = asyncio.Event()
+
+        async def hang() -> str:
+            started.set()
+            await asyncio.sleep(3600)
+            return "never"
+
+        async def trial() -> str:
+            if not guarded:
+                return await invoker.invoke(hang)
+            async with invoker.guard():
+                return await hang()
+
+        task = asyncio.ensure_future(trial())
+        await started.wait()
+        assert breaker.state is CircuitState.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.state is CircuitState.OPEN
+        clock.now = 62
+        call, _ = _flaky("ok")
+        assert await invoker.invoke(call) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+
+class TestAgentInvocation:
+    """Tests for resilient invocation in ITSERRAgent."""
+
+    @pytest.mark.asyncio
+    async def test_process_retries_overloaded_provider(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A 529 from the provider is retried transparently."""
+        config = test_config.model_copy(update={"llm_backoff_initial_seconds": 0.0})
+        mock_anthropic.return_value.ainvoke = AsyncMock(
+            side_effect=[APIStatusError(529), MagicMock(content="[FACTUAL] Recovered.")]
+        )
+        agent = ITSERRAgent(config)
+
+        response = await agent.process("Question", session_id="retry")
+
+        assert "Recovered" in response.content
+        stats = agent.llm_invocation_stats
+        assert stats["retries"] == 1 and stats["attempts"] == 2
+        # Provider SDK retries are disabled so attempts are not multiplied
+        assert mock_anthropic.call_args.kwargs["max_retries"] == 0
+        await agent.close()
@@ -0,0 +1,140 @@
+"""Tests for the semantic response cache."""
+
+import hashlib
+from typing import Any
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.response_cache import ResponseCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _text_encode(sentences: str | list[str], **kwargs: Any) -> np.ndarray:
+    """Deterministic embeddings that differ per text (case and punctuation ignored)."""
+
+    def encode(text: str) -> np.ndarray:
+        normalized = "".join(c for c in text.lower() if c.isalnum() or c == " ").strip()
+        seed = int.from_bytes(hashlib.sha256(normalized.encode()).digest()[:4], "little")
+        return np.random.default_rng(seed).standard_normal(384).astype(np.float32)
+
+    if isinstance(sentences, str):
+        return encode(sentences)
+    return np.stack([encode(text) for text in sentences])
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_similar_query_same_context_hits(self) -> None:
+        """A query above the threshold under the same context key is a hit."""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, similarity_threshold=0.95)
+        cache.put([1.0, 0.0, 0.0], "ctx", "[FACTUAL] Cached.")
+
+        assert cache.get([0.99, 0.05, 0.0], "ctx") == "[FACTUAL] Cached."
+        assert cache.get([0.0, 1.0, 0.0], "ctx") is None
+        assert cache.get([1.0, 0.0, 0.0], "other-ctx") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+        assert cache.stats.to_dict()["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        """Entries older than the TTL are dropped on lookup."""
+        clock = FakeClock()
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, similarity_threshold=0.9, clock=clock)
+        cache.put([1.0, 0.0], "ctx", "answer")
+
+        clock.now = 59.0
+        assert cache.get([1.0, 0.0], "ctx") == "answer"
+        clock.now = 61.0
+        assert cache.get([1.0, 0.0], "ctx") is None
+        assert cache.stats.expirations == 1
+        assert cache.stats.entries == 0
+
+    def test_least_recently_used_evicted(self) -> None:
+        """Once full, the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2, ttl_seconds=60, similarity_threshold=0.99)
+        cache.put([1.0, 0.0, 0.0], "ctx", "a")
+        cache.put([0.0, 1.0, 0.0], "ctx", "b")
+        cache.get([1.0, 0.0, 0.0], "ctx")  # touch "a": "b" is now least recently used
+        cache.put([0.0, 0.0, 1.0], "ctx", "c")
+
+        assert cache.get([1.0, 0.0, 0.0], "ctx") == "a"
+        assert cache.get([0.0, 1.0, 0.0], "ctx") is None
+        assert cache.stats.evictions == 1
+        assert cache.stats.entries == 2
+
+
+class TestAgentResponseCache:
+    """Tests for the response cache in ITSERRAgent.process."""
+
+    @pytest.fixture
+    def cached_config(self, test_config: AgentConfig) -> AgentConfig:
+        """Test configuration with the response cache enabled."""
+        return test_config.model_copy(update={"response_cache_enabled": True})
+
+    @pytest.mark.asyncio
+    async def test_repeat_question_served_from_cache(
+        self,
+        cached_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A repeated question skips the LLM, keeps its tags and is still stored."""
+        mock_sentence_transformer.return_value.encode.side_effect = _text_encode
+        agent = ITSERRAgent(cached_config)
+        llm = mock_anthropic.return_value
+
+        first = await agent.process("What does Gadamer say about hermeneutics?", "s1")
+        second = await agent.process("what does Gadamer say about hermeneutics", "s2")
+
+        assert llm.ainvoke.call_count == 1
+        assert second.content == first.content
+        assert second.response_metadata["response_cache"] == "hit"
+        await agent.persist()
+        assert agent.memory_write_stats["completed"] == 2
+        assert agent.response_cache_stats["hits"] == 1
+
+        await agent.process("Who wrote Truth and Method?", "s3")
+        assert llm.ainvoke.call_count == 2
+        await agent.close()
+
+    @pytest.mark.asyncio
+    async def test_follow_up_depends_on_previous_turn(
+        self,
+        cached_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The same follow-up after a different question is not a hit."""
+        mock_sentence_transformer.return_value.encode.side_effect = _text_encode
+        agent = ITSERRAgent(cached_config)
+
+        await agent.process("Tell me more", "s1")
+        await agent.process("What is midrash?", "s2")
+        await agent.process("Tell me more", "s2")
+
+        assert mock_anthropic.return_value.ainvoke.call_count == 3
+        await agent.close()
+
+    def test_disabled_by_default(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+    ) -> None:
+        """Without opting in there is no cache."""
+        assert ITSERRAgent(test_config).response_cache_stats is None
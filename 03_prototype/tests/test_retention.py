@@ -0,0 +1,210 @@
+"""Tests for retention policies and background compaction."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.retention import PeriodicTask, retention_policies
+from itserr_agent.memory.streams import StreamType
+
+
+@pytest.fixture
+def retention_config(test_config: AgentConfig) -> AgentConfig:
+    """Inline writes, no automatic reflection, and only explicit retention limits."""
+    return test_config.model_copy(
+        update={
+            "memory_write_behind": False,
+            "reflection_trigger_count": 100,
+            "conversation_retention_hours": 0.0,
+            "conversation_retention_max_items": 0,
+        }
+    )
+
+
+class TestRetentionPolicies:
+    """Tests for policy construction."""
+
+    def test_decisions_kept_forever(self, test_config: AgentConfig) -> None:
+        """Conversation is summarized before eviction; decisions never expire."""
+        policies = retention_policies(test_config)
+        assert policies[StreamType.CONVERSATION].summarize
+        assert policies[StreamType.CONVERSATION].max_items_per_session == 500
+        assert policies[StreamType.RESEARCH].keeps_forever
+        assert policies[StreamType.DECISION].keeps_forever
+
+
+class TestCompaction:
+    """Tests for NarrativeMemorySystem.compact."""
+
+    @pytest.mark.asyncio
+    async def test_background_compaction_is_opt_in(
+        self,
+        retention_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Stored exchanges are only compacted in the background once enabled."""
+        config = retention_config.model_copy(
+            update={
+                "conversation_retention_max_items": 1,
+                "memory_compaction_interval_seconds": 0.001,
+            }
+        )
+        assert not config.memory_compaction_enabled
+        for enabled in (False, True):
+            memory = NarrativeMemorySystem(
+                config.model_copy(update={"memory_compaction_enabled": enabled})
+            )
+            for i in range(3):
+                await memory.store_exchange(f"Question {i}?", f"Answer {i}", f"s{enabled}")
+            for _ in range(100):
+                if memory.compaction_stats is not None:
+                    break
+                await asyncio.sleep(0.01)
+            assert (memory.compaction_stats is not None) is enabled
+            await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_folds_old_exchanges_into_reflections(
+        self,
+        retention_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Exchanges beyond the per-session cap become reflections and are deleted."""
+        config = retention_config.model_copy(
+            update={"conversation_retention_max_items": 2, "memory_compaction_batch_size": 2}
+        )
+        memory = NarrativeMemorySystem(config)
+        for i in range(5):
+            await memory.store_exchange(f"Question {i}?", f"Answer {i}", "s1")
+        await memory.store_decision("Follow Ricoeur", session_id="s1")
+
+        stats = await memory.compact()
+
+        assert stats.collection_before == 6
+        assert stats.evicted == {"conversation": 3}
+        assert stats.batches == 2 and stats.reflections == 2
+        assert stats.collection_after == 5
+        kept = memory.stream(StreamType.CONVERSATION).get_recent(10)
+        assert [item.metadata["user_input_length"] for item in kept] == [11, 11]
+        assert kept[0].content.endswith("Answer 4")
+        summary = await memory.get_session_summary("s1")
+        assert summary is not None
+        assert "Conversation exchanges: 2" in summary
+        assert "Reflections generated: 2" in summary
+        assert "Question 0?" in summary or "Question 2?" in summary
+        await memory.close()
+
+        # The rewritten stream log no longer replays the evicted exchanges
+        restarted = NarrativeMemorySystem(config)
+        assert restarted.stream(StreamType.CONVERSATION).count == 2
+        assert restarted.stream(StreamType.DECISION).count == 1
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_reflected_exchanges_not_summarized_again(
+        self,
+        retention_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Only evicted exchanges outside every reflection are folded into a new one."""
+        config = retention_config.model_copy(
+            update={"reflection_trigger_count": 3, "conversation_retention_max_items": 1}
+        )
+        memory = NarrativeMemorySystem(config)
+        for i in range(5):
+            await memory.store_exchange(f"Question {i}?", f"Answer {i}", "s1")
+        assert memory._index is not None
+        fourth = memory._index.unsummarized(0, "s1", 1)
+
+        stats = await memory.compact()
+
+        # Exchanges 0-2 were reflected on already; only exchange 3 is summarized
+        assert stats.evicted == {"conversation": 4}
+        assert stats.reflections == 1
+        reflections = memory._get_by_ids(memory._index.recent("reflection", "s1", limit=10))
+        assert len(reflections) == 2
+        newest = max(reflections, key=lambda row: row[1]["timestamp_epoch"])[1]
+        assert newest["exchange_count"] == 1
+        assert newest["child_ids"] == fourth[0]
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reflection_summarizes_each_exchange_once(
+        self,
+        retention_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Compaction and a triggered reflection never fold the same exchange twice."""
+        config = retention_config.model_copy(update={"conversation_retention_max_items": 1})
+        memory = NarrativeMemorySystem(config)
+        for i in range(4):
+            await memory.store_exchange(f"Question {i}?", f"Answer {i}", "s1")
+        assert memory._index is not None
+
+        await asyncio.gather(memory.compact(), memory._trigger_reflection("s1"))
+
+        reflections = memory._get_by_ids(memory._index.recent("reflection", "s1", limit=10))
+        children = [
+            child for _, meta in reflections for child in str(meta["child_ids"]).split(",")
+        ]
+        assert len(children) == len(set(children)) == 4
+        await memory.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_research_evicted_decisions_kept(
+        self,
+        retention_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Research past its maximum age is deleted without a reflection."""
+        config = retention_config.model_copy(update={"research_retention_hours": 1e-9})
+        memory = NarrativeMemorySystem(config)
+        await memory.store_research_note("Gadamer on prejudice", session_id="s1")
+        await memory.store_decision("Use the critical edition", session_id="s1")
+        await asyncio.sleep(0.01)
+
+        stats = await memory.compact()
+
+        assert stats.evicted == {"research": 1}
+        assert stats.reflections == 0
+        assert stats.collection_after == 1
+        assert memory.stream(StreamType.RESEARCH).count == 0
+        assert memory.stream(StreamType.DECISION).count == 1
+        assert memory.compaction_stats is stats
+        await memory.close()
+
+
+class TestPeriodicTask:
+    """Tests for the background scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_runs_until_stopped(self) -> None:
+        """The job runs every interval, survives failures and stops on request."""
+        calls = 0
+
+        async def job() -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("transient")
+
+        task = PeriodicTask(0.001, job, name="test-periodic")
+        task.ensure_started()
+        for _ in range(200):
+            if calls >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await task.stop()
+        seen = calls
+        await asyncio.sleep(0.01)
+
+        assert seen >= 2
+        assert calls == seen
@@ -0,0 +1,207 @@
+"""Tests for the HTTP server mode."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from itserr_agent.core.config import AgentConfig, LLMProvider
+from itserr_agent.core.timing import TIMINGS_FILENAME
+from itserr_agent.server import QueueFullError, TurnQueue, create_app
+from itserr_agent.tools.base import BaseTool, ToolCategory, ToolResult
+from itserr_agent.tools.registry import ToolRegistry
+
+
+class CitationEditTool(BaseTool):
+    """Modification tool that records whether it was closed."""
+
+    closed = False
+
+    @property
+    def name(self) -> str:
+        return "edit_citation"
+
+    @property
+    def description(self) -> str:
+        return "Update a citation"
+
+    @property
+    def category(self) -> ToolCategory:
+        return ToolCategory.MODIFICATION
+
+    async def execute(self, **kwargs: Any) -> ToolResult:
+        return ToolResult(success=True, data=kwargs, tool_name=self.name, category=self.category)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def server_config(test_config: AgentConfig) -> AgentConfig:
+    """Configuration serving the instant mock LLM."""
+    return test_config.model_copy(
+        update={
+            "llm_provider": LLMProvider.MOCK,
+            "mock_llm_latency_seconds": 0.0,
+            "mock_llm_tokens_per_second": 0.0,
+            "mock_llm_output_tokens": 10,
+        }
+    )
+
+
+@pytest.fixture
+async def client(
+    server_config: AgentConfig,
+    mock_chromadb: MagicMock,
+    mock_sentence_transformer: MagicMock,
+) -> AsyncIterator[TestClient]:
+    """A client for a running server (closed, and the agent shut down, afterwards)."""
+    tools = ToolRegistry()
+    tools.register(CitationEditTool())
+    client = TestClient(TestServer(create_app(server_config, tools=tools)))
+    await client.start_server()
+    yield client
+    await client.close()
+
+
+class TestTurnQueue:
+    """Tests for TurnQueue admission control."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_queue_capacity(self) -> None:
+        """Turns past the workers wait; past the queue limit they are rejected."""
+        queue = TurnQueue(max_concurrent=1, max_queued=1)
+        release = asyncio.Event()
+
+        async def turn() -> None:
+            async with queue:
+                await release.wait()
+
+        running = [asyncio.create_task(turn()) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await turn()
+
+        assert queue.stats.active == 1 and queue.stats.queued == 1
+        release.set()
+        await asyncio.gather(*running)
+        assert queue.stats.admitted == 2
+        assert queue.stats.rejected == 1
+        assert queue.stats.active == 0
+
+
+class TestServerEndpoints:
+    """Tests for the aiohttp endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_chat_history_and_stream(self, client: TestClient) -> None:
+        """Chat answers, keeps history per session and streams as SSE."""
+        response = await client.post(
+            "/chat", json={"message": "What is hermeneutics?", "session_id": "s1"}
+        )
+        assert response.status == 200
+        body = await response.json()
+        assert body["session_id"] == "s1"
+        assert "Mock answer to: What is hermeneutics?" in body["response"]
+        assert "context_usage" in body["metadata"]
+
+        stream = await client.post("/chat/stream", json={"message": "Tell me more."})
+        assert stream.headers["Content-Type"] == "text/event-stream"
+        events = [
+            line.split(": ", 1)[1] for line in (await stream.text()).splitlines()
+            if line.startswith("event: ")
+        ]
+        assert events[0] == "token" and events[-1] == "complete"
+        # Requests without a session get their own
+        assert stream.headers["X-Session-Id"].startswith("http-")
+
+        history = await (await client.get("/sessions/s1/history")).json()
+        assert [m["role"] for m in history["messages"]] == ["human", "ai"]
+
+        stats = await (await client.get("/stats")).json()
+        assert stats["turn_queue"]["admitted"] == 2
+        assert stats["timings"]["agent.llm"]["count"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_memory_and_tools(self, client: TestClient) -> None:
+        """Notes are searchable; sensitive tools need confirmation."""
+        created = await client.post(
+            "/memory/notes",
+            json={"content": "Ricoeur on narrative identity", "source": "Oneself as Another"},
+        )
+        assert created.status == 201
+        search = await (await client.get("/memory/search", params={"q": "Ricoeur"})).json()
+        assert search["items"][0]["stream_type"] == "research"
+
+        tools = await (await client.get("/tools")).json()
+        assert tools["tools"][0]["requires_confirmation"] is True
+        # Sensitive tools are refused over HTTP, even when the client says confirmed
+        refused = await client.post(
+            "/tools/edit_citation", json={"arguments": {"id": 1}, "confirmed": True}
+        )
+        assert refused.status == 403
+        assert (await client.post("/tools/missing", json={})).status == 404
+
+    @pytest.mark.asyncio
+    async def test_confirmed_tools_when_allowed(
+        self,
+        server_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """With the server setting on, clients confirm tools; arguments are passed as given."""
+        tools = ToolRegistry()
+        tools.register(CitationEditTool())
+        config = server_config.model_copy(update={"server_allow_confirmed_tools": True})
+        client = TestClient(TestServer(create_app(config, tools=tools)))
+        await client.start_server()
+
+        refused = await client.post("/tools/edit_citation", json={"arguments": {"id": 1}})
+        assert refused.status == 403
+        result = await client.post(
+            "/tools/edit_citation",
+            json={"arguments": {"id": 1, "name": "x", "confirmed": False}, "confirmed": True},
+        )
+        assert result.status == 200
+        assert (await result.json())["data"] == {"id": 1, "name": "x", "confirmed": False}
+        bad = await client.post(
+            "/tools/edit_citation", json={"arguments": {"not a name": 1}, "confirmed": True}
+        )
+        assert bad.status == 400
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_requests(self, client: TestClient) -> None:
+        """Malformed requests get JSON 400 errors."""
+        missing = await client.post("/chat", json={"session_id": "s1"})
+        assert missing.status == 400
+        assert (await missing.json())["error"] == "'message' is required"
+        assert (await client.post("/chat", data="not json")).status == 400
+        assert (await client.get("/memory/search")).status == 400
+
+
+class TestServerLifecycle:
+    """Tests for startup and graceful shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_agent_and_tools(
+        self,
+        server_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Stopping the server closes the agent (persisting its state) and the tools."""
+        tool = CitationEditTool()
+        tools = ToolRegistry()
+        tools.register(tool)
+        client = TestClient(TestServer(create_app(server_config, tools=tools)))
+        await client.start_server()
+        await client.post("/chat", json={"message": "Question"})
+
+        await client.close()
+
+        assert tool.closed
+        assert (server_config.memory_persist_path / TIMINGS_FILENAME).exists()
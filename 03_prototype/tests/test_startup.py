@@ -0,0 +1,106 @@
+"""Tests guarding fast startup: lazy imports, lazy model loading and warm-up."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+
+HEAVY_MODULES = ("langchain_core", "chromadb", "sentence_transformers", "torch")
+
+
+def _loaded_modules(code: str, memory_path: Path) -> set[str]:
+    """Run code in a fresh interpreter and report which heavy modules it imported."""
+    probe = (
+        f"{code}\nimport sys\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = {
+        **os.environ,
+        "ITSERR_ANTHROPIC_API_KEY": "test-api-key",
+        "ITSERR_MEMORY_PERSIST_PATH": str(memory_path),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True
+    )
+    return set(filter(None, result.stdout.strip().split(",")))
+
+
+class TestLazyImports:
+    """Importing the package or CLI must not pull in heavy dependencies."""
+
+    def test_cli_import_is_light(self, tmp_path: Path) -> None:
+        """`itserr-agent version` and `config` never load LangChain or models."""
+        assert _loaded_modules("import itserr_agent.cli, itserr_agent", tmp_path) == set()
+
+    def test_agent_construction_defers_memory_and_models(self, tmp_path: Path) -> None:
+        """Creating the agent loads neither the vector store nor the embedding model."""
+        loaded = _loaded_modules(
+            "from itserr_agent import AgentConfig, ITSERRAgent\nITSERRAgent(AgentConfig())",
+            tmp_path,
+        )
+        assert loaded.isdisjoint({"chromadb", "sentence_transformers", "torch"})
+
+
+class TestLazyInitialization:
+    """Tests for deferred component creation and background warm-up."""
+
+    def test_agent_creates_components_on_first_use(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Neither the LLM client nor memory is created by the constructor."""
+        agent = ITSERRAgent(test_config)
+        mock_anthropic.assert_not_called()
+        mock_chromadb.assert_not_called()
+
+        assert agent._memory is agent._memory
+        mock_chromadb.assert_called_once()
+        mock_sentence_transformer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_embedding_model_loaded_on_first_embed(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The embedding model is loaded once, when first needed."""
+        memory = NarrativeMemorySystem(test_config)
+        mock_sentence_transformer.assert_not_called()
+
+        await memory.store_research_note("Note", session_id="lazy")
+        await memory.store_research_note("Another note", session_id="lazy")
+
+        mock_sentence_transformer.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_loads_everything_in_background(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """warm_up loads the LLM client, memory and embedding model off-thread."""
+        agent = ITSERRAgent(test_config)
+
+        agent.warm_up().join(timeout=10)
+
+        mock_anthropic.assert_called_once()
+        mock_chromadb.assert_called_once()
+        mock_sentence_transformer.assert_called_once()
+
+        response = await agent.process("What is hermeneutics?", session_id="warm")
+        assert response.content
+        mock_sentence_transformer.assert_called_once()
+        await agent.close()
@@ -0,0 +1,202 @@
+"""Tests for the segmented append-only stream log."""
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.memory.log import CHECKPOINT_FILENAME, LOG_DIRNAME, LogRecord, StreamLog
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.streams import StreamType
+
+
+def _records(count: int) -> list[LogRecord]:
+    """Research records one microsecond apart."""
+    return [
+        LogRecord("research", 1_700_000_000_000_000 + i, f"s{i % 3}", f"Note {i}", {"n": i})
+        for i in range(count)
+    ]
+
+
+class TestStreamLog:
+    """Tests for StreamLog durability and replay."""
+
+    def test_replays_in_order_across_sealed_segments(self, tmp_path: Path) -> None:
+        """Records survive reopening, in order, after segments roll over."""
+        log = StreamLog(tmp_path, segment_bytes=4096, sync_every=10)
+        assert log.replay() == []
+        log.append_many(_records(300))
+        log.close()
+
+        segments = sorted((tmp_path / LOG_DIRNAME).glob("segment-*.jsonl"))
+        assert len(segments) > 3
+        checkpoint = json.loads((tmp_path / LOG_DIRNAME / CHECKPOINT_FILENAME).read_text())
+        assert set(checkpoint["segments"]) == {p.name for p in segments[:-1]}
+
+        reopened = StreamLog(tmp_path, segment_bytes=4096)
+        assert reopened.replay() == _records(300)
+        reopened.append(LogRecord("decision", 1, "s0", "Later"))
+        reopened.close()
+        assert StreamLog(tmp_path).replay()[-1].content == "Later"
+
+    def test_torn_tail_is_truncated(self, tmp_path: Path) -> None:
+        """A partial last line from a crash is dropped; appends continue cleanly."""
+        log = StreamLog(tmp_path)
+        log.replay()
+        log.append_many(_records(3))
+        log.close()
+        segment = next((tmp_path / LOG_DIRNAME).glob("segment-*.jsonl"))
+        with segment.open("ab") as file:
+            file.write(b'["research",17000')
+
+        log = StreamLog(tmp_path)
+        assert log.replay() == _records(3)
+        assert log.stats.truncated_bytes == len(b'["research",17000')
+        log.append(LogRecord("research", 2, "s0", "After crash"))
+        log.close()
+
+        replayed = StreamLog(tmp_path).replay()
+        assert [r.content for r in replayed] == ["Note 0", "Note 1", "Note 2", "After crash"]
+
+    def test_rewrite_replaces_contents(self, tmp_path: Path) -> None:
+        """A rewrite keeps only the given records; an uncommitted one is discarded."""
+        log = StreamLog(tmp_path, segment_bytes=4096)
+        log.replay()
+        log.append_many(_records(200))
+        log.rewrite(_records(200)[150:])
+        log.append(LogRecord("decision", 1, "s0", "After rewrite"))
+        log.close()
+
+        # A rewrite that crashed before its checkpoint leaves only .tmp files
+        (tmp_path / LOG_DIRNAME / "segment-00000099.jsonl.tmp").write_bytes(b"[]\n")
+
+        replayed = StreamLog(tmp_path).replay()
+        assert replayed == [*_records(200)[150:], LogRecord("decision", 1, "s0", "After rewrite")]
+        assert not list((tmp_path / LOG_DIRNAME).glob("*.tmp"))
+
+    def test_appends_during_rewrite_are_kept(self, tmp_path: Path) -> None:
+        """Records appended after begin_rewrite land after the rewritten ones."""
+        log = StreamLog(tmp_path)
+        log.replay()
+        log.append_many(_records(10))
+        log.begin_rewrite()
+        log.append(LogRecord("decision", 1, "s0", "During rewrite"))
+        log.sync()  # Returns at once instead of waiting for the rewrite
+        log.rewrite(_records(10)[5:])
+        log.append(LogRecord("decision", 2, "s0", "After rewrite"))
+        log.close()
+
+        replayed = [r.content for r in StreamLog(tmp_path).replay()]
+        assert replayed == [*(f"Note {i}" for i in range(5, 10)), "During rewrite", "After rewrite"]
+
+    def test_idle_appends_synced_by_timer(self, tmp_path: Path) -> None:
+        """A record appended before an idle period is synced within the interval."""
+        log = StreamLog(tmp_path, sync_every=1000, sync_interval_seconds=0.05)
+        log.replay()
+        log.append(LogRecord("decision", 1, "s0", "Last before idle"))
+        assert log.stats.syncs == 0
+
+        deadline = time.monotonic() + 2.0
+        while log.stats.syncs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log.stats.syncs == 1
+        log.close()
+
+    def test_fsync_batching(self, tmp_path: Path) -> None:
+        """Appends are fsynced once per batch, and on sync."""
+        log = StreamLog(tmp_path, sync_every=4, sync_interval_seconds=3600)
+        log.replay()
+        for record in _records(9):
+            log.append(record)
+        assert log.stats.syncs == 2
+        log.sync()
+        assert log.stats.syncs == 3
+        log.close()
+
+
+class TestMemoryStreamPersistence:
+    """Tests for the streams rebuilt by NarrativeMemorySystem."""
+
+    @pytest.mark.asyncio
+    async def test_streams_restored_after_restart(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Stored items reappear in their streams with original timestamps."""
+        memory = NarrativeMemorySystem(test_config)
+        await memory.store_research_note("Gadamer on tradition", source="Truth and Method")
+        await memory.store_decision("Focus on Ricoeur", session_id="s1")
+        before = memory.stream(StreamType.RESEARCH).get_recent(1)[0]
+        await memory.close()
+
+        restarted = NarrativeMemorySystem(test_config)
+        note = restarted.stream(StreamType.RESEARCH).get_recent(1)[0]
+        assert note == before
+        assert note.metadata == {"source": "Truth and Method"}
+        assert restarted.stream(StreamType.DECISION).session_count("s1") == 1
+        assert restarted.stream_log_stats is not None
+        assert restarted.stream_log_stats.replayed == 2
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_log_backfilled_from_existing_collection(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """A collection stored without the log is copied into it once."""
+        without_log = test_config.model_copy(update={"stream_log_enabled": False})
+        memory = NarrativeMemorySystem(without_log)
+        await memory.store_exchange("What is a horizon?", "A range of vision.", "s1")
+        await memory.close()
+
+        memory = NarrativeMemorySystem(test_config)
+        assert memory.stream(StreamType.CONVERSATION).count == 1
+        await memory.close()
+        replayed = StreamLog(test_config.memory_persist_path).replay()
+        assert [r.stream_type for r in replayed] == ["conversation"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_from_collection_without_epochs(
+        self,
+        test_config: AgentConfig,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """Items written before timestamp_epoch existed (naive ISO times) are backfilled."""
+        collection = mock_chromadb.return_value.get_or_create_collection.return_value
+        collection.add(
+            ids=["conv_old", "research_old", "conv_older"],
+            embeddings=[[0.1] * 384] * 3,
+            documents=["User: Later?\n\nAssistant: Yes.", "Old note", "User: First?"],
+            metadatas=[
+                {"stream_type": "conversation", "timestamp": "2024-03-02T10:00:00",
+                 "session_id": "s1"},
+                {"stream_type": "research", "timestamp": "2024-03-01T12:00:00+00:00",
+                 "session_id": "s1"},
+                {"stream_type": "conversation", "session_id": "s1"},
+            ],
+        )
+        assert not (test_config.memory_persist_path / LOG_DIRNAME).exists()
+
+        memory = NarrativeMemorySystem(test_config)
+        conversation = memory.stream(StreamType.CONVERSATION).get_recent(10)
+        assert [item.content for item in conversation] == [
+            "User: Later?\n\nAssistant: Yes.",
+            "User: First?",
+        ]
+        assert memory.stream(StreamType.RESEARCH).count == 1
+        await memory.close()
+
+        replayed = StreamLog(test_config.memory_persist_path).replay()
+        assert [r.content for r in replayed] == [
+            "User: First?",
+            "Old note",
+            conversation[0].content,
+        ]
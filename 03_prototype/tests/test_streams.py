@@ -1,9 +1,11 @@
 """Tests for the memory streams module, focusing on timestamp handling."""
 
+import tracemalloc
 from datetime import datetime, timedelta, timezone
 
 from itserr_agent.memory.streams import (
     MemoryItem,
+    StreamStore,
     StreamType,
     ConversationStream,
     ResearchStream,
@@ -232,3 +234,62 @@ class TestDecisionStream:
         assert "Chose: Close reading" in item.content
         assert "Rejected: Distant reading, Quantitative" in item.content
         assert "Reason: Better suited" in item.content
+
+
+class TestStreamStore:
+    """Tests for the columnar, time-indexed stream storage."""
+
+    def test_get_recent_per_session(self) -> None:
+        """Recent items are filtered by session without scanning other sessions."""
+        stream = ConversationStream()
+        for i in range(6):
+            stream.add(f"Message {i}", session_id="even" if i % 2 == 0 else "odd", turn=i)
+
+        recent = stream.get_recent(2, session_id="odd")
+
+        assert [item.content for item in recent] == ["Message 5", "Message 3"]
+        assert recent[0].metadata == {"turn": 5}
+        assert recent[0].stream_type == StreamType.CONVERSATION
+        assert stream.session_count("even") == 3
+        assert stream.get_recent(5, session_id="missing") == []
+        assert stream.count == 6
+
+    def test_out_of_order_timestamps_stay_sorted(self) -> None:
+        """An item older than the newest (e.g. after a clock step) is placed in order."""
+        store = StreamStore()
+        now = datetime.now(timezone.utc)
+        store.append("late", now, "s1")
+        store.append("early", now - timedelta(minutes=5), "s1")
+        store.append("latest", now + timedelta(minutes=1), "s2")
+
+        recent = store.recent(3, StreamType.RESEARCH)
+
+        assert [item.content for item in recent] == ["latest", "late", "early"]
+        assert [i.content for i in store.recent(3, StreamType.RESEARCH, "s1")] == ["late", "early"]
+        assert recent[1].timestamp == now
+
+    def test_items_are_snapshots(self) -> None:
+        """Changing a returned item does not change the stored one."""
+        stream = ResearchStream()
+        item = stream.add("Note", source="Truth and Method")
+        item.metadata["source"] = "changed"
+        stream.get_recent(1)[0].metadata["source"] = "changed again"
+
+        assert stream.get_recent(1)[0].metadata == {"source": "Truth and Method"}
+
+    def test_compact_per_item_footprint(self) -> None:
+        """Items without metadata cost a few dozen bytes beyond their content."""
+        contents = [f"Exchange {i}" for i in range(20_000)]
+        stream = ConversationStream()
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i, content in enumerate(contents):
+                stream.add(content, session_id=f"s{i % 50}")
+            per_item = (tracemalloc.get_traced_memory()[0] - before) / len(contents)
+        finally:
+            tracemalloc.stop()
+
+        # A dataclass per item with a datetime and a metadata dict costs ~280 bytes
+        assert per_item < 80
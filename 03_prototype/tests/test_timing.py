@@ -0,0 +1,165 @@
+"""Tests for pipeline spans and latency histograms."""
+
+import asyncio
+import json
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from itserr_agent.cli import app
+from itserr_agent.core.agent import ITSERRAgent
+from itserr_agent.core.config import AgentConfig
+from itserr_agent.core.timing import (
+    TIMINGS,
+    TIMINGS_FILENAME,
+    LatencyHistogram,
+    TimingRegistry,
+    collect_spans,
+    span,
+    span_fields,
+    timed,
+)
+from itserr_agent.tools.base import BaseTool, ToolCategory, ToolResult
+from itserr_agent.tools.registry import ToolRegistry
+
+
+@pytest.fixture(autouse=True)
+def clean_timings() -> Generator[None, None, None]:
+    """Isolate the process-wide registry between tests."""
+    TIMINGS.reset()
+    yield
+    TIMINGS.reset()
+
+
+class LookupTool(BaseTool):
+    """Minimal read-only tool for registry tests."""
+
+    @property
+    def name(self) -> str:
+        return "lookup"
+
+    @property
+    def description(self) -> str:
+        return "Look something up"
+
+    @property
+    def category(self) -> ToolCategory:
+        return ToolCategory.READ_ONLY
+
+    async def execute(self, **kwargs: Any) -> ToolResult:
+        return ToolResult(success=True, data=kwargs, tool_name=self.name, category=self.category)
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_quantiles_within_bucket_resolution(self) -> None:
+        """Percentiles of 1..1000 ms land within ~10% of the exact values."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        summary = histogram.summary()
+        assert summary["count"] == 1000
+        assert summary["mean_ms"] == pytest.approx(500.5)
+        assert summary["p50_ms"] == pytest.approx(500, rel=0.1)
+        assert summary["p95_ms"] == pytest.approx(950, rel=0.1)
+        assert summary["p99_ms"] == pytest.approx(990, rel=0.1)
+        assert summary["max_ms"] == pytest.approx(1000)
+
+    def test_saved_histograms_accumulate(self, tmp_path: Path) -> None:
+        """Saving merges into the file and clears the in-memory registry."""
+        path = tmp_path / TIMINGS_FILENAME
+        registry = TimingRegistry()
+        registry.record("agent.llm", 0.2)
+        registry.save(path)
+        registry.record("agent.llm", 0.4)
+        registry.save(path)
+
+        assert registry.summary() == {}
+        loaded = TimingRegistry.load(path).summary()["agent.llm"]
+        assert loaded["count"] == 2
+        assert loaded["max_ms"] == pytest.approx(400)
+
+
+class TestSpans:
+    """Tests for span, collect_spans and timed."""
+
+    @pytest.mark.asyncio
+    async def test_spans_record_and_collect(self) -> None:
+        """Spans land in the registry and, inside collect_spans, in the turn dict."""
+
+        @timed("test.async")
+        async def slow() -> str:
+            await asyncio.sleep(0.01)
+            return "done"
+
+        @timed("test.sync")
+        def fast() -> int:
+            return 1
+
+        with span("test.outside"):
+            pass
+        with collect_spans() as spans:
+            assert await slow() == "done"
+            assert fast() == 1
+            assert fast() == 1
+
+        assert set(spans) == {"test.async", "test.sync"}
+        assert spans["test.async"] >= 0.01
+        assert TIMINGS.summary()["test.sync"]["count"] == 2
+        assert "test.outside" in TIMINGS.summary()
+        assert "test_async_ms" in span_fields(spans)
+
+    @pytest.mark.asyncio
+    async def test_tool_execution_is_timed(self) -> None:
+        """ToolRegistry.execute records a span per tool."""
+        registry = ToolRegistry()
+        registry.register(LookupTool())
+
+        result = await registry.execute("lookup", query="Gadamer")
+
+        assert result.success
+        assert TIMINGS.summary()["tool.lookup"]["count"] == 1
+
+
+class TestAgentTimings:
+    """Tests for stage timings in ITSERRAgent."""
+
+    @pytest.mark.asyncio
+    async def test_turn_stages_recorded_and_dumped(
+        self,
+        test_config: AgentConfig,
+        mock_anthropic: MagicMock,
+        mock_chromadb: MagicMock,
+        mock_sentence_transformer: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Every pipeline stage is timed and `itserr-agent stats` reports it."""
+        agent = ITSERRAgent(test_config)
+        await agent.process("What is hermeneutics?", session_id="timed")
+        await agent.close()
+
+        monkeypatch.setenv("ITSERR_MEMORY_PERSIST_PATH", str(test_config.memory_persist_path))
+        result = CliRunner().invoke(app, ["stats", "--json"])
+
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        for stage in (
+            "agent.turn",
+            "agent.retrieve",
+            "agent.assemble",
+            "agent.llm",
+            "agent.classify",
+            "agent.record",
+            "memory.retrieve",
+            "memory.embed",
+            "memory.vector_query",
+            "memory.store_exchange",
+        ):
+            assert summary[stage]["count"] >= 1, stage
+        assert summary["agent.turn"]["p99_ms"] >= summary["agent.turn"]["p50_ms"]
@@ -0,0 +1,177 @@
+"""Tests for the in-process NumPy vector store backend."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from itserr_agent.core.config import AgentConfig, MemoryBackendType
+from itserr_agent.memory.backend import ChromaBackend, MemoryBackend, create_backend
+from itserr_agent.memory.narrative import NarrativeMemorySystem
+from itserr_agent.memory.vector_store import NumpyVectorStore
+
+
+def _populate(store: MemoryBackend, count: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    """Add ``count`` random items across two sessions and return their vectors."""
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    store.add(
+        ids=[f"doc_{i}" for i in range(count)],
+        embeddings=vectors.tolist(),
+        documents=[f"Document {i}" for i in range(count)],
+        metadatas=[
+            {
+                "session_id": f"s{i % 2}",
+                "stream_type": "research" if i % 3 == 0 else "conversation",
+                "timestamp_epoch": float(i),
+            }
+            for i in range(count)
+        ],
+    )
+    return vectors
+
+
+class TestNumpyVectorStore:
+    """Tests for NumpyVectorStore."""
+
+    def test_satisfies_backend_protocol(self, tmp_path: Path) -> None:
+        """The store can be used wherever a MemoryBackend is expected."""
+        assert isinstance(NumpyVectorStore(tmp_path), MemoryBackend)
+
+    def test_exact_top_k_matches_brute_force(self, tmp_path: Path) -> None:
+        """Query results equal a brute-force cosine ranking."""
+        store = NumpyVectorStore(tmp_path)
+        vectors = _populate(store, 3000)
+        query = vectors[42] + 0.1
+
+        results = store.query(query_embeddings=[query.tolist()], n_results=5)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert results["ids"][0] == [f"doc_{i}" for i in expected]
+        assert results["distances"][0] == sorted(results["distances"][0])
+        assert results["metadatas"][0][0]["timestamp_epoch"] == float(expected[0])
+        assert store.count() == 3000
+
+    def test_where_filters(self, tmp_path: Path) -> None:
+        """Equality, operator and boolean filters restrict candidates."""
+        store = NumpyVectorStore(tmp_path)
+        vectors = _populate(store, 60)
+        query = [vectors[0].tolist()]
+
+        by_session = store.query(query, n_results=100, where={"session_id": "s1"})
+        assert len(by_session["ids"][0]) == 30
+        assert all(m["session_id"] == "s1" for m in by_session["metadatas"][0])
+
+        combined = store.get(
+            where={
+                "$and": [
+                    {"stream_type": {"$in": ["research"]}},
+                    {"timestamp_epoch": {"$gte": 30.0}},
+                ]
+            }
+        )
+        assert combined["ids"] == [f"doc_{i}" for i in range(30, 60, 3)]
+
+        either = store.get(where={"$or": [{"session_id": "s0"}, {"session_id": "s1"}]})
+        assert len(either["ids"]) == 60
+        assert store.get(where={"session_id": "missing"})["ids"] == []
+
+    def test_get_preserves_id_order_and_limit(self, tmp_path: Path) -> None:
+        """Fetching by id returns items in the requested order."""
+        store = NumpyVectorStore(tmp_path)
+        _populate(store, 10)
+
+        results = store.get(ids=["doc_7", "doc_2", "unknown"])
+        assert results["ids"] == ["doc_7", "doc_2"]
+        assert results["documents"] == ["Document 7", "Document 2"]
+        assert len(store.get(limit=3)["ids"]) == 3
+
+    def test_delete_and_duplicate_ids(self, tmp_path: Path) -> None:
+        """Deleted items disappear; re-adding an existing id is ignored."""
+        store = NumpyVectorStore(tmp_path)
+        vectors = _populate(store, 10)
+
+        store.delete(where={"session_id": "s0"})
+        store.add(["doc_1"], [vectors[0].tolist()], ["Replaced"], [{"session_id": "s1"}])
+
+        assert store.count() == 5
+        assert store.get(ids=["doc_1"])["documents"] == ["Document 1"]
+        results = store.query([vectors[0].tolist()], n_results=10)
+        assert all(m["session_id"] == "s1" for m in results["metadatas"][0])
+
+    def test_persists_and_grows(self, tmp_path: Path) -> None:
+        """Items beyond the initial capacity survive closing and reopening."""
+        store = NumpyVectorStore(tmp_path, dtype="float16")
+        vectors = _populate(store, 1500)
+        store.close()
+
+        reopened = NumpyVectorStore(tmp_path)
+        assert reopened.count() == 1500
+        results = reopened.query([vectors[1499].tolist()], n_results=1, where={"session_id": "s1"})
+        assert results["ids"][0] == ["doc_1499"]
+        assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-3)
+
+        _populate(reopened, 1, seed=1)  # re-adds doc_0 (ignored)
+        reopened.add(["new"], [vectors[0].tolist()], ["New"], [{"session_id": "s9"}])
+        assert reopened.get(where={"session_id": "s9"})["ids"] == ["new"]
+        reopened.close()
+
+    def test_dimension_mismatch_rejected(self, tmp_path: Path) -> None:
+        """Embeddings must keep the store's dimension."""
+        store = NumpyVectorStore(tmp_path)
+        _populate(store, 2, dim=4)
+        with pytest.raises(ValueError, match="dimension"):
+            store.add(["x"], [[1.0, 0.0]], ["X"], [{}])
+
+
+class TestBackendSelection:
+    """Tests for choosing the memory backend from configuration."""
+
+    def test_default_is_chroma(self, test_config: AgentConfig, mock_chromadb: MagicMock) -> None:
+        """ChromaDB remains the default backend."""
+        assert isinstance(create_backend(test_config), ChromaBackend)
+
+    @pytest.mark.asyncio
+    async def test_memory_system_runs_on_numpy_backend(
+        self,
+        test_config: AgentConfig,
+        mock_sentence_transformer: MagicMock,
+    ) -> None:
+        """The full store/retrieve/summary cycle works without ChromaDB."""
+        test_config.memory_backend = MemoryBackendType.NUMPY
+        memory = NarrativeMemorySystem(test_config)
+        assert isinstance(memory._collection, NumpyVectorStore)
+
+        await memory.store_exchange("What is hermeneutics?", "Interpretation.", "np")
+        await memory.store_research_note("Gadamer, Truth and Method", session_id="np")
+
+        context = await memory.retrieve_context("hermeneutics", session_id="np")
+        assert context is not None and "Gadamer" in context
+        exchanges = await memory._retrieve_unsummarized_exchanges(session_id="np", limit=10)
+        assert len(exchanges) == 1
+        summary = await memory.get_session_summary("np")
+        assert summary is not None and "Research notes: 1" in summary
+
+        await memory.close()
+
+
+class TestBackendParity:
+    """Tests that both backends answer the same query the same way."""
+
+    @pytest.mark.parametrize("where", [None, {"session_id": "s1"}])
+    def test_same_ids_and_distances(self, tmp_path: Path, where: dict[str, str] | None) -> None:
+        """NumPy and ChromaDB return the same neighbours on the cosine scale."""
+        pytest.importorskip("chromadb")
+        numpy_store = NumpyVectorStore(tmp_path / "numpy")
+        chroma = ChromaBackend(tmp_path / "chroma", "parity_test")
+        vectors = _populate(numpy_store, 200)
+        _populate(chroma, 200)
+        query = [(vectors[7] + vectors[8]).tolist()]
+
+        expected = numpy_store.query(query_embeddings=query, n_results=10, where=where)
+        actual = chroma.query(query_embeddings=query, n_results=10, where=where)
+
+        assert actual["ids"][0] == expected["ids"][0]
+        assert actual["distances"][0] == pytest.approx(expected["distances"][0], abs=1e-4)
+        assert actual["metadatas"][0] == expected["metadatas"][0]